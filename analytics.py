@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""就业市场汇总：按 主要类型 × 行业 × 薪资区间 预先汇总的统计立方体
+
+每个数据集版本只构建一次；界面上的数据概览和市场概览图表都直接查它，
+交互时不再扫描整张岗位表。薪资一律用按月折算的 薪资_月均_千（见 salary.py），
+薪资未知的岗位只计入岗位数，不参与薪资统计。一个岗位属于多个行业时，
+在每个行业里各计一次。
+"""
+
+import numpy as np
+import pandas as pd
+
+from engine import HOLLAND_ORDER
+from indexes import parse_industries
+from job_store import IndustryListArray
+from salary import salary_ranges
+
+# 薪资区间的分界（千/月）：[0, 5)、[5, 10) … [50, +inf)，最后再加一个"未知"
+SALARY_BAND_EDGES = [5, 10, 15, 20, 30, 50]
+SALARY_BANDS = ['5千以下', '5-10千', '10-15千', '15-20千', '20-30千', '30-50千', '5万以上', '未知']
+
+# 预先算好的薪资分位数
+QUANTILES = {'p10': 0.10, 'p25': 0.25, 'median': 0.50, 'p75': 0.75, 'p90': 0.90}
+
+
+def salary_bands(monthly):
+    """按月薪资 → 薪资区间编号（SALARY_BANDS 的下标）"""
+    monthly = np.asarray(monthly, dtype=np.float64)
+    bands = np.searchsorted(SALARY_BAND_EDGES, monthly, 'right')
+    bands[np.isnan(monthly)] = len(SALARY_BANDS) - 1
+    return bands
+
+
+def _group_stats(groups, salaries, size):
+    """按组编号汇总：每组的岗位数、有薪资的岗位数、平均值与分位数（没有岗位的组为 None）"""
+    jobs = np.bincount(groups, minlength=size)
+    known = ~np.isnan(salaries)
+    groups, salaries = groups[known], salaries[known]
+    order = np.lexsort((salaries, groups))
+    groups, salaries = groups[order], salaries[order]
+    starts = np.searchsorted(groups, np.arange(size), 'left')
+    ends = np.searchsorted(groups, np.arange(size), 'right')
+
+    result = []
+    for i in range(size):
+        if not jobs[i]:
+            result.append(None)
+            continue
+        values = salaries[starts[i]:ends[i]]
+        entry = {'jobs': int(jobs[i]), 'salary_jobs': len(values),
+                 'mean': float(values.mean()) if len(values) else None}
+        for name, q in QUANTILES.items():
+            entry[name] = float(np.quantile(values, q)) if len(values) else None
+        result.append(entry)
+    return result
+
+
+# ============= 汇总立方体 =============
+class MarketCube:
+    """主要类型 × 行业 × 薪资区间 的岗位计数，以及各组预先算好的薪资统计
+
+    - types / industries: 两个维度的取值（主要类型按 R/I/A/S/E/C 在前）
+    - counts: (类型数, 行业数, 薪资区间数) 岗位计数
+    - type_bands: (类型数, 薪资区间数) 岗位计数（每个岗位只计一次）
+    - stats(主要类型, 行业): 岗位数、平均、中位数与分位数薪资，任一维可以为 None（不限）
+    - top_industries(主要类型, n): 岗位最多的行业
+    """
+
+    def __init__(self, df):
+        monthly = salary_ranges(df)[2]
+        bands = salary_bands(monthly)
+        self.total_jobs = len(df)
+
+        # 主要类型：霍兰德六型在前，其余（如"未知"）按名称排在后面
+        main_types = ['未知' if not isinstance(t, str) else t for t in df['主要类型'].tolist()]
+        present = set(main_types)
+        self.types = [t for t in HOLLAND_ORDER if t in present] + sorted(present - set(HOLLAND_ORDER))
+        self._type_ids = {t: i for i, t in enumerate(self.types)}
+        job_types = np.array([self._type_ids[t] for t in main_types], dtype=np.int64)
+
+        # 行业展开：一个岗位在它的每个行业里各出现一次（与 IndustryIndex 同样经过 parse_industries 规范化）
+        cells = df['行业列表'].array
+        if isinstance(cells, IndustryListArray):
+            # 常驻岗位表直接在 CSR 编码上展开（pairs 做同样的规范化）；只保留实际出现的行业
+            job_rows, ids, names = cells.pairs()
+            used, job_industries = np.unique(ids, return_inverse=True)
+            self.industries = [names[i] for i in used.tolist()]
+        else:
+            industry_ids = {}
+            job_rows, job_industries = [], []
+            for row, cell in enumerate(cells):
+                for industry in parse_industries(cell):
+                    job_rows.append(row)
+                    job_industries.append(industry_ids.setdefault(industry, len(industry_ids)))
+            self.industries = list(industry_ids)
+        self._industry_ids = {industry: i for i, industry in enumerate(self.industries)}
+        job_rows = np.asarray(job_rows, dtype=np.int64)
+        job_industries = np.asarray(job_industries, dtype=np.int64).reshape(-1)
+
+        T, I, B = len(self.types), len(self.industries), len(SALARY_BANDS)
+        self.counts = np.zeros((T, I, B), dtype=np.int64)
+        np.add.at(self.counts, (job_types[job_rows], job_industries, bands[job_rows]), 1)
+        self.type_bands = np.zeros((T, B), dtype=np.int64)
+        np.add.at(self.type_bands, (job_types, bands), 1)
+
+        # 各组的薪资统计：全部、按类型、按行业、按 类型 × 行业
+        self._stats = {(None, None): _group_stats(np.zeros(len(df), dtype=np.int64), monthly, 1)[0]}
+        for t, entry in enumerate(_group_stats(job_types, monthly, T)):
+            self._stats[(self.types[t], None)] = entry
+        expanded = monthly[job_rows]
+        for i, entry in enumerate(_group_stats(job_industries, expanded, I)):
+            self._stats[(None, self.industries[i])] = entry
+        pairs = job_types[job_rows] * I + job_industries
+        for key, entry in enumerate(_group_stats(pairs, expanded, T * I)):
+            if entry is not None:
+                self._stats[(self.types[key // I], self.industries[key % I])] = entry
+
+        # 各类型（和全部）按岗位数降序的行业排名，岗位数相同时按行业名
+        names = np.array(self.industries, dtype=object)
+        industry_totals = self.counts.sum(axis=2)
+        self._rankings = {}
+        for t, totals in [(None, industry_totals.sum(axis=0))] + list(zip(self.types, industry_totals)):
+            order = np.lexsort((names, -totals))
+            order = order[totals[order] > 0]
+            self._rankings[t] = list(zip(names[order].tolist(), totals[order].tolist()))
+
+    def stats(self, main_type=None, industry=None):
+        """岗位数与薪资统计（jobs / salary_jobs / mean / p10 / p25 / median / p75 / p90）；没有岗位时为 None"""
+        return self._stats.get((main_type, industry))
+
+    def top_industries(self, main_type=None, n=10):
+        """岗位最多的 n 个行业：[(行业, 岗位数), ...]"""
+        return self._rankings.get(main_type, [])[:n]
+
+    def band_counts(self, main_type=None, industry=None):
+        """各薪资区间的岗位数（与 SALARY_BANDS 对应）；类型或行业不存在时全为 0"""
+        if (main_type is not None and main_type not in self._type_ids
+                or industry is not None and industry not in self._industry_ids):
+            return np.zeros(len(SALARY_BANDS), dtype=np.int64)
+        if industry is None:
+            counts = self.type_bands.sum(axis=0) if main_type is None else self.type_bands[self._type_ids[main_type]]
+        else:
+            counts = self.counts[:, self._industry_ids[industry], :]
+            counts = counts.sum(axis=0) if main_type is None else counts[self._type_ids[main_type]]
+        return counts.copy()
+
+    def type_band_frame(self):
+        """按类型的薪资区间分布（长表，画图用）：主要类型、薪资区间、岗位数"""
+        T, B = self.type_bands.shape
+        return pd.DataFrame({
+            '主要类型': np.repeat(self.types, B),
+            '薪资区间': SALARY_BANDS * T,
+            '岗位数': self.type_bands.ravel(),
+        })
+
+    def type_stats_frame(self):
+        """各主要类型的岗位数与薪资统计表"""
+        return pd.DataFrame([dict(主要类型=t, **self.stats(t)) for t in self.types])
@@ -0,0 +1,377 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""无界面的推荐服务（HTTP/JSON），与 Streamlit 界面共用同一个匹配引擎
+
+用法：python api.py [--host 0.0.0.0] [--port 8000] [--workers 4]
+
+接口：
+- GET  /health                   服务状态、岗位数与推荐结果缓存统计
+- GET  /questions                测评题目（选项只含文字）
+- GET  /industries               全部行业
+- POST /score       {"answers": [每题选项序号]}
+- POST /recommend   {"scores": {...}} 或 {"answers": [...]}，可选 top_n、min_salary、
+                    max_salary、industries、mmr_lambda、salary_range（[下限, 上限]，
+                    千/月，按区间交集筛选）、salary_weight（0 到 1，按薪资加权排序）
+- GET  /search?q=关键词&limit=20&offset=0&fuzzy=0   fuzzy=1 时按拼音、错别字容错匹配
+- GET  /metrics                  Prometheus 文本格式的各阶段耗时直方图与计数
+                                 （多进程时每个工作进程各自统计，只返回接到请求的那个进程的）
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from dataset import CACHE_DIR, DATA_FILE
+from engine import HOLLAND_ORDER
+from holland import QUESTIONS, answers_from_choices, calculate_user_scores
+from metrics import REGISTRY, trace
+from quiz_table import load_table
+from result_cache import ResultCache, cached_recommend
+from warmup import load_live_dataset
+
+MAX_TOP_N = 100
+MAX_SEARCH_LIMIT = 200
+MAX_BODY_BYTES = 64 * 1024
+
+
+# ============= 业务入口 =============
+class RecommendationService:
+    """测评打分、推荐与搜索；参数不合法时抛出 ValueError
+
+    每次调用先取一次数据集快照，增量合并不会影响正在处理的请求。
+    """
+
+    def __init__(self, live, cache=None, quiz_table=None):
+        self.live = live
+        self.cache = ResultCache() if cache is None else cache
+        self.quiz_table = quiz_table
+
+    def score(self, choices):
+        """按每题选项序号计算用户霍兰德得分"""
+        return calculate_user_scores(_parse_answers(choices))
+
+    def recommend(self, scores=None, answers=None, top_n=10, min_salary=0, max_salary=None,
+                  industries=None, mmr_lambda=1.0, salary_range=None, salary_weight=0.0):
+        """根据用户得分（或测评答案）推荐职业"""
+        quiz_answers = None
+        if scores is None:
+            if answers is None:
+                raise ValueError("需要 scores 或 answers")
+            quiz_answers = _parse_answers(answers)
+            scores = calculate_user_scores(quiz_answers)
+        user_scores = _parse_scores(scores)
+        top_n = _parse_int(top_n, 'top_n', 1, MAX_TOP_N)
+        min_salary = _parse_number(min_salary, 'min_salary')
+        max_salary = None if max_salary is None else _parse_number(max_salary, 'max_salary')
+        if industries is not None and (
+                not isinstance(industries, list) or not all(isinstance(ind, str) for ind in industries)):
+            raise ValueError("industries 必须是行业名列表")
+        mmr_lambda = _parse_number(mmr_lambda, 'mmr_lambda')
+        if not 0.0 <= mmr_lambda <= 1.0:
+            raise ValueError("mmr_lambda 必须在 0 到 1 之间")
+        salary_range = _parse_range(salary_range, 'salary_range')
+        salary_weight = _parse_number(salary_weight, 'salary_weight')
+        if not 0.0 <= salary_weight <= 1.0:
+            raise ValueError("salary_weight 必须在 0 到 1 之间")
+
+        engine = self.live.engine
+        table = self.quiz_table
+        if (quiz_answers is not None and table is not None and top_n == table.top_n and not min_salary
+                and max_salary is None and not industries and mmr_lambda == 1.0
+                and salary_range is None and not salary_weight):
+            # 按测评答案推荐且没有筛选条件：直接查预计算的答案路径表
+            jobs = table.lookup(engine, quiz_answers)
+            if jobs is not None:
+                return {'scores': user_scores, 'jobs': jobs}
+
+        return {
+            'scores': user_scores,
+            'jobs': cached_recommend(self.cache, engine, user_scores, top_n=top_n,
+                                     min_salary=min_salary, industries=industries,
+                                     max_salary=max_salary, mmr_lambda=mmr_lambda,
+                                     salary_range=salary_range, salary_weight=salary_weight),
+        }
+
+    def search(self, term, limit=20, offset=0, fuzzy=False):
+        """职业名称包含关键词的岗位（按匹配程度和薪资排序后分页）；fuzzy 时容错匹配"""
+        if not isinstance(term, str) or not term:
+            raise ValueError("需要搜索关键词 q")
+        limit = _parse_int(limit, 'limit', 1, MAX_SEARCH_LIMIT)
+        offset = _parse_int(offset, 'offset', 0, None)
+        fuzzy = _parse_flag(fuzzy, 'fuzzy')
+        engine = self.live.engine
+        rows = engine.fuzzy_search(term) if fuzzy else engine.search(term)
+        return {
+            'total': len(rows),
+            'jobs': [engine.listing(row) for row in rows[offset:offset + limit].tolist()],
+        }
+
+    def questions(self):
+        return [{'question': q['question'], 'options': [text for text, _ in q['options']]}
+                for q in QUESTIONS]
+
+    def industries(self):
+        return self.live.engine.industry_index.vocabulary
+
+    def health(self):
+        return {'status': 'ok', 'jobs': len(self.live.engine), 'pid': os.getpid(),
+                'cache': self.cache.stats()}
+
+
+def _parse_answers(choices):
+    if not isinstance(choices, list):
+        raise ValueError("answers 必须是选项序号列表")
+    return answers_from_choices(choices)
+
+
+def _parse_scores(scores):
+    if not isinstance(scores, dict):
+        raise ValueError("scores 必须是 {类型: 得分} 对象")
+    unknown = [t for t in scores if t not in HOLLAND_ORDER]
+    if unknown:
+        raise ValueError(f"未知的霍兰德类型: {', '.join(map(str, unknown))}")
+    return {t: _parse_number(scores.get(t, 0), f'scores.{t}') for t in HOLLAND_ORDER}
+
+
+def _parse_number(value, name):
+    if isinstance(value, bool):
+        raise ValueError(f"{name} 必须是数字")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} 必须是数字")
+    if number != number or number in (float('inf'), float('-inf')):
+        raise ValueError(f"{name} 必须是有限数字")
+    return number
+
+
+def _parse_range(value, name):
+    if value is None:
+        return None
+    if not isinstance(value, list) or len(value) != 2:
+        raise ValueError(f"{name} 必须是 [下限, 上限]")
+    low, high = (None if v is None else _parse_number(v, name) for v in value)
+    if low is not None and high is not None and low > high:
+        raise ValueError(f"{name} 的下限不能大于上限")
+    return low, high
+
+
+def _parse_flag(value, name):
+    if isinstance(value, bool):
+        return value
+    if str(value).lower() in ('1', 'true', 'yes'):
+        return True
+    if str(value).lower() in ('0', 'false', 'no', ''):
+        return False
+    raise ValueError(f"{name} 必须是 0 或 1")
+
+
+def _parse_int(value, name, lowest, highest):
+    if isinstance(value, bool):
+        raise ValueError(f"{name} 必须是整数")
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} 必须是整数")
+    if number < lowest or (highest is not None and number > highest):
+        raise ValueError(f"{name} 超出范围")
+    return number
+
+
+# ============= HTTP =============
+class ApiHandler(BaseHTTPRequestHandler):
+    """JSON 请求处理；保持长连接，避免每个请求都重新建立 TCP 连接"""
+
+    protocol_version = 'HTTP/1.1'
+    # 响应头和响应体分两次写出，长连接下要关掉 Nagle，否则每个请求都会等待延迟确认
+    disable_nagle_algorithm = True
+    service = None
+    access_log = False
+
+    def _url(self):
+        # http.server 按 latin-1 解码请求行；客户端直接发送 UTF-8 字节时还原成中文
+        try:
+            path = self.path.encode('latin-1').decode('utf-8')
+        except UnicodeError:
+            path = self.path
+        return urlsplit(path)
+
+    def do_GET(self):
+        url = self._url()
+        if url.path == '/metrics':
+            self._send_text(200, REGISTRY.to_prometheus(), 'text/plain; version=0.0.4; charset=utf-8')
+            return
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        routes = {
+            '/health': lambda: self.service.health(),
+            '/questions': lambda: self.service.questions(),
+            '/industries': lambda: self.service.industries(),
+            '/search': lambda: self.service.search(
+                query.get('q', ''), query.get('limit', 20), query.get('offset', 0),
+                query.get('fuzzy', False)),
+        }
+        self._dispatch(routes.get(url.path))
+
+    def do_POST(self):
+        url = self._url()
+        body = self._read_json()
+        if body is None:
+            return
+        routes = {
+            '/score': lambda: {'scores': self.service.score(body.get('answers'))},
+            '/recommend': lambda: self.service.recommend(**{
+                key: body[key] for key in ('scores', 'answers', 'top_n', 'min_salary', 'max_salary',
+                                           'industries', 'mmr_lambda', 'salary_range',
+                                           'salary_weight') if key in body
+            }),
+        }
+        self._dispatch(routes.get(url.path))
+
+    def _read_json(self):
+        # 长度不合法或过大时不读请求体，回应后关闭连接（剩下的字节不能当作下一个请求）
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._send(400, {'error': 'Content-Length 必须是非负整数'})
+            return None
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send(413, {'error': '请求体过大'})
+            return None
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send(400, {'error': '请求体不是合法的 JSON'})
+            return None
+        if not isinstance(body, dict):
+            self._send(400, {'error': '请求体必须是 JSON 对象'})
+            return None
+        return body
+
+    def _dispatch(self, handler):
+        if handler is None:
+            self._send(404, {'error': f'未知接口: {self.path}'})
+            return
+        try:
+            with trace('api.' + self._url().path.strip('/')):
+                result = handler()
+        except ValueError as e:
+            self._send(400, {'error': str(e)})
+        except Exception:
+            # 详细信息只写服务端日志，不返回给客户端
+            print(f"[{os.getpid()}] 处理 {self.command} {self.path} 时出错:", file=sys.stderr)
+            traceback.print_exc()
+            self._send(500, {'error': '服务内部错误'})
+        else:
+            self._send(200, result)
+
+    def _send(self, status, payload):
+        self._send_text(status, json.dumps(payload, ensure_ascii=False), 'application/json; charset=utf-8')
+
+    def _send_text(self, status, text, content_type):
+        data = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.access_log:
+            super().log_message(format, *args)
+
+
+def _refresh_loop(live, interval):
+    """后台定期合并 data_updates 目录里的新增量文件"""
+    while True:
+        try:
+            for path, result in live.refresh().items():
+                if 'error' in result:
+                    print(f"[{os.getpid()}] 增量数据合并失败（{path}）: {result['error']}", file=sys.stderr)
+        except Exception as e:
+            print(f"[{os.getpid()}] 增量数据合并失败: {e}", file=sys.stderr)
+        time.sleep(interval)
+
+
+def serve(host='0.0.0.0', port=8000, workers=1, source=DATA_FILE, cache_dir=CACHE_DIR,
+          refresh_interval=60, access_log=False, result_cache_size=4096, trace_log=None):
+    """启动服务：先加载数据集再 fork 工作进程，各进程共享监听端口和只读内存页"""
+    REGISTRY.trace_log = trace_log
+    live = load_live_dataset(source, cache_dir)
+    service = RecommendationService(live, ResultCache(maxsize=result_cache_size),
+                                    load_table(live.base_version, source, cache_dir))
+    handler = type('Handler', (ApiHandler,), {'service': service, 'access_log': access_log})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    print(f"已加载 {len(live.engine)} 个岗位，监听 http://{host}:{server.server_address[1]}", flush=True)
+
+    def run():
+        if refresh_interval:
+            threading.Thread(target=_refresh_loop, args=(live, refresh_interval), daemon=True).start()
+        server.serve_forever()
+
+    # 不支持 fork 的平台（Windows）只用单进程
+    if workers <= 1 or not hasattr(os, 'fork'):
+        try:
+            run()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                run()
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    def stop(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for pid in children:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+    server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="霍兰德职业推荐 HTTP/JSON 服务")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='工作进程数（默认等于 CPU 核数）')
+    parser.add_argument('--source', default=DATA_FILE)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--refresh-interval', type=float, default=60,
+                        help='检查增量文件的间隔秒数，0 表示不检查')
+    parser.add_argument('--access-log', action='store_true', help='输出每个请求的访问日志')
+    parser.add_argument('--result-cache-size', type=int, default=4096,
+                        help='每个工作进程缓存的推荐结果条数')
+    parser.add_argument('--trace-log', help='把每个请求的各阶段耗时与计数按 JSON 行追加到这个文件')
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.workers, args.source, args.cache_dir,
+          args.refresh_interval, args.access_log, args.result_cache_size, args.trace_log)
@@ -6,10 +6,19 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from collections import Counter
-import re
+import hmac
 import io
+import os
 import sys
-import ast
+from analytics import SALARY_BANDS, MarketCube
+from dataset import DATA_FILE, file_digest, load_dataset
+from holland import HOLLAND_TYPES, QUESTIONS, calculate_user_scores
+from ingest import LiveDataset
+from metrics import REGISTRY, count, timer, trace
+from quiz_table import QuizTable, table_path
+from result_cache import ResultCache, cached_recommend
+from text_match import lazy_pinyin
+from warmup import load_engine
 # ============= 安全设置编码（只在需要时） =============
 try:
     # 检查是否在Streamlit Cloud环境
@@ -90,115 +99,36 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ============= 加载数据 =============
-@st.cache_data
 def load_data():
-    """加载处理好的职业数据"""
+    """加载处理好的职业数据（优先读取编译好的二进制缓存），返回 (数据表, 统计信息)
+
+    只做数据处理、不写界面，结果由 get_live_dataset 缓存；加载失败时返回示例数据，
+    错误信息放在统计信息的 error 里。
+    """
     try:
-        # 请确保这个文件路径正确
-        df = pd.read_excel("jobs_analyzed_统一单位.xlsx")
-        
-        # 处理霍兰德得分列（如果是字符串格式）
-        if '霍兰德得分' in df.columns and isinstance(df['霍兰德得分'].iloc[0], str):
-            df['霍兰德得分'] = df['霍兰德得分'].apply(ast.literal_eval)
-        
-        # 处理行业列表列（如果是字符串格式）
-        if '行业列表' in df.columns and isinstance(df['行业列表'].iloc[0], str):
-            try:
-                df['行业列表'] = df['行业列表'].apply(ast.literal_eval)
-            except:
-                # 如果转换失败，保持原样
-                pass
-        
-        # ============= 职业去重 =============
-        st.sidebar.markdown('<div class="deploy-info">', unsafe_allow_html=True)
-        st.sidebar.write(f"📊 去重前岗位数量: {len(df)}")
-        
-        # 规范化职业名称，用于去重
-        def normalize_job_name(job_name):
-            """规范化职业名称，去除薪资、福利等信息"""
-            job_name = str(job_name)
-            
-            # 保存原始名称
-            original = job_name
-            
-            # 1. 去除薪资信息（数字+K/千/万）
-            job_name = re.sub(r'\d+\.?\d*[kK]', '', job_name)  # 5K, 8K
-            job_name = re.sub(r'\d+\.?\d*千', '', job_name)    # 5千, 8千
-            job_name = re.sub(r'\d+\.?\d*万', '', job_name)    # 5万, 8万
-            job_name = re.sub(r'\d+-\d+', '', job_name)        # 5-8, 10-15
-            job_name = re.sub(r'\d+\.?\d*', '', job_name)      # 任何单独的数字
-            
-            # 2. 去除福利信息
-            welfare_words = ['双休', '周末双休', '单休', '大小周', '五险一金', '社保', '公积金', 
-                          '包吃', '包住', '餐补', '房补', '交通补助', '话补', '加班补助',
-                          '弹性工作', '年终奖', '绩效奖金', '全勤奖', '股票期权', '提成',
-                          '奖金', '补贴', '补助', '福利', '待遇优厚', '薪资面议']
-            for word in welfare_words:
-                job_name = job_name.replace(word, '')
-            
-            # 3. 去除括号及其内容
-            job_name = re.sub(r'\([^)]*\)', '', job_name)
-            job_name = re.sub(r'（[^）]*）', '', job_name)
-            job_name = re.sub(r'\[[^\]]*\]', '', job_name)
-            job_name = re.sub(r'【[^】]*】', '', job_name)
-            
-            # 4. 去除特殊字符和多余空格
-            job_name = re.sub(r'[^\w\u4e00-\u9fff]', ' ', job_name)  # 只保留中文、英文、数字
-            job_name = re.sub(r'\s+', ' ', job_name)
-            job_name = job_name.strip()
-            
-            # 如果规范化后为空或太短，返回原始名称的前几个字符
-            if not job_name or len(job_name) < 2:
-                # 尝试提取中文部分
-                chinese_part = re.findall(r'[\u4e00-\u9fff]+', original)
-                if chinese_part:
-                    job_name = ' '.join(chinese_part)
-                else:
-                    job_name = original[:8]
-            
-            return job_name
-        
-        # 添加规范化后的职业名称
-        df['职业_规范'] = df['职业'].apply(normalize_job_name)
-        
-        # 显示规范化后的唯一职业数
-        st.sidebar.write(f"📋 规范化后的唯一职业数: {df['职业_规范'].nunique()}")
-        
-        # 按规范化名称分组，保留薪资最高的那条记录
-        df_sorted = df.sort_values('平均薪资_千', ascending=False)
-        
-        # 定义分组后的聚合规则
-        aggregation_rules = {
-            '职业': 'first',  # 保留原始职业名称（薪资最高的那个）
-            '薪资': 'first',
-            '行业列表': 'first',
-            '主要类型': 'first',
-            '平均薪资_千': 'first',
-            '霍兰德得分': 'first'
-        }
-        
-        # 如果有其他列，也保留第一个值
-        for col in df.columns:
-            if col not in aggregation_rules and col not in ['职业_规范', 'index']:
-                aggregation_rules[col] = 'first'
-        
-        # 执行去重
-        df_deduplicated = df_sorted.groupby('职业_规范').agg(aggregation_rules).reset_index()
-        
-        # 删除辅助列
-        df_deduplicated = df_deduplicated.drop(columns=['职业_规范'])
-        
-        # 显示去重结果
-        st.sidebar.write(f"✅ 去重后岗位数量: {len(df_deduplicated)}")
-        st.sidebar.write(f"✨ 去除了 {len(df) - len(df_deduplicated)} 个重复岗位")
-        st.sidebar.markdown('</div>', unsafe_allow_html=True)
-        
-        return df_deduplicated
-        
+        # 请确保这个文件路径正确；文件内容变化时会自动重新编译缓存
+        return load_dataset(DATA_FILE)
     except Exception as e:
-        st.sidebar.error(f"加载数据失败: {e}")
         # 创建示例数据用于测试
-        return create_sample_data()
+        df = create_sample_data()
+        return df, {'before': len(df), 'unique_names': len(df), 'after': len(df), 'error': str(e)}
+
+def show_dataset_stats(stats):
+    """侧边栏显示职业去重结果与加载用时"""
+    if 'error' in stats:
+        st.sidebar.error(f"加载数据失败: {stats['error']}")
+        return
+    
+    # ============= 职业去重结果 =============
+    st.sidebar.markdown('<div class="deploy-info">', unsafe_allow_html=True)
+    st.sidebar.write(f"📊 去重前岗位数量: {stats['before']}")
+    st.sidebar.write(f"📋 规范化后的唯一职业数: {stats['unique_names']}")
+    st.sidebar.write(f"✅ 去重后岗位数量: {stats['after']}")
+    st.sidebar.write(f"✨ 去除了 {stats['before'] - stats['after']} 个重复岗位")
+    if 'timings' in stats:
+        source = "读取缓存" if stats.get('cache_hit') else "解析 Excel 并编译缓存"
+        st.sidebar.caption(f"⏱️ 数据加载用时 {stats['timings']['total'] * 1000:.0f} ms（{source}）")
+    st.sidebar.markdown('</div>', unsafe_allow_html=True)
 
 def create_sample_data():
     """创建示例数据（用于测试）"""
@@ -219,475 +149,272 @@ def create_sample_data():
     return pd.DataFrame(data)
 
 # ============= 获取所有行业列表 =============
-def get_all_industries(df):
-    """从数据框中提取所有唯一的行业"""
-    all_industries = set()
-    
-    for ind_list in df['行业列表']:
-        if isinstance(ind_list, list):
-            for ind in ind_list:
-                if isinstance(ind, str) and ind.strip():
-                    all_industries.add(ind.strip())
-        elif isinstance(ind_list, str):
-            # 如果是字符串，尝试分割
-            if ',' in ind_list:
-                for ind in ind_list.split(','):
-                    clean_ind = ind.strip().strip('[]\'\"')
-                    if clean_ind:
-                        all_industries.add(clean_ind)
-            else:
-                clean_ind = ind_list.strip().strip('[]\'\"')
-                if clean_ind:
-                    all_industries.add(clean_ind)
-    
-    return sorted(all_industries)
+def get_all_industries(engine):
+    """所有唯一的行业（直接读取行业倒排索引的词表）"""
+    return engine.industry_index.vocabulary
 
-# ============= 霍兰德类型说明 =============
-HOLLAND_TYPES = {
-    'R': {
-        'name': '现实型',
-        'color': '#FF6B6B',
-        'icon': '🛠️',
-        'description': '喜欢动手操作、机械维修、户外工作，擅长使用工具和设备。',
-        'traits': ['实际', '稳重', '踏实', '动手能力强'],
-        'examples': ['机械工程师', '电工', '建筑师', '驾驶员']
-    },
-    'I': {
-        'name': '研究型',
-        'color': '#4ECDC4',
-        'icon': '🔬',
-        'description': '喜欢思考分析、科学研究、解决问题，擅长理论和抽象思维。',
-        'traits': ['好奇', '理性', '独立', '分析能力强'],
-        'examples': ['数据分析师', '研究员', '程序员', '科学家']
-    },
-    'A': {
-        'name': '艺术型',
-        'color': '#FFD93D',
-        'icon': '🎨',
-        'description': '喜欢创意表达、艺术创作、自由发挥，富有想象力和创造力。',
-        'traits': ['创意', '感性', '表达力强', '追求个性'],
-        'examples': ['设计师', '作家', '音乐人', '摄影师']
-    },
-    'S': {
-        'name': '社会型',
-        'color': '#6BCB77',
-        'icon': '🤝',
-        'description': '喜欢帮助他人、沟通协作、教育培训，擅长人际交往。',
-        'traits': ['友善', '乐于助人', '善于沟通', '有同理心'],
-        'examples': ['教师', '护士', '心理咨询师', '人力资源']
-    },
-    'E': {
-        'name': '企业型',
-        'color': '#FF9F1C',
-        'icon': '💼',
-        'description': '喜欢领导管理、说服他人、达成目标，擅长决策和冒险。',
-        'traits': ['自信', '有野心', '善于说服', '领导力强'],
-        'examples': ['销售经理', '创业者', '项目经理', '市场总监']
-    },
-    'C': {
-        'name': '常规型',
-        'color': '#A9A9A9',
-        'icon': '📊',
-        'description': '喜欢数据处理、规范流程、组织整理，擅长执行和细节。',
-        'traits': ['细心', '有条理', '执行力强', '稳重'],
-        'examples': ['会计', '行政助理', '档案管理员', '数据录入员']
-    }
-}
+# 直接搜索模式每页显示的岗位数
+SEARCH_PAGE_SIZE = 20
 
-# ============= 用户性格测评问题 =============
-# ============= 用户性格测评问题 =============
-QUESTIONS = [
-    {
-        'question': '你在团队中通常扮演什么角色？',
-        'options': [
-            ('执行者，负责具体操作', {'R': 2, 'C': 1}),
-            ('思考者，负责分析问题', {'I': 2, 'C': 1}),
-            ('创意者，提供新点子', {'A': 2, 'I': 1}),
-            ('协调者，维护团队和谐', {'S': 2, 'E': 1}),
-            ('领导者，带领团队前进', {'E': 2, 'S': 1}),
-            ('组织者，确保流程规范', {'C': 2, 'R': 1})
-        ]
-    },
-    {
-        'question': '你最喜欢的休闲活动是什么？',
-        'options': [
-            ('动手制作或修理东西', {'R': 2, 'A': 1}),
-            ('阅读、研究感兴趣的话题', {'I': 2, 'C': 1}),
-            ('绘画、音乐、写作等创作', {'A': 2, 'I': 1}),
-            ('和朋友聚会、社交活动', {'S': 2, 'E': 1}),
-            ('参加竞赛、追求成就', {'E': 2, 'S': 1}),
-            ('整理物品、规划日程', {'C': 2, 'R': 1})
-        ]
-    },
-    {
-        'question': '你在工作中最看重什么？',
-        'options': [
-            ('稳定的环境和清晰的指令', {'C': 2, 'R': 1}),
-            ('能够深入研究和解决问题', {'I': 2, 'R': 1}),
-            ('自由发挥创意的空间', {'A': 2, 'I': 1}),
-            ('帮助他人、服务社会', {'S': 2, 'A': 1}),
-            ('晋升机会和领导地位', {'E': 2, 'S': 1}),
-            ('工作成果能被量化评估', {'C': 2, 'E': 1})
-        ]
-    },
-    {
-        'question': '朋友通常怎么形容你？',
-        'options': [
-            ('踏实可靠、动手能力强', {'R': 2, 'C': 1}),
-            ('聪明理性、爱思考', {'I': 2, 'R': 1}),
-            ('有创意、与众不同', {'A': 2, 'I': 1}),
-            ('善解人意、好相处', {'S': 2, 'A': 1}),
-            ('有魄力、能带动气氛', {'E': 2, 'S': 1}),
-            ('细心周到、有条理', {'C': 2, 'R': 1})
-        ]
-    },
-    {
-        'question': '面对新任务，你的第一反应是？',
-        'options': [
-            ('先动手尝试，在实践中学习', {'R': 2, 'C': 1}),
-            ('先收集资料，分析清楚再做', {'I': 2, 'C': 1}),
-            ('思考如何用创意的方式完成', {'A': 2, 'I': 1}),
-            ('考虑如何与他人合作完成', {'S': 2, 'E': 1}),
-            ('思考如何快速高效地达成目标', {'E': 2, 'S': 1}),
-            ('制定详细的计划和步骤', {'C': 2, 'R': 1})
-        ]
-    },
-    {
-        'question': '你更喜欢哪种学习方式？',
-        'options': [
-            ('动手实践，边做边学', {'R': 2, 'A': 1}),
-            ('阅读书籍、查阅资料', {'I': 2, 'C': 1}),
-            ('通过创意项目学习', {'A': 2, 'I': 1}),
-            ('小组讨论、交流学习', {'S': 2, 'E': 1}),
-            ('参加培训、听讲座', {'E': 2, 'C': 1}),
-            ('按步骤、按计划学习', {'C': 2, 'R': 1})
-        ]
-    },
-    {
-        'question': '在消费时，你更看重什么？',
-        'options': [
-            ('产品的实用性和耐用性', {'R': 2, 'C': 1}),
-            ('产品的科技含量和创新', {'I': 2, 'R': 1}),
-            ('产品的设计和美感', {'A': 2, 'I': 1}),
-            ('能否和朋友一起分享', {'S': 2, 'A': 1}),
-            ('品牌价值和身份象征', {'E': 2, 'S': 1}),
-            ('性价比和实用性', {'C': 2, 'R': 1})
-        ]
-    },
-    {
-        'question': '你如何处理压力？',
-        'options': [
-            ('通过运动或手工活动释放', {'R': 2, 'A': 1}),
-            ('分析问题根源，寻找解决方案', {'I': 2, 'C': 1}),
-            ('通过艺术创作表达情绪', {'A': 2, 'I': 1}),
-            ('找朋友倾诉、寻求支持', {'S': 2, 'E': 1}),
-            ('制定计划，积极应对', {'E': 2, 'C': 1}),
-            ('按部就班，一步步解决', {'C': 2, 'R': 1})
-        ]
-    },
-    {
-        'question': '你更喜欢哪种工作环境？',
-        'options': [
-            ('户外、车间、现场', {'R': 2, 'C': 1}),
-            ('实验室、图书馆、安静的环境', {'I': 2, 'C': 1}),
-            ('工作室、创意空间', {'A': 2, 'I': 1}),
-            ('开放的办公室、团队氛围', {'S': 2, 'E': 1}),
-            ('会议室、谈判桌、商务场合', {'E': 2, 'S': 1}),
-            ('办公室、有规律的工位', {'C': 2, 'R': 1})
-        ]
-    },
-    {
-        'question': '你最喜欢的电影类型是？',
-        'options': [
-            ('动作片、冒险片', {'R': 2, 'E': 1}),
-            ('科幻片、悬疑片', {'I': 2, 'C': 1}),
-            ('文艺片、音乐片', {'A': 2, 'I': 1}),
-            ('剧情片、情感片', {'S': 2, 'A': 1}),
-            ('商战片、传记片', {'E': 2, 'S': 1}),
-            ('纪录片、历史片', {'C': 2, 'R': 1})
-        ]
-    },
-    {
-        'question': '你如何做决定？',
-        'options': [
-            ('凭直觉和实际操作', {'R': 2, 'A': 1}),
-            ('收集信息，理性分析', {'I': 2, 'C': 1}),
-            ('凭创意和灵感', {'A': 2, 'I': 1}),
-            ('考虑他人感受和意见', {'S': 2, 'E': 1}),
-            ('快速果断，追求结果', {'E': 2, 'S': 1}),
-            ('按规则和流程', {'C': 2, 'R': 1})
-        ]
-    },
-    {
-        'question': '你更喜欢哪种解决问题的方式？',
-        'options': [
-            ('动手操作，现场解决', {'R': 2, 'C': 1}),
-            ('分析研究，找到规律', {'I': 2, 'C': 1}),
-            ('换个角度，创新解决', {'A': 2, 'I': 1}),
-            ('寻求帮助，团队协作', {'S': 2, 'E': 1}),
-            ('谈判协商，达成共识', {'E': 2, 'S': 1}),
-            ('按标准流程处理', {'C': 2, 'R': 1})
-        ]
-    },
-    {
-        'question': '你对未来的职业期待是什么？',
-        'options': [
-            ('成为技术专家、工匠', {'R': 2, 'I': 1}),
-            ('成为研究员、科学家', {'I': 2, 'C': 1}),
-            ('成为艺术家、设计师', {'A': 2, 'I': 1}),
-            ('成为教师、咨询师', {'S': 2, 'A': 1}),
-            ('成为管理者、企业家', {'E': 2, 'S': 1}),
-            ('成为专业人士、骨干', {'C': 2, 'R': 1})
-        ]
-    },
-    {
-        'question': '你最喜欢的学科是？',
-        'options': [
-            ('体育、物理实验、手工', {'R': 2, 'A': 1}),
-            ('数学、物理、化学', {'I': 2, 'C': 1}),
-            ('美术、音乐、文学', {'A': 2, 'I': 1}),
-            ('语文、历史、政治', {'S': 2, 'A': 1}),
-            ('商业、经济、管理', {'E': 2, 'S': 1}),
-            ('会计、统计、计算机', {'C': 2, 'R': 1})
-        ]
-    },
-    {
-        'question': '你如何安排周末？',
-        'options': [
-            ('做手工、户外运动、修理东西', {'R': 2, 'A': 1}),
-            ('看书、研究感兴趣的话题', {'I': 2, 'C': 1}),
-            ('画画、写作、听音乐', {'A': 2, 'I': 1}),
-            ('和朋友聚会、参加社交活动', {'S': 2, 'E': 1}),
-            ('参加培训、拓展人脉', {'E': 2, 'S': 1}),
-            ('整理房间、规划下周', {'C': 2, 'R': 1})
-        ]
-    },
-    {
-        'question': '你更喜欢哪种沟通方式？',
-        'options': [
-            ('直接了当，说重点', {'R': 2, 'E': 1}),
-            ('逻辑清晰，有理有据', {'I': 2, 'C': 1}),
-            ('生动形象，有创意', {'A': 2, 'I': 1}),
-            ('温和体贴，顾及感受', {'S': 2, 'A': 1}),
-            ('有说服力，能带动人', {'E': 2, 'S': 1}),
-            ('条理分明，按顺序', {'C': 2, 'R': 1})
-        ]
-    },
-    {
-        'question': '你对科技产品的态度？',
-        'options': [
-            ('喜欢拆解、研究原理', {'R': 2, 'I': 1}),
-            ('关注最新科技发展', {'I': 2, 'C': 1}),
-            ('喜欢创意科技产品', {'A': 2, 'I': 1}),
-            ('喜欢能连接社交的产品', {'S': 2, 'E': 1}),
-            ('关注商业价值', {'E': 2, 'S': 1}),
-            ('够用就好，注重实用', {'C': 2, 'R': 1})
-        ]
-    },
-    {
-        'question': '你最喜欢的旅游方式是？',
-        'options': [
-            ('自驾游、户外探险', {'R': 2, 'A': 1}),
-            ('文化考察、博物馆之旅', {'I': 2, 'C': 1}),
-            ('艺术之旅、摄影采风', {'A': 2, 'I': 1}),
-            ('结伴而行、团队旅游', {'S': 2, 'E': 1}),
-            ('商务旅行、考察', {'E': 2, 'S': 1}),
-            ('跟团游、有计划的旅行', {'C': 2, 'R': 1})
-        ]
-    },
-    {
-        'question': '你如何处理日常杂事？',
-        'options': [
-            ('马上动手处理', {'R': 2, 'C': 1}),
-            ('想清楚再做', {'I': 2, 'C': 1}),
-            ('换个方式处理', {'A': 2, 'I': 1}),
-            ('找人帮忙一起做', {'S': 2, 'E': 1}),
-            ('快速搞定，不管细节', {'E': 2, 'S': 1}),
-            ('按顺序、有条理地做', {'C': 2, 'R': 1})
-        ]
-    },
-    {
-        'question': '你更喜欢哪种类型的书籍？',
-        'options': [
-            ('实用手册、工具书', {'R': 2, 'C': 1}),
-            ('科普读物、专业书籍', {'I': 2, 'C': 1}),
-            ('小说、诗歌、艺术类', {'A': 2, 'I': 1}),
-            ('心理学、人际关系', {'S': 2, 'A': 1}),
-            ('成功学、商业传记', {'E': 2, 'S': 1}),
-            ('管理类、励志类', {'C': 2, 'R': 1})
-        ]
-    }
-]
+# ============= 推荐职业（优化版） =============
+@st.cache_resource
+def get_live_dataset():
+    """岗位表与匹配引擎只构建一次（所有会话共享），之后的新岗位按增量合并
 
-# ============= 计算用户霍兰德得分 =============
-def calculate_user_scores(answers):
-    """根据用户答案计算霍兰德得分"""
-    scores = {'R': 0, 'I': 0, 'A': 0, 'S': 0, 'E': 0, 'C': 0}
-    
-    for answer in answers:
-        for h_type, value in answer.items():
-            scores[h_type] += value
-    
-    # 归一化到0-1范围
-    max_score = max(scores.values()) if max(scores.values()) > 0 else 1
-    for h_type in scores:
-        scores[h_type] = scores[h_type] / max_score
-    
-    return scores
+    引擎优先从 warmup.py 编译好的快照内存映射，同一台机器上的多个进程共享数组内存。
+    """
+    df, stats = load_data()
+    engine = None if 'error' in stats else load_engine(df, DATA_FILE)
+    return LiveDataset(df, stats, engine)
 
-# ============= 推荐职业（优化版） =============
-def recommend_jobs(user_scores, df, top_n=10, min_salary=0, industries=None):
+@st.cache_resource
+def get_quiz_table_path():
+    """答案路径表的缓存目录（只对源文件算一次哈希）"""
+    return table_path(DATA_FILE, digest=file_digest(DATA_FILE))
+
+@st.cache_resource(max_entries=2)
+def open_quiz_table(version, target, mtime):
+    """内存映射答案路径表；表文件重新生成（mtime 变化）后重新打开"""
+    return QuizTable.load(target, version=version)
+
+def get_quiz_table():
+    """预计算的答案路径表（python quiz_table.py 生成）；没有时返回 None
+
+    缺失的结果不缓存：服务运行期间生成的表，下一次重跑就能用上。
+    """
+    try:
+        target = get_quiz_table_path()
+        mtime = os.path.getmtime(os.path.join(target, 'keys.npy'))
+    except OSError:
+        return None
+    return open_quiz_table(get_live_dataset().base_version, target, mtime)
+
+@st.cache_resource(max_entries=2)
+def get_market_cube(version, _df):
+    """就业市场汇总立方体：每个数据集版本只构建一次（所有会话共享）"""
+    return MarketCube(_df)
+
+@st.cache_resource
+def get_result_cache():
+    """推荐结果缓存（所有会话共享）：相同得分与筛选条件不再重复计算"""
+    return ResultCache(maxsize=4096, ttl=3600)
+
+def recommend_jobs(user_scores, engine, top_n=10, min_salary=0, industries=None, max_salary=None,
+                   salary_range=None, salary_weight=0.0):
     """根据用户得分推荐职业（保证多样性）"""
-    recommendations = []
-    
-    # 为每个岗位计算匹配度
-    for _, row in df.iterrows():
-        job_scores = row['霍兰德得分']
-        
-        # 计算余弦相似度
-        dot_product = sum(user_scores[t] * job_scores[t] for t in user_scores)
-        user_norm = sum(v**2 for v in user_scores.values()) ** 0.5
-        job_norm = sum(v**2 for v in job_scores.values()) ** 0.5
-        
-        if user_norm > 0 and job_norm > 0:
-            similarity = dot_product / (user_norm * job_norm)
-        else:
-            similarity = 0
-        
-        # 薪资过滤
-        if row['平均薪资_千'] < min_salary:
-            continue
-        
-        # 行业过滤
-        if industries:
-            job_industries = row['行业列表']
-            if isinstance(job_industries, list):
-                if not any(ind in job_industries for ind in industries):
-                    continue
-            elif isinstance(job_industries, str):
-                if not any(ind in job_industries for ind in industries):
-                    continue
-        
-        # 提取核心职业名称（用于去重）
-        core_name = extract_core_name(row['职业'])
-        
-        recommendations.append({
-            '职业': row['职业'],
-            '核心名称': core_name,
-            '薪资': row['薪资'],
-            '行业': ', '.join(row['行业列表']) if isinstance(row['行业列表'], list) else str(row['行业列表']),
-            '匹配度': similarity,
-            '匹配度百分比': round(similarity * 100, 1),
-            '主要类型': row['主要类型'],
-            '平均薪资_千': row['平均薪资_千']
-        })
-    
-    # 按匹配度排序
-    recommendations.sort(key=lambda x: x['匹配度'], reverse=True)
-    
-    # ============= 多样性筛选 =============
-    diverse_recommendations = []
-    seen_core_names = set()  # 记录已经出现过的核心职业
-    seen_industries = set()  # 记录已经出现过的行业
-    
-    # 先取匹配度最高的几个，但要保证多样性
-    for job in recommendations:
-        core_name = job['核心名称']
-        industry = job['行业']
-        
-        # 判断条件：
-        # 1. 如果这个核心职业还没出现过，直接加入
-        # 2. 如果核心职业出现过，但行业完全不同，也可以考虑
-        # 3. 如果核心职业和行业都相似，跳过
-        
-        if core_name not in seen_core_names:
-            # 新的核心职业，直接加入
-            diverse_recommendations.append(job)
-            seen_core_names.add(core_name)
-            seen_industries.add(industry)
-        elif industry not in seen_industries:
-            # 核心职业相似但行业不同，以较低优先级加入
-            # 检查是否已经有太多相似的
-            similar_count = sum(1 for r in diverse_recommendations if r['核心名称'] == core_name)
-            if similar_count < 2:  # 最多允许2个相似核心职业
-                diverse_recommendations.append(job)
-                seen_industries.add(industry)
-        # 其他情况跳过（避免重复）
-    
-    # 如果多样性筛选后不够数量，补充一些匹配度高的
-    if len(diverse_recommendations) < top_n:
-        for job in recommendations:
-            if job not in diverse_recommendations:
-                # 检查是否已经有太多相似的
-                core_name = job['核心名称']
-                similar_count = sum(1 for r in diverse_recommendations if r['核心名称'] == core_name)
-                if similar_count < 2:  # 最多允许2个相似
-                    diverse_recommendations.append(job)
-                if len(diverse_recommendations) >= top_n:
-                    break
-    
-    # 如果还不够，就按匹配度补充
-    if len(diverse_recommendations) < top_n:
-        for job in recommendations:
-            if job not in diverse_recommendations:
-                diverse_recommendations.append(job)
-                if len(diverse_recommendations) >= top_n:
-                    break
-    
-    # 重新按匹配度排序
-    diverse_recommendations.sort(key=lambda x: x['匹配度'], reverse=True)
-    
-    # 转换为显示格式
-    result = []
-    for job in diverse_recommendations[:top_n]:
-        result.append({
-            '职业': job['职业'],
-            '薪资': job['薪资'],
-            '行业': job['行业'],
-            '匹配度': job['匹配度百分比'],
-            '主要类型': job['主要类型'],
-            '平均薪资_千': job['平均薪资_千']
-        })
-    
-    return result
+    return cached_recommend(get_result_cache(), engine, user_scores, top_n=top_n,
+                            min_salary=min_salary, industries=industries, max_salary=max_salary,
+                            salary_range=salary_range, salary_weight=salary_weight)
+
+# ============= 会话内记忆化 =============
+def session_memo(name, key, compute):
+    """会话内的记忆化：输入 key 与上次相同时直接返回上次的结果，否则重新计算
+
+    结果存在 st.session_state 里，每个 name 只保留最近一次，悬停图表、点击其他
+    按钮这类不改变输入的重跑不会重复计算。
+    """
+    memo = st.session_state.setdefault('_session_memo', {})
+    entry = memo.get(name)
+    if entry is not None and entry[0] == key:
+        count('session_memo.hits')
+        return entry[1]
+    count('session_memo.misses')
+    value = compute()
+    memo[name] = (key, value)
+    return value
+
+def answers_key(answers):
+    """测评答案的不可变指纹（每题所选选项的 {类型: 分值}）"""
+    return tuple(tuple(sorted(answer.items())) for answer in answers)
+
+def radar_figure(user_scores):
+    """用户得分雷达图"""
+    fig = go.Figure()
+    fig.add_trace(go.Scatterpolar(
+        r=[user_scores[t] for t in ['R', 'I', 'A', 'S', 'E', 'C']],
+        theta=['现实型 R', '研究型 I', '艺术型 A', '社会型 S', '企业型 E', '常规型 C'],
+        fill='toself',
+        name='你的得分',
+        line_color='#1E88E5'
+    ))
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 1]
+            )),
+        showlegend=False,
+        height=400
+    )
+    return fig
+
+def match_bar_figure(recommendations):
+    """推荐岗位匹配度柱状图"""
+    rec_df = pd.DataFrame(recommendations)
+    return px.bar(rec_df.head(10), x='职业', y='匹配度', 
+                  color='匹配度', color_continuous_scale='viridis',
+                  title="Top 10 推荐岗位匹配度")
+
+def quiz_recommendations(engine, answers, user_scores, min_salary=0, industries=None, max_salary=None,
+                         salary_range=None, salary_weight=0.0):
+    """测评结果的推荐：没有筛选条件时查预计算的答案路径表，否则实时计算"""
+    quiz_table = get_quiz_table()
+    if (quiz_table is not None and quiz_table.top_n == 10 and not min_salary and not industries
+            and max_salary is None and salary_range is None and not salary_weight):
+        # 没有筛选条件：直接查预计算的答案路径表
+        recommendations = quiz_table.lookup(engine, answers)
+        if recommendations is not None:
+            count('recommend.quiz_table_hits')
+            return recommendations
+    return recommend_jobs(
+        user_scores, 
+        engine, 
+        top_n=10,
+        min_salary=min_salary,
+        industries=industries,
+        max_salary=max_salary,
+        salary_range=salary_range,
+        salary_weight=salary_weight
+    )
+
+# ============= 性能埋点 =============
+# 管理员口令：设置后，带 ?admin=口令 访问页面时侧边栏显示性能调试面板
+ADMIN_TOKEN = os.environ.get('HOLLAND_ADMIN_TOKEN')
+# Prometheus 文本文件（例如 node_exporter 的 textfile 目录），每次重跑后刷新
+METRICS_FILE = os.environ.get('HOLLAND_METRICS_FILE')
+# 结构化日志：每次重跑的各阶段耗时与计数追加为一行 JSON
+REGISTRY.trace_log = os.environ.get('HOLLAND_TRACE_LOG') or None
+
+def is_admin():
+    """当前页面是否带了正确的管理员口令"""
+    token = st.query_params.get('admin')
+    return bool(ADMIN_TOKEN) and token is not None and hmac.compare_digest(token, ADMIN_TOKEN)
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
 
-# ============= 提取核心职业名称 =============
-def extract_core_name(job_name):
-    """从完整职业名称中提取核心部分（用于去重）"""
-    job_name = str(job_name)
+def show_debug_panel(current):
+    """侧边栏的性能调试面板：本次重跑各阶段耗时与计数、所有会话累计的耗时分布"""
+    with st.sidebar.expander("🛠️ 性能调试", expanded=False):
+        st.caption(f"本次重跑共 {current.seconds * 1000:.1f} ms（各阶段为自身耗时，不含嵌套阶段）")
+        st.dataframe(pd.DataFrame(
+            [{'阶段': stage, '耗时 ms': _ms(seconds), '次数': current.calls[stage]}
+             for stage, seconds in sorted(current.stages.items(), key=lambda item: -item[1])]
+        ), hide_index=True)
+        if current.counters:
+            st.dataframe(pd.DataFrame(
+                [{'计数': name, '值': value} for name, value in sorted(current.counters.items())]
+            ), hide_index=True)
+
+        st.caption("所有会话累计（p50 / p95 按直方图桶估计）")
+        st.dataframe(pd.DataFrame(
+            [{'阶段': row['stage'], '次数': row['count'], '平均 ms': _ms(row['mean']),
+              'p50 ms': _ms(row['p50']), 'p95 ms': _ms(row['p95'])} for row in REGISTRY.summary()]
+        ), hide_index=True)
+        st.download_button("下载 Prometheus 指标", REGISTRY.to_prometheus(),
+                           file_name="holland_metrics.prom", mime="text/plain")
+
+# ============= 就业市场概览 =============
+def _type_label(main_type):
+    """主要类型的展示名称"""
+    info = HOLLAND_TYPES.get(main_type)
+    return f"{info['icon']} {info['name']}" if info else main_type
+
+def show_market_dashboard(cube):
+    """就业市场概览：各类型的薪资分布与行业构成（全部来自预先汇总的立方体）"""
+    st.markdown("## 📈 就业市场概览")
+    overall = cube.stats()
+    if not overall:
+        st.warning("暂无岗位数据")
+        return
     
-    # 常见的职业关键词
-    job_keywords = [
-        '数据分析', '数据挖掘', '数据开发', '数据仓库', '数据工程',
-        '算法', '机器学习', '深度学习', '人工智能', 'AI',
-        '产品经理', '产品运营', '产品助理',
-        '运营', '用户运营', '内容运营', '活动运营',
-        '市场', '营销', '推广', '投放', '广告',
-        '销售', '商务', '渠道', '客户经理',
-        '前端', '后端', '全栈', '移动开发', '测试',
-        'UI', 'UX', '交互设计', '视觉设计', '平面设计',
-        '人力资源', 'HR', '招聘', '培训', '行政',
-        '财务', '会计', '出纳', '审计',
-        '客服', '售后', '技术支持',
-        '采购', '供应链', '物流',
-        '法务', '律师', '合规',
-        '咨询', '顾问', '分析师'
-    ]
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("总岗位数", overall['jobs'])
+    with col2:
+        st.metric("行业数", len(cube.industries))
+    if overall['salary_jobs']:
+        with col3:
+            st.metric("月薪中位数", f"{overall['median']:.1f}千/月")
+        with col4:
+            st.metric("月薪 25%-75%", f"{overall['p25']:.1f}-{overall['p75']:.1f}千")
+    st.caption("年薪、日薪、时薪都折算成月薪；薪资未知的岗位只计入岗位数。一个岗位属于多个行业时在每个行业各计一次。")
     
-    # 尝试匹配关键词
-    for keyword in job_keywords:
-        if keyword in job_name:
-            return keyword
+    # 各类型的薪资分布
+    st.markdown("### 💰 各霍兰德类型的薪资分布")
+    with timer('render.market'):
+        band_df = cube.type_band_frame()
+        band_df['主要类型'] = band_df['主要类型'].map(_type_label)
+        fig = px.bar(band_df, x='主要类型', y='岗位数', color='薪资区间',
+                     category_orders={'薪资区间': SALARY_BANDS, '主要类型': [_type_label(t) for t in cube.types]},
+                     color_discrete_sequence=px.colors.sequential.Viridis, title="各类型岗位的月薪区间")
+        st.plotly_chart(fig, use_container_width=True)
+        
+        stats_df = cube.type_stats_frame()
+        stats_df['主要类型'] = stats_df['主要类型'].map(_type_label)
+        st.dataframe(stats_df.rename(columns={
+            'jobs': '岗位数', 'salary_jobs': '有薪资岗位', 'mean': '平均（千/月）', 'p10': 'P10',
+            'p25': 'P25', 'median': '中位数', 'p75': 'P75', 'p90': 'P90'
+        }).round(1), hide_index=True)
     
-    # 如果没有匹配到关键词，返回前4个字符
-    return job_name[:4]
+    # 行业构成
+    st.markdown("### 🏭 行业构成")
+    main_type = st.selectbox("按主要类型查看", [None] + cube.types,
+                             format_func=lambda t: "全部类型" if t is None else _type_label(t))
+    with timer('render.market'):
+        top = cube.top_industries(main_type, n=15)
+        if not top:
+            st.info("这个类型暂无行业数据")
+            return
+        col1, col2 = st.columns([3, 2])
+        with col1:
+            fig = px.bar(pd.DataFrame(top, columns=['行业', '岗位数']), x='岗位数', y='行业',
+                         orientation='h', title="岗位最多的行业")
+            fig.update_layout(yaxis={'autorange': 'reversed'}, height=500)
+            st.plotly_chart(fig, use_container_width=True)
+        with col2:
+            industry = st.selectbox("查看行业薪资", [name for name, _ in top])
+            stats = cube.stats(main_type, industry)
+            if stats and stats['salary_jobs']:
+                st.metric("月薪中位数", f"{stats['median']:.1f}千/月",
+                          help=f"{stats['salary_jobs']} 个有薪资的岗位，平均 {stats['mean']:.1f}千/月")
+                st.metric("月薪 10%-90%", f"{stats['p10']:.1f}-{stats['p90']:.1f}千")
+            fig = px.bar(pd.DataFrame({'薪资区间': SALARY_BANDS, '岗位数': cube.band_counts(main_type, industry)}),
+                         x='薪资区间', y='岗位数', title=f"{industry} 的月薪区间")
+            fig.update_layout(height=350)
+            st.plotly_chart(fig, use_container_width=True)
+
 # ============= 主应用 =============
 def main():
-    # 加载数据
-    df = load_data()
+    """一次重跑：各阶段计时，结束后导出指标；管理员可以看到调试面板"""
+    try:
+        with trace('rerun') as current:
+            render_page()
+    finally:
+        if METRICS_FILE:
+            try:
+                REGISTRY.write_prometheus(METRICS_FILE)
+            except OSError:
+                pass
+    if is_admin():
+        show_debug_panel(current)
+
+def render_page():
+    # 加载数据（data_updates 目录里有新的增量文件时只合并增量）
+    with timer('load_data'):
+        live = get_live_dataset()
+        try:
+            for path, result in live.refresh().items():
+                if 'error' in result:
+                    st.sidebar.warning(f"增量数据合并失败（{os.path.basename(path)}）: {result['error']}")
+        except Exception as e:
+            st.sidebar.warning(f"增量数据合并失败: {e}")
+        df, stats, engine = live.snapshot
+    show_dataset_stats(stats)
     
     # 获取所有行业
-    all_industries = get_all_industries(df)
+    with timer('get_all_industries'):
+        all_industries = get_all_industries(engine)
     
     # 侧边栏
     with st.sidebar:
@@ -698,7 +425,7 @@ def main():
         # 测评模式选择
         mode = st.radio(
             "选择测评方式",
-            ["📝 快速测评", "✋ 手动选择类型", "🔍 直接搜索"]
+            ["📝 快速测评", "✋ 手动选择类型", "🔍 直接搜索", "📈 就业市场"]
         )
         
         st.markdown("---")
@@ -715,6 +442,29 @@ def main():
             step=1,
             help="单位：千/月 (5千=5, 1万=10, 2万=20)"
         )
+        max_salary = st.slider(
+            "最高月薪 (千/月)",
+            min_value=0,
+            max_value=50,
+            value=50,
+            step=1,
+            help="拖到最右端（50）表示不限"
+        )
+        if max_salary >= 50:
+            max_salary = None
+        salary_range = None
+        if st.checkbox("按薪资区间交集筛选", value=False,
+                       help="岗位薪资区间与所选区间有交集即保留；年薪、日薪、时薪都折算成月薪，薪资未知的岗位不显示"):
+            salary_range = (min_salary or None, max_salary)
+            min_salary, max_salary = 0, None
+        salary_weight = st.slider(
+            "薪资优先程度",
+            min_value=0.0,
+            max_value=0.5,
+            value=0.0,
+            step=0.1,
+            help="大于 0 时按 匹配度 与 薪资 的加权和排序，显示的匹配度不变"
+        )
         
         # 行业筛选
         if all_industries:
@@ -776,33 +526,19 @@ def main():
         if st.session_state.step >= len(QUESTIONS) and st.session_state.answers:
             st.success("✅ 测评完成！正在为你分析...")
             
-            # 计算用户得分
-            user_scores = calculate_user_scores(st.session_state.answers)
+            # 计算用户得分（答案没变时直接用本会话上次的结果）
+            answers = st.session_state.answers
+            quiz_key = answers_key(answers)
+            user_scores = session_memo('quiz_scores', quiz_key, lambda: calculate_user_scores(answers))
             
             # 显示用户性格雷达图
             st.markdown("## 🎯 你的性格类型分析")
             
             col1, col2 = st.columns([1, 1])
             
-            with col1:
+            with col1, timer('render.radar'):
                 # 雷达图
-                fig = go.Figure()
-                fig.add_trace(go.Scatterpolar(
-                    r=[user_scores[t] for t in ['R', 'I', 'A', 'S', 'E', 'C']],
-                    theta=['现实型 R', '研究型 I', '艺术型 A', '社会型 S', '企业型 E', '常规型 C'],
-                    fill='toself',
-                    name='你的得分',
-                    line_color='#1E88E5'
-                ))
-                fig.update_layout(
-                    polar=dict(
-                        radialaxis=dict(
-                            visible=True,
-                            range=[0, 1]
-                        )),
-                    showlegend=False,
-                    height=400
-                )
+                fig = session_memo('quiz_radar', quiz_key, lambda: radar_figure(user_scores))
                 st.plotly_chart(fig, use_container_width=True)
             
             with col2:
@@ -826,40 +562,40 @@ def main():
             st.markdown("---")
             st.markdown("## 💼 为你推荐的职业")
             
-            recommendations = recommend_jobs(
-                user_scores, 
-                df, 
-                top_n=10,
-                min_salary=min_salary,
-                industries=selected_industries if selected_industries != ["暂无数据"] else None
-            )
+            industries = selected_industries if selected_industries != ["暂无数据"] else None
+            # 答案、筛选条件和数据集版本都没变时直接用本会话上次的推荐与图表
+            filters_key = (quiz_key, engine.version, min_salary, max_salary,
+                           tuple(industries) if industries else None, salary_range, salary_weight)
+            with timer('recommend'):
+                recommendations = session_memo('quiz_recommendations', filters_key, lambda: quiz_recommendations(
+                    engine, answers, user_scores, min_salary, industries, max_salary, salary_range, salary_weight
+                ))
             
             if recommendations:
-                for job in recommendations:
-                    with st.container():
-                        st.markdown(f"""
-                        <div class="job-card">
-                            <div style="display: flex; justify-content: space-between; align-items: center;">
-                                <div>
-                                    <h3 style="margin:0">{job['职业']}</h3>
-                                    <p style="color: #666; margin:5px 0">行业：{job['行业']}</p>
-                                    <p style="color: #666; margin:5px 0">薪资：{job['薪资']}</p>
-                                </div>
-                                <div style="text-align: right;">
-                                    <span class="match-badge">匹配度 {job['匹配度']}%</span>
-                                    <p style="color: #1E88E5; margin:5px 0">类型：{job['主要类型']}</p>
+                with timer('render.cards'):
+                    for job in recommendations:
+                        with st.container():
+                            st.markdown(f"""
+                            <div class="job-card">
+                                <div style="display: flex; justify-content: space-between; align-items: center;">
+                                    <div>
+                                        <h3 style="margin:0">{job['职业']}</h3>
+                                        <p style="color: #666; margin:5px 0">行业：{job['行业']}</p>
+                                        <p style="color: #666; margin:5px 0">薪资：{job['薪资']}</p>
+                                    </div>
+                                    <div style="text-align: right;">
+                                        <span class="match-badge">匹配度 {job['匹配度']}%</span>
+                                        <p style="color: #1E88E5; margin:5px 0">类型：{job['主要类型']}</p>
+                                    </div>
                                 </div>
                             </div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                            """, unsafe_allow_html=True)
                 
                 # 可视化推荐结果
                 st.markdown("### 📊 推荐岗位匹配度分布")
-                rec_df = pd.DataFrame(recommendations)
-                fig = px.bar(rec_df.head(10), x='职业', y='匹配度', 
-                            color='匹配度', color_continuous_scale='viridis',
-                            title="Top 10 推荐岗位匹配度")
-                st.plotly_chart(fig, use_container_width=True)
+                with timer('render.bar'):
+                    fig = session_memo('quiz_bar', filters_key, lambda: match_bar_figure(recommendations))
+                    st.plotly_chart(fig, use_container_width=True)
             else:
                 st.warning("没有找到匹配的岗位，请调整筛选条件")
             
@@ -940,13 +676,17 @@ def main():
             st.markdown("---")
             st.markdown("## 💼 为你推荐的职业")
             
-            recommendations = recommend_jobs(
-                user_scores, 
-                df, 
-                top_n=10,
-                min_salary=min_salary,
-                industries=selected_industries if selected_industries != ["暂无数据"] else None
-            )
+            with timer('recommend'):
+                recommendations = recommend_jobs(
+                    user_scores, 
+                    engine, 
+                    top_n=10,
+                    min_salary=min_salary,
+                    industries=selected_industries if selected_industries != ["暂无数据"] else None,
+                    max_salary=max_salary,
+                    salary_range=salary_range,
+                    salary_weight=salary_weight
+                )
             
             if recommendations:
                 for job in recommendations:
@@ -969,41 +709,73 @@ def main():
             else:
                 st.warning("没有找到匹配的岗位，请调整筛选条件")
     
+    elif mode == "📈 就业市场":
+        show_market_dashboard(get_market_cube(engine.version, df))
+    
     else:  # 直接搜索模式
         st.markdown("## 🔍 直接搜索职业")
         
         # 搜索框
-        search_term = st.text_input("输入职业关键词", placeholder="例如：数据分析师、销售经理...")
+        search_term = st.text_input("输入职业关键词", placeholder="例如：数据分析师、销售经理、shujufenxi...")
+        fuzzy = st.checkbox("模糊匹配（拼音、错别字）", value=False)
+        if lazy_pinyin is None and (fuzzy or search_term and search_term.isascii()):
+            st.warning("服务器未安装 pypinyin，模糊匹配只按汉字进行，暂不支持拼音搜索")
         
         if search_term:
-            # 过滤数据
-            filtered_df = df[df['职业'].str.contains(search_term, case=False, na=False)]
+            # 过滤数据（与推荐共用同一个匹配引擎）：只得到匹配的行号，不取出整行
+            matched_rows = engine.fuzzy_search(search_term) if fuzzy else engine.search(search_term)
+            if not fuzzy and not len(matched_rows):
+                # 精确搜索没有结果时自动改用模糊匹配
+                matched_rows = engine.fuzzy_search(search_term)
+                if len(matched_rows):
+                    st.info("没有完全匹配的职业，以下是按拼音或相近写法找到的结果")
+            total = len(matched_rows)
             
-            if not filtered_df.empty:
-                st.success(f"找到 {len(filtered_df)} 个相关职业")
+            if total:
+                # 换了关键词或匹配方式就回到第一页
+                if st.session_state.get('search_term') != (search_term, fuzzy):
+                    st.session_state.search_term = (search_term, fuzzy)
+                    st.session_state.search_page = 0
+                pages = (total + SEARCH_PAGE_SIZE - 1) // SEARCH_PAGE_SIZE
+                page = min(st.session_state.search_page, pages - 1)
                 
-                for _, row in filtered_df.iterrows():
-                    with st.container():
-                        # 处理行业显示
-                        if isinstance(row['行业列表'], list):
-                            industry_display = ', '.join(row['行业列表'])
-                        else:
-                            industry_display = str(row['行业列表'])
-                        
-                        st.markdown(f"""
+                st.success(f"找到 {total} 个相关职业")
+                
+                # 只渲染当前这一页的卡片，匹配再多页面大小也不变
+                start = page * SEARCH_PAGE_SIZE
+                cards = []
+                for row in matched_rows[start:start + SEARCH_PAGE_SIZE].tolist():
+                    job = engine.listing(row)
+                    cards.append(f"""
                         <div class="job-card">
                             <div style="display: flex; justify-content: space-between; align-items: center;">
                                 <div>
-                                    <h3 style="margin:0">{row['职业']}</h3>
-                                    <p style="color: #666; margin:5px 0">行业：{industry_display}</p>
-                                    <p style="color: #666; margin:5px 0">薪资：{row['薪资']}</p>
+                                    <h3 style="margin:0">{job['职业']}</h3>
+                                    <p style="color: #666; margin:5px 0">行业：{job['行业']}</p>
+                                    <p style="color: #666; margin:5px 0">薪资：{job['薪资']}</p>
                                 </div>
                                 <div style="text-align: right;">
-                                    <p style="color: #1E88E5; margin:5px 0">类型：{row['主要类型']}</p>
+                                    <p style="color: #1E88E5; margin:5px 0">类型：{job['主要类型']}</p>
                                 </div>
                             </div>
                         </div>
-                        """, unsafe_allow_html=True)
+                        """)
+                st.markdown(''.join(cards), unsafe_allow_html=True)
+                
+                # 翻页
+                col1, col2, col3 = st.columns([1, 2, 1])
+                with col1:
+                    if st.button("◀ 上一页", disabled=page == 0, use_container_width=True):
+                        st.session_state.search_page = page - 1
+                        st.rerun()
+                with col2:
+                    st.markdown(f"<p style='text-align:center'>第 {page + 1} / {pages} 页"
+                                f"（第 {start + 1}-{min(start + SEARCH_PAGE_SIZE, total)} 个）</p>",
+                                unsafe_allow_html=True)
+                with col3:
+                    if st.button("下一页 ▶", disabled=page >= pages - 1, use_container_width=True):
+                        st.session_state.search_page = page + 1
+                        st.rerun()
             else:
                 st.warning("没有找到匹配的职业")
         
@@ -1011,16 +783,23 @@ def main():
         st.markdown("---")
         st.markdown("### 📊 数据概览")
         
+        # 直接查预先汇总的立方体，不扫描岗位表
+        cube = get_market_cube(engine.version, df)
+        overall = cube.stats()
+        top_industry = cube.top_industries(n=1)
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("总岗位数", len(df))
+            st.metric("总岗位数", cube.total_jobs)
         with col2:
-            avg_salary = df['平均薪资_千'].mean()
-            st.metric("平均薪资", f"{avg_salary:.1f}千/月 ({avg_salary/10:.1f}万/月)")
+            avg_salary = overall['mean'] if overall else None
+            if avg_salary is not None:
+                st.metric("平均薪资", f"{avg_salary:.1f}千/月 ({avg_salary/10:.1f}万/月)",
+                          help="年薪、日薪等折算成月薪，不含薪资未知的岗位")
+            else:
+                st.metric("平均薪资", "暂无数据")
         with col3:
-            # 处理可能的空数据
-            if all_industries:
-                st.metric("主要行业", all_industries[0] if all_industries else "暂无数据")
+            if top_industry:
+                st.metric("主要行业", top_industry[0][0], help=f"岗位最多的行业（{top_industry[0][1]} 个岗位）")
             else:
                 st.metric("主要行业", "暂无数据")
 
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""批量推荐：一次为整届学生的测评结果生成推荐，边算边写出
+
+用法：python batch.py 输入文件 输出文件.csv|.parquet [--top-n 10] [--min-salary 0]
+                     [--max-salary 上限] [--industry 行业 ...] [--workers N] [--memory-mb 256]
+
+输入文件（xlsx / CSV / JSONL）每行一名学生：
+- R/I/A/S/E/C 六列得分；或
+- answers（或 答案）列：每题所选选项的序号，如 "[0, 3, 1, ...]" 或 "0 3 1 ..."
+学生编号取 学号 / student_id / id / 姓名 中第一个存在的列，都没有时用行号。
+"""
+
+import argparse
+import ast
+import csv
+import multiprocessing
+import re
+import sys
+import time
+
+import numpy as np
+
+from dataset import CACHE_DIR, DATA_FILE, load_dataset, read_table
+from engine import HOLLAND_ORDER
+from holland import answers_from_choices, calculate_user_scores
+from warmup import load_engine
+
+ID_COLUMNS = ('学号', 'student_id', 'id', '姓名')
+ANSWER_COLUMNS = ('answers', '答案')
+OUTPUT_COLUMNS = ['学生', '排名', '职业', '薪资', '行业', '匹配度', '主要类型', '平均薪资_千']
+
+_SEPARATORS = re.compile(r'[\s,，;；]+')
+
+
+# ============= 读取学生测评结果 =============
+def _parse_choices(value):
+    """一个 answers 单元格 → 选项序号列表"""
+    if isinstance(value, (list, tuple)):
+        return [int(v) for v in value]
+    text = str(value).strip()
+    if text.startswith('['):
+        return [int(v) for v in ast.literal_eval(text)]
+    return [int(v) for v in _SEPARATORS.split(text) if v]
+
+
+def read_cohort(path):
+    """读取学生测评结果，返回 (学生编号列表, (人数, 6) 得分矩阵，列顺序 R/I/A/S/E/C)"""
+    df = read_table(path)
+    id_column = next((col for col in ID_COLUMNS if col in df.columns), None)
+    ids = [str(v) for v in df[id_column]] if id_column else [str(i + 1) for i in range(len(df))]
+
+    answer_column = next((col for col in ANSWER_COLUMNS if col in df.columns), None)
+    if all(t in df.columns for t in HOLLAND_ORDER):
+        vectors = df[HOLLAND_ORDER].to_numpy(dtype=np.float64)
+    elif answer_column:
+        vectors = np.empty((len(df), len(HOLLAND_ORDER)))
+        for i, value in enumerate(df[answer_column]):
+            try:
+                scores = calculate_user_scores(answers_from_choices(_parse_choices(value)))
+            except (ValueError, SyntaxError) as e:
+                raise ValueError(f"第 {i + 1} 行（学生 {ids[i]}）的答案无效: {e}")
+            vectors[i] = [scores[t] for t in HOLLAND_ORDER]
+    else:
+        raise ValueError(f"{path} 需要 {'/'.join(HOLLAND_ORDER)} 六列得分或 answers 列")
+
+    if np.isnan(vectors).any():
+        raise ValueError(f"{path} 中有缺失的得分")
+    return ids, vectors
+
+
+# ============= 批量计算 =============
+# 工作进程里的引擎与批量参数（fork 时直接继承，不需要序列化）
+_batch = {}
+
+
+def _init_batch(engine, candidates, options, method='recommend'):
+    _batch.update(engine=engine, candidates=candidates, options=options, method=method)
+
+
+def _recommend_chunk(vectors):
+    """一块学生：一次矩阵乘法算出全部粗排分数，再逐人精排和多样性重排"""
+    engine, candidates, options = _batch['engine'], _batch['candidates'], _batch['options']
+    recommend = getattr(engine, _batch['method'])
+    coarse = engine.coarse_matrix(vectors, candidates) if len(candidates) else None
+    results = []
+    for i, vector in enumerate(vectors.tolist()):
+        user_scores = dict(zip(HOLLAND_ORDER, vector))
+        results.append(recommend(
+            user_scores, candidates=candidates,
+            coarse=None if coarse is None else coarse[i], **options
+        ))
+    return results
+
+
+def chunk_rows(candidate_count, memory_mb=256):
+    """每块的学生数：粗排矩阵（连同运算中的临时矩阵）不超过 memory_mb"""
+    return max(1, int(memory_mb * 2**20) // (max(candidate_count, 1) * 4 * 2))
+
+
+def recommend_batch(engine, vectors, top_n=10, min_salary=0, industries=None, max_salary=None,
+                    mmr_lambda=1.0, workers=1, memory_mb=256, chunk_size=None, progress=None,
+                    rows_only=False):
+    """按输入顺序逐个产出每名学生的推荐列表，结果与逐个调用 engine.recommend 相同
+
+    学生按块计算，每块的粗排分数是一次 (学生数 × 6)·(6 × 岗位数) 的矩阵乘法，
+    块大小由 memory_mb 限制；workers > 1 时各块分给多个进程并行计算。
+    progress(已完成人数, 总人数) 在每块完成后调用。rows_only 时产出的是
+    engine.recommend_rows 的 (行号, 匹配度百分比) 列表。
+    """
+    method = 'recommend_rows' if rows_only else 'recommend'
+    vectors = np.asarray(vectors, dtype=np.float64).reshape(-1, len(HOLLAND_ORDER))
+    candidates = engine.candidates(min_salary, industries, max_salary)
+    options = {'top_n': top_n, 'mmr_lambda': mmr_lambda}
+    chunk_size = chunk_size or chunk_rows(len(candidates), memory_mb)
+    chunks = (vectors[start:start + chunk_size] for start in range(0, len(vectors), chunk_size))
+
+    pool = None
+    if workers > 1 and len(vectors) > chunk_size:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        pool = context.Pool(workers, initializer=_init_batch,
+                            initargs=(engine, candidates, options, method))
+        results = pool.imap(_recommend_chunk, chunks)
+    else:
+        _init_batch(engine, candidates, options, method)
+        results = map(_recommend_chunk, chunks)
+
+    done = 0
+    try:
+        for chunk in results:
+            yield from chunk
+            done += len(chunk)
+            if progress:
+                progress(done, len(vectors))
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+
+# ============= 写出结果 =============
+class CsvWriter:
+    """逐行追加写 CSV（带 BOM，Excel 直接打开不乱码）"""
+
+    def __init__(self, path):
+        self._file = open(path, 'w', encoding='utf-8-sig', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(OUTPUT_COLUMNS)
+
+    def write(self, rows):
+        self._writer.writerows([row[col] for col in OUTPUT_COLUMNS] for row in rows)
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter:
+    """按批追加写 Parquet（需要 pyarrow）"""
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("输出 Parquet 需要安装 pyarrow：pip install pyarrow")
+        self._pa = pa
+        self._schema = pa.schema([
+            ('学生', pa.string()), ('排名', pa.int32()), ('职业', pa.string()), ('薪资', pa.string()),
+            ('行业', pa.string()), ('匹配度', pa.float64()), ('主要类型', pa.string()),
+            ('平均薪资_千', pa.float64()),
+        ])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, rows):
+        if rows:
+            self._writer.write_table(self._pa.Table.from_pylist(rows, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+def open_writer(path):
+    """按扩展名选择输出格式"""
+    if path.lower().endswith('.parquet'):
+        return ParquetWriter(path)
+    if path.lower().endswith('.csv'):
+        return CsvWriter(path)
+    raise ValueError(f"输出文件只支持 .csv 或 .parquet: {path}")
+
+
+def write_batch(ids, recommendations, writer, flush_every=1000):
+    """把逐人产出的推荐展开成每条推荐一行，攒够 flush_every 人写一次"""
+    rows = []
+    pending = 0
+    for student, jobs in zip(ids, recommendations):
+        for rank, job in enumerate(jobs, 1):
+            rows.append({'学生': student, '排名': rank, **job})
+        pending += 1
+        if pending >= flush_every:
+            writer.write(rows)
+            rows, pending = [], 0
+    writer.write(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="为一批学生的测评结果批量生成职业推荐")
+    parser.add_argument('input', help='学生测评结果（xlsx / CSV / JSONL）')
+    parser.add_argument('output', help='输出文件（.csv 或 .parquet）')
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('--min-salary', type=float, default=0)
+    parser.add_argument('--max-salary', type=float, default=None)
+    parser.add_argument('--industry', action='append', default=None, help='行业筛选，可重复')
+    parser.add_argument('--mmr-lambda', type=float, default=1.0)
+    parser.add_argument('--workers', type=int, default=1, help='并行进程数')
+    parser.add_argument('--memory-mb', type=float, default=256, help='每块粗排矩阵的内存上限')
+    parser.add_argument('--source', default=DATA_FILE)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    args = parser.parse_args()
+
+    try:
+        ids, vectors = read_cohort(args.input)
+        writer = open_writer(args.output)
+    except ValueError as e:
+        parser.error(str(e))
+
+    df, _ = load_dataset(args.source, args.cache_dir)
+    engine = load_engine(df, args.source, args.cache_dir)
+    start = time.perf_counter()
+
+    def report(done, total):
+        elapsed = time.perf_counter() - start
+        print(f"\r已完成 {done}/{total} 名学生（{done / max(elapsed, 1e-9):.0f} 人/秒）",
+              end='', file=sys.stderr, flush=True)
+
+    try:
+        write_batch(ids, recommend_batch(
+            engine, vectors, top_n=args.top_n, min_salary=args.min_salary, industries=args.industry,
+            max_salary=args.max_salary, mmr_lambda=args.mmr_lambda, workers=args.workers,
+            memory_mb=args.memory_mb, progress=report
+        ), writer)
+    finally:
+        writer.close()
+    print(f"\n结果已写入: {args.output}", file=sys.stderr)
@@ -0,0 +1,355 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""热点路径基准测试：用合成岗位表测量加载、去重、推荐与搜索，不需要 Streamlit
+
+用法：python benchmark.py [--sizes 1000,10000,100000,1000000] [--queries 200]
+                         [--output 结果.json] [--baseline 上次结果.json] [--threshold 0.2]
+
+按 jobs_analyzed_统一单位.xlsx 的列结构生成指定行数的合成岗位表（职业名称带
+福利词、薪资、括号等会被规范化去掉的修饰，约 40% 的行去重后保留），写成 CSV
+后依次测量：
+
+- normalize_job_name / extract_core_name：单次调用延迟
+- deduplicate：分块解析与去重（内存里的原始表）
+- load_cold / load_warm：load_dataset 编译缓存 / 读取缓存
+- engine_build：构建匹配引擎
+- recommend / recommend_filtered：测评得分推荐（不筛选 / 薪资与行业筛选）
+- search：职业名称关键词搜索
+
+每个规模在单独的子进程里运行，峰值内存（peak_rss_mb）互不影响。结果是 JSON：
+meta 记录运行环境，results 每项是一个 (行数, 阶段) 的 p50/p95 延迟、吞吐量和
+峰值内存。给出 --baseline 时与上次结果逐项比较，有阶段变慢超过 threshold 时
+退出码为 1。
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows 没有 resource 模块，不报告峰值内存
+    resource = None
+
+from dataset import deduplicate_chunks, load_dataset, normalize_job_name
+from engine import HOLLAND_ORDER, MatchingEngine
+from holland import QUESTIONS, answers_from_choices, calculate_user_scores
+from text_match import WELFARE_WORDS, extract_core_name
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+
+# 单次调用的阶段最多计时这么多次
+_MAX_CALLS = 20000
+
+# 去重后保留的行数比例（真实数据约 38%）
+_UNIQUE_RATIO = 0.4
+
+
+# ============= 合成岗位表 =============
+_CITIES = ['', '北京', '上海', '广州', '深圳', '杭州', '成都', '武汉', '南京', '苏州', '西安',
+           '重庆', '天津', '长沙', '郑州', '青岛', '厦门', '宁波', '合肥', '东莞', '佛山']
+_DOMAINS = ['销售', '数据', '人力资源', '市场', '运营', '产品', '软件', '机械', '财务', '电商',
+            '新媒体', '亚马逊', '天猫', '拼多多', '嵌入式', '测试', '算法', '前端', '后端', '质量',
+            '采购', '物流', '行政', '法务', '客服', '品牌', '设计', '工艺', '研发', '生产',
+            '仓储', '外贸', '培训', '招聘', '审计', '投资', '医药', '注塑', '电气', '结构']
+_LEVELS = ['', '高级', '资深', '初级', '助理', '实习']
+_ROLES = ['工程师', '专员', '经理', '主管', '设计师', '分析师', '助理', '总监', '顾问', '开发工程师',
+          '店长', '文员', '研究员', '专家', '负责人', '组长', '技术员', '内勤', '代表', '讲师']
+_DECORATIONS = ['', '', '', '（急聘）', '(J{code})', '【{welfare}】', '{welfare}', '{low}-{high}K',
+                ' {welfare}+{extra}']
+_INDUSTRIES = ['互联网/电子商务', '贸易/进出口', '计算机软件', '快速消费品(食品、饮料、化妆品)', '房地产',
+               '电子技术/半导体/集成电路', '批发/零售', '制药/生物工程', '金融/投资/证券',
+               '服装/纺织/皮革', '专业服务(咨询、人力资源、财会)', '教育/培训/院校', '机械/设备/重工',
+               '汽车及零配件', '家居/室内设计/装潢', '医疗设备/器械', '物流/仓储', '新能源',
+               '广告/会展/公关', '通信/电信/网络设备', '餐饮业', '建筑/建材/工程', '农/林/牧/渔',
+               '酒店/旅游', '印刷/包装/造纸', '仪器仪表/工业自动化', '化工', '环保', '媒体/出版/影视/文化传播',
+               '网络游戏']
+_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def _base_titles(count, rng):
+    """count 个规范化后互不相同的基础职业名称（不含数字，规范化时不会被删掉）"""
+    parts = [_CITIES, _DOMAINS, _LEVELS, _ROLES]
+    combos = int(np.prod([len(p) for p in parts]))
+    titles = []
+    for i in rng.permutation(max(count, 1)).tolist():
+        combo, tag = i % combos, i // combos
+        name = ''
+        for part in reversed(parts):
+            combo, j = divmod(combo, len(part))
+            name = part[j] + name
+        if tag:
+            # 组合用完后加字母后缀区分（规范化保留英文字母）
+            name += '-' + _LETTERS[tag % 26] + _LETTERS[tag // 26 % 26] + _LETTERS[tag // 676 % 26]
+        titles.append(name)
+    return titles[:count]
+
+
+def _score_pool(rng, size=600):
+    """得分向量池：每个向量 1~3 个类型有分，分值是 0.05 的倍数（与真实数据相同）"""
+    pool = np.zeros((size, len(HOLLAND_ORDER)))
+    for vector in pool:
+        types = rng.choice(len(HOLLAND_ORDER), size=rng.integers(1, 4), replace=False)
+        vector[types] = rng.integers(1, 13, size=len(types)) * 0.05
+    return np.round(pool, 2)
+
+
+def synthetic_jobs(n, seed=0):
+    """按源 Excel 的列结构生成 n 行原始岗位表（得分、行业列表是字符串形式）"""
+    rng = np.random.default_rng(seed)
+    unique = max(1, int(n * _UNIQUE_RATIO))
+    bases = _base_titles(unique, rng)
+    # 每个基础名称至少出现一次，其余的行按长尾分布重复
+    ids = np.concatenate([np.arange(unique), np.minimum(rng.zipf(1.3, n - unique) - 1, unique - 1)])
+    ids = rng.permutation(ids)[:n]
+
+    pool = _score_pool(rng)
+    vector_ids = rng.integers(0, len(pool), size=unique)[ids]
+    low = rng.integers(3, 40, size=n).astype(np.float64)
+    high = low + rng.integers(1, 20, size=n)
+    industries = rng.integers(0, len(_INDUSTRIES), size=(n, 2))
+    industry_counts = rng.choice([0, 1, 2], p=[0.01, 0.49, 0.5], size=n)
+    decorations = rng.integers(0, len(_DECORATIONS), size=n)
+    welfare = rng.integers(0, len(WELFARE_WORDS), size=(n, 2))
+
+    titles, scores, details, types, cells = [], [], [], [], []
+    for i in range(n):
+        decoration = _DECORATIONS[decorations[i]].format(
+            code=10000 + i % 90000, welfare=WELFARE_WORDS[welfare[i, 0]], extra=WELFARE_WORDS[welfare[i, 1]],
+            low=int(low[i]), high=int(high[i])
+        )
+        titles.append(bases[ids[i]] + decoration)
+        vector = pool[vector_ids[i]].tolist()
+        scores.append(repr(dict(zip(HOLLAND_ORDER, vector))))
+        ranked = sorted(zip(HOLLAND_ORDER, vector), key=lambda item: -item[1])[:3]
+        details.append(repr([f'{t}({v:.2f})' for t, v in ranked]))
+        types.append(ranked[0][0] if ranked[0][1] > 0 else '未知')
+        cells.append(repr([_INDUSTRIES[j] for j in industries[i, :industry_counts[i]].tolist()]))
+
+    return pd.DataFrame({
+        '职业': titles,
+        '薪资': [f'{a:.1f}-{b:.1f}千/月' for a, b in zip(low.tolist(), high.tolist())],
+        '行业列表': cells,
+        '主要类型': types,
+        '类型详情': details,
+        '薪资_min_千': low,
+        '薪资_max_千': high,
+        '平均薪资_千': (low + high) / 2,
+        '霍兰德得分': scores,
+    })
+
+
+# ============= 计时 =============
+def _peak_rss_mb():
+    """进程到目前为止的峰值常驻内存（MB）"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位是 KB，macOS 是字节
+    return peak / (2**20 if sys.platform == 'darwin' else 2**10)
+
+
+def _summary(rows, stage, latencies, items, unit):
+    """一个阶段的结果：latencies 是每次调用的秒数，items 是处理的条数"""
+    latencies = np.asarray(latencies, dtype=np.float64)
+    total = float(latencies.sum())
+    return {
+        'rows': rows,
+        'stage': stage,
+        'calls': len(latencies),
+        'p50_ms': float(np.percentile(latencies, 50)) * 1000,
+        'p95_ms': float(np.percentile(latencies, 95)) * 1000,
+        'mean_ms': total / len(latencies) * 1000,
+        'seconds': total,
+        'throughput': items / total if total > 0 else None,
+        'unit': unit,
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+
+def _per_call(func, args):
+    """逐个调用 func(arg)，返回每次的秒数"""
+    clock = time.perf_counter
+    latencies = []
+    for arg in args:
+        start = clock()
+        func(arg)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def _once(func, repeat=1):
+    """调用 repeat 次，返回 (每次的秒数, 最后一次的返回值)"""
+    latencies = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        latencies.append(time.perf_counter() - start)
+    return latencies, result
+
+
+def _quiz_scores(count, rng):
+    """随机作答测评得到的用户得分"""
+    return [
+        calculate_user_scores(answers_from_choices([rng.randrange(len(q['options'])) for q in QUESTIONS]))
+        for _ in range(count)
+    ]
+
+
+def _search_terms(titles, count, rng):
+    """搜索关键词：常见职位词、领域词和从职业名称里截取的片段"""
+    terms = [rng.choice(_ROLES + _DOMAINS) for _ in range(count // 2)]
+    for title in rng.sample(titles, min(len(titles), count - len(terms))):
+        start = rng.randrange(max(1, len(title) - 2))
+        terms.append(title[start:start + rng.choice([2, 3, 4])])
+    return terms
+
+
+def run_size(n, queries=200, seed=0, workers=1):
+    """生成 n 行合成数据并测量全部阶段，返回结果列表"""
+    rng = random.Random(seed)
+    results = []
+    raw = synthetic_jobs(n, seed)
+    titles = raw['职业'].tolist()
+    sample = titles if len(titles) <= _MAX_CALLS else rng.sample(titles, _MAX_CALLS)
+
+    results.append(_summary(n, 'normalize_job_name', _per_call(normalize_job_name, sample), len(sample), 'titles/s'))
+    results.append(_summary(n, 'extract_core_name', _per_call(extract_core_name, sample), len(sample), 'titles/s'))
+
+    chunk_rows = 100000
+    chunks = [raw.iloc[i:i + chunk_rows] for i in range(0, n, chunk_rows)]
+    latencies, _ = _once(lambda chunks=chunks: deduplicate_chunks(iter(chunks), workers))
+    results.append(_summary(n, 'deduplicate', latencies, n, 'rows/s'))
+    del chunks
+
+    with tempfile.TemporaryDirectory(prefix='bench-') as tmp:
+        source = os.path.join(tmp, f'jobs_{n}.csv')
+        raw.to_csv(source, index=False)
+        del raw
+        cache_dir = os.path.join(tmp, 'cache')
+        latencies, _ = _once(lambda: load_dataset(source, cache_dir, workers))
+        results.append(_summary(n, 'load_cold', latencies, n, 'rows/s'))
+        latencies, (df, _) = _once(lambda: load_dataset(source, cache_dir), repeat=3)
+        results.append(_summary(n, 'load_warm', latencies, len(df), 'rows/s'))
+
+    latencies, engine = _once(lambda: MatchingEngine(df))
+    results.append(_summary(n, 'engine_build', latencies, len(df), 'rows/s'))
+
+    users = _quiz_scores(queries, rng)
+    results.append(_summary(n, 'recommend', _per_call(engine.recommend, users), queries, 'queries/s'))
+    vocabulary = engine.industry_index.vocabulary
+    filters = [(scores, rng.sample(vocabulary, min(2, len(vocabulary)))) for scores in users]
+    latencies = _per_call(lambda args: engine.recommend(args[0], min_salary=10, industries=args[1]), filters)
+    results.append(_summary(n, 'recommend_filtered', latencies, queries, 'queries/s'))
+
+    terms = _search_terms(engine.jobs.titles.tolist(), queries, rng)
+    results.append(_summary(n, 'search', _per_call(engine.search, terms), queries, 'queries/s'))
+    return results
+
+
+# ============= 运行与比较 =============
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run(sizes=DEFAULT_SIZES, queries=200, seed=0, workers=1, progress=None):
+    """按规模依次运行（每个规模一个子进程），返回 {'meta': ..., 'results': [...]}"""
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    results = []
+    for n in sizes:
+        if progress:
+            progress(n)
+        with context.Pool(1) as pool:
+            results.extend(pool.apply(run_size, (n, queries, seed, workers)))
+    meta = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'sizes': list(sizes),
+        'queries': queries,
+        'seed': seed,
+        'workers': workers,
+    }
+    return {'meta': meta, 'results': results}
+
+
+def compare(report, baseline, threshold=0.2):
+    """与上次结果逐项比较 p50 延迟，返回 [(行数, 阶段, 上次 ms, 本次 ms, 比值)]（只含变慢超过阈值的）"""
+    previous = {(r['rows'], r['stage']): r for r in baseline['results']}
+    regressions = []
+    for r in report['results']:
+        old = previous.get((r['rows'], r['stage']))
+        if old is None or not old['p50_ms']:
+            continue
+        ratio = r['p50_ms'] / old['p50_ms']
+        if ratio > 1 + threshold:
+            regressions.append((r['rows'], r['stage'], old['p50_ms'], r['p50_ms'], ratio))
+    return regressions
+
+
+def format_table(report):
+    """结果的文本表格"""
+    lines = [f"{'行数':>8} {'阶段':<20} {'p50 ms':>10} {'p95 ms':>10} {'吞吐量':>16} {'峰值内存 MB':>12}"]
+    for r in report['results']:
+        throughput = f"{r['throughput']:.0f} {r['unit']}" if r['throughput'] else '-'
+        rss = f"{r['peak_rss_mb']:.0f}" if r['peak_rss_mb'] is not None else '-'
+        lines.append(f"{r['rows']:>8} {r['stage']:<20} {r['p50_ms']:>10.3f} {r['p95_ms']:>10.3f} "
+                     f"{throughput:>16} {rss:>12}")
+    return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="用合成岗位表测量加载、去重、推荐与搜索的性能")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='逗号分隔的行数，默认 1000 到 1000000')
+    parser.add_argument('--queries', type=int, default=200, help='推荐与搜索各测量的次数')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=1, help='去重与编译缓存的并行进程数')
+    parser.add_argument('--output', help='结果 JSON 写入的文件（默认输出到标准输出）')
+    parser.add_argument('--baseline', help='上次的结果 JSON：有阶段变慢超过阈值时退出码为 1')
+    parser.add_argument('--threshold', type=float, default=0.2, help='p50 变慢超过这个比例算退化')
+    args = parser.parse_args()
+
+    try:
+        sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    except ValueError:
+        parser.error('--sizes 必须是逗号分隔的整数')
+
+    report = run(sizes, args.queries, args.seed, args.workers,
+                 progress=lambda n: print(f"测量 {n} 行...", file=sys.stderr, flush=True))
+    print(format_table(report), file=sys.stderr)
+
+    data = json.dumps(report, ensure_ascii=False, indent=1)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data)
+    else:
+        print(data)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for rows, stage, old, new, ratio in regressions:
+            print(f"变慢: {rows} 行 {stage} p50 {old:.3f} ms → {new:.3f} ms（{ratio:.2f} 倍）", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""测试共用的合成数据：benchmark.synthetic_jobs 生成的小规模岗位表
+
+运行：python -m pytest -q
+"""
+
+import random
+
+import pytest
+
+from benchmark import synthetic_jobs
+from dataset import compact_frame, deduplicate, parse_columns
+from engine import HOLLAND_ORDER, MatchingEngine
+
+ROWS = 3000
+
+
+@pytest.fixture(scope='session')
+def raw():
+    """原始岗位表（得分、行业列表是字符串形式，与源 Excel 相同）"""
+    return synthetic_jobs(ROWS, seed=3)
+
+
+@pytest.fixture(scope='session')
+def jobs(raw):
+    """去重后的岗位表（霍兰德得分 dict 列、行业列表 list 列，原算法的输入）"""
+    return deduplicate(parse_columns(raw.copy()))[0]
+
+
+@pytest.fixture(scope='session')
+def compact(jobs):
+    """常驻内存的紧凑岗位表（load_dataset 的结果）"""
+    return compact_frame(jobs)
+
+
+@pytest.fixture(scope='session')
+def engine(compact):
+    return MatchingEngine(compact)
+
+
+@pytest.fixture(scope='session')
+def queries(engine):
+    """随机的 (用户得分, 筛选条件)：得分是 0.05 的倍数，与测评结果一样会有并列"""
+    rng = random.Random(11)
+    vocabulary = engine.industry_index.vocabulary
+    result = []
+    for i in range(24):
+        scores = {t: rng.choice([0, 0.05, 0.1, 0.2, 0.35, 0.5]) for t in HOLLAND_ORDER}
+        kwargs = {}
+        if i % 3 == 1:
+            kwargs['industries'] = rng.sample(vocabulary, 2)
+        if i % 4 == 2:
+            kwargs['min_salary'] = rng.choice([10, 20])
+        result.append((scores, kwargs))
+    return result
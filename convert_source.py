@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""把 Excel 源文件转换成 CSV / JSONL / Parquet，得分存成六个数值列
+
+用法：python convert_source.py 目标文件 [--source 源文件] [--chunk-rows 行数]
+
+目标格式按扩展名（.csv / .jsonl / .parquet）决定。Excel 每次读取都要经过
+openpyxl 把整个工作簿变成 Python 对象，再逐行 literal_eval 得分字符串；转换后
+的文件可以分块流式读取，霍兰德得分直接是 得分_R … 得分_C 六个 float 列，
+CSV 里的行业列表存成 JSON。转换后的文件可以直接作为 load_dataset 的源文件，
+去重结果与原 Excel 相同。
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from dataset import CHUNK_ROWS, DATA_FILE, SCORE_COLUMNS, iter_table, parse_columns
+from engine import HOLLAND_ORDER
+
+TARGET_EXTENSIONS = ('.csv', '.jsonl', '.parquet')
+
+
+# ============= 转换 =============
+def to_native(df, ext):
+    """一块源数据 → 目标格式的列：霍兰德得分 拆成六个数值列（放在原来的位置）"""
+    df = parse_columns(df.copy())
+    scores = np.array([[cell.get(t, 0) for t in HOLLAND_ORDER] for cell in df['霍兰德得分']],
+                      dtype=np.float64).reshape(len(df), len(HOLLAND_ORDER))
+    position = df.columns.get_loc('霍兰德得分')
+    df = df.drop(columns='霍兰德得分')
+    for i, col in enumerate(SCORE_COLUMNS):
+        df.insert(position + i, col, scores[:, i])
+    if ext == '.csv':
+        df['行业列表'] = [json.dumps(cell, ensure_ascii=False) for cell in df['行业列表']]
+    return df
+
+
+class _ParquetWriter:
+    """逐块追加写 Parquet；各块按第一块的列类型写出"""
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("写 Parquet 文件需要安装 pyarrow：pip install pyarrow")
+        self.pa = pa
+        self.pq = pq
+        self.path = path
+        self.writer = None
+
+    def write(self, df):
+        table = self.pa.Table.from_pandas(df, preserve_index=False)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table.cast(self.writer.schema))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def convert(target, source=DATA_FILE, chunk_rows=CHUNK_ROWS):
+    """分块转换源文件，先写临时文件再改名；返回写出的行数"""
+    ext = os.path.splitext(target)[1].lower()
+    if ext not in TARGET_EXTENSIONS:
+        raise ValueError(f"不支持的目标格式: {target}（可选 {' / '.join(TARGET_EXTENSIONS)}）")
+
+    parent = os.path.dirname(os.path.abspath(target))
+    fd, tmp = tempfile.mkstemp(dir=parent, prefix='.converting-', suffix=ext)
+    os.close(fd)
+    # mkstemp 建的文件只有本人可读，改成与普通新建文件相同的权限
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(tmp, 0o666 & ~umask)
+    rows = 0
+    try:
+        if ext == '.parquet':
+            writer = _ParquetWriter(tmp)
+            try:
+                for chunk in iter_table(source, chunk_rows):
+                    df = to_native(chunk, ext)
+                    writer.write(df)
+                    rows += len(df)
+            finally:
+                writer.close()
+        else:
+            with open(tmp, 'w', encoding='utf-8', newline='') as f:
+                for chunk in iter_table(source, chunk_rows):
+                    df = to_native(chunk, ext)
+                    if ext == '.csv':
+                        df.to_csv(f, index=False, header=rows == 0)
+                    elif len(df):
+                        f.write(df.to_json(orient='records', lines=True, force_ascii=False).rstrip('\n') + '\n')
+                    rows += len(df)
+        os.replace(tmp, target)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="把职业数据 Excel 转换成可流式读取的 CSV / JSONL / Parquet")
+    parser.add_argument('target', help='目标文件（.csv / .jsonl / .parquet）')
+    parser.add_argument('--source', default=DATA_FILE)
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help='每块转换的行数')
+    args = parser.parse_args()
+
+    try:
+        rows = convert(args.target, args.source, args.chunk_rows)
+    except (OSError, ValueError) as e:
+        print(f"转换失败: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"{rows} 行已写入: {args.target}")
@@ -0,0 +1,539 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""职业数据集：解析源文件（Excel / CSV / JSONL / Parquet）、职业去重，
+并编译成按源文件哈希命名的二进制缓存
+
+用法：python dataset.py [源文件] [--cache-dir 目录] [--workers N] [--chunk-rows 行数]
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from engine import HOLLAND_ORDER, SCORE_COLUMNS
+from job_store import IndustryListArray
+from salary import add_salary_columns
+from text_match import extract_core_name, strip_welfare_words
+
+DATA_FILE = "jobs_analyzed_统一单位.xlsx"
+CACHE_DIR = ".dataset_cache"
+
+# 缓存格式版本：解析或去重规则变化时加一，旧缓存自动失效
+CACHE_VERSION = 6
+
+# 分块读取源文件时每块的行数
+CHUNK_ROWS = 100000
+
+
+# ============= 职业名称规范化 =============
+# 规范化用到的正则在导入时编译一次
+_SALARY_PATTERNS = [
+    re.compile(r'\d+\.?\d*[kK]'),  # 5K, 8K
+    re.compile(r'\d+\.?\d*千'),    # 5千, 8千
+    re.compile(r'\d+\.?\d*万'),    # 5万, 8万
+    re.compile(r'\d+-\d+'),        # 5-8, 10-15
+    re.compile(r'\d+\.?\d*'),      # 任何单独的数字
+]
+_BRACKET_PATTERNS = [
+    re.compile(r'\([^)]*\)'),
+    re.compile(r'（[^）]*）'),
+    re.compile(r'\[[^\]]*\]'),
+    re.compile(r'【[^】]*】'),
+]
+_NON_WORD = re.compile(r'[^\w\u4e00-\u9fff]')
+_SPACES = re.compile(r'\s+')
+_CHINESE = re.compile(r'[\u4e00-\u9fff]+')
+
+
+def normalize_job_name(job_name):
+    """规范化职业名称，去除薪资、福利等信息"""
+    job_name = str(job_name)
+
+    # 保存原始名称
+    original = job_name
+
+    # 1. 去除薪资信息（数字+K/千/万）
+    for pattern in _SALARY_PATTERNS:
+        job_name = pattern.sub('', job_name)
+
+    # 2. 去除福利信息
+    job_name = strip_welfare_words(job_name)
+
+    # 3. 去除括号及其内容
+    for pattern in _BRACKET_PATTERNS:
+        job_name = pattern.sub('', job_name)
+
+    # 4. 去除特殊字符和多余空格
+    job_name = _NON_WORD.sub(' ', job_name)  # 只保留中文、英文、数字
+    job_name = _SPACES.sub(' ', job_name)
+    job_name = job_name.strip()
+
+    # 如果规范化后为空或太短，返回原始名称的前几个字符
+    if not job_name or len(job_name) < 2:
+        # 尝试提取中文部分
+        chinese_part = _CHINESE.findall(original)
+        if chinese_part:
+            job_name = ' '.join(chinese_part)
+        else:
+            job_name = original[:8]
+
+    return job_name
+
+
+# ============= 解析源文件 =============
+SOURCE_EXTENSIONS = ('.xlsx', '.xls', '.csv', '.jsonl', '.parquet')
+
+
+def _parquet_file(path):
+    """Parquet 需要可选依赖 pyarrow"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError(f"读取 Parquet 文件需要安装 pyarrow（pip install pyarrow）: {path}")
+    return pq.ParquetFile(path)
+
+
+def read_table(path):
+    """按扩展名读取 xlsx / CSV / JSONL / Parquet 表格"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.xlsx', '.xls'):
+        return pd.read_excel(path)
+    if ext == '.csv':
+        return pd.read_csv(path)
+    if ext == '.jsonl':
+        return pd.read_json(path, lines=True, dtype=False, convert_dates=False)
+    if ext == '.parquet':
+        return _parquet_file(path).read().to_pandas()
+    raise ValueError(f"不支持的文件格式: {path}")
+
+
+def iter_table(path, chunk_rows=CHUNK_ROWS):
+    """按块读取 xlsx / CSV / JSONL / Parquet 表格，依次产出 DataFrame
+
+    CSV、JSONL、Parquet 边读边产出，内存里只有当前这一块；Excel 不能流式解析，
+    整表读入后再切块。
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+    elif ext == '.jsonl':
+        yield from pd.read_json(path, lines=True, dtype=False, convert_dates=False, chunksize=chunk_rows)
+    elif ext == '.parquet':
+        for batch in _parquet_file(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        df = read_table(path)
+        for start in range(0, max(len(df), 1), chunk_rows):
+            yield df.iloc[start:start + chunk_rows]
+
+
+def _is_json(text):
+    try:
+        json.loads(text)
+    except ValueError:
+        return False
+    return True
+
+
+def parse_columns(df):
+    """把字符串形式的得分、行业列表还原成 dict / list
+
+    六个数值得分列（SCORE_COLUMNS）合并成 霍兰德得分 列；行业列表可以是
+    Python 字面量、JSON 文本或 Parquet 的列表列。
+    """
+    if '霍兰德得分' not in df.columns and all(col in df.columns for col in SCORE_COLUMNS):
+        scores = df[SCORE_COLUMNS].to_numpy(dtype=np.float64).tolist()
+        df = df.drop(columns=SCORE_COLUMNS)
+        df['霍兰德得分'] = [dict(zip(HOLLAND_ORDER, row)) for row in scores]
+
+    if not len(df):
+        return df
+
+    # 处理霍兰德得分列（如果是字符串格式）
+    if '霍兰德得分' in df.columns and isinstance(df['霍兰德得分'].iloc[0], str):
+        df['霍兰德得分'] = df['霍兰德得分'].apply(ast.literal_eval)
+
+    # 处理行业列表列（如果是字符串格式）
+    if '行业列表' in df.columns and isinstance(df['行业列表'].iloc[0], str):
+        # 转换后的 CSV 存的是 JSON，比 literal_eval 快得多
+        parse = json.loads if _is_json(df['行业列表'].iloc[0]) else ast.literal_eval
+        try:
+            df['行业列表'] = df['行业列表'].apply(parse)
+        except:
+            # 如果转换失败，保持原样
+            pass
+    elif '行业列表' in df.columns and isinstance(df['行业列表'].iloc[0], np.ndarray):
+        # Parquet 的列表列读出来是数组
+        df['行业列表'] = [cell.tolist() if isinstance(cell, np.ndarray) else cell for cell in df['行业列表']]
+
+    return df
+
+
+def read_source(path=DATA_FILE):
+    """读取源文件（xlsx / CSV / JSONL / Parquet）并解析得分、行业列表"""
+    return parse_columns(read_table(path))
+
+
+# ============= 职业去重 =============
+def _aggregate(df_sorted):
+    """按薪资从高到低排好序的表 → 每个 职业_规范 分组取第一个非空值"""
+    # 定义分组后的聚合规则
+    aggregation_rules = {
+        '职业': 'first',  # 保留原始职业名称（薪资最高的那个）
+        '薪资': 'first',
+        '行业列表': 'first',
+        '主要类型': 'first',
+        '平均薪资_千': 'first',
+        '霍兰德得分': 'first'
+    }
+
+    # 如果有其他列，也保留第一个值
+    for col in df_sorted.columns:
+        if col not in aggregation_rules and col not in ['职业_规范', 'index']:
+            aggregation_rules[col] = 'first'
+
+    # 执行去重，规范化名称作为分组键保留在最后一列
+    df_deduplicated = df_sorted.groupby('职业_规范').agg(aggregation_rules).reset_index()
+    df_deduplicated = df_deduplicated[list(aggregation_rules) + ['职业_规范']]
+
+    # 核心职业名称（推荐时的多样性依据）只在加载时算一次，存成分类列
+    df_deduplicated['核心名称'] = pd.Categorical(df_deduplicated['职业'].map(extract_core_name))
+    # 薪资文本解析成按月计的数值区间，请求时不再处理字符串
+    return add_salary_columns(df_deduplicated)
+
+
+def deduplicate(df):
+    """按规范化名称分组，保留薪资最高的那条记录，返回 (去重结果, 统计信息)
+
+    结果保留 职业_规范 列，增量导入时据此把新岗位合并进已有分组。
+    """
+    df = df.copy()
+
+    # 添加规范化后的职业名称
+    df['职业_规范'] = df['职业'].apply(normalize_job_name)
+
+    stats = {
+        'before': len(df),
+        'unique_names': int(df['职业_规范'].nunique()),
+    }
+
+    df_sorted = df.sort_values('平均薪资_千', ascending=False)
+    df_deduplicated = _aggregate(df_sorted)
+    stats['after'] = len(df_deduplicated)
+    return df_deduplicated, stats
+
+
+# ============= 分块并行去重 =============
+def _prepare_chunk(chunk):
+    """工作进程：解析一块源数据并规范化职业名称"""
+    chunk = parse_columns(chunk.copy())
+    chunk['职业_规范'] = [normalize_job_name(name) for name in chunk['职业'].tolist()]
+    return chunk
+
+
+def _candidates(df, salaries):
+    """每个分组里可能成为去重结果的行：掩码
+
+    去重对每一列取薪资最高行的第一个非空值，所以对每一列保留"该列非空的行里
+    薪资并列最高"的行；薪资相同的行谁排在前面要等全部读完才能确定，先都保留。
+    缺失薪资当作最低。
+    """
+    keys = df['职业_规范'].to_numpy()
+    keep = np.zeros(len(df), dtype=bool)
+    masks = [np.ones(len(df), dtype=bool)]
+    # 没有空值的列与第一个掩码相同，不必重复计算
+    masks += [valid for valid in (df[col].notna().to_numpy() for col in df.columns) if not valid.all()]
+    for valid in masks:
+        best = pd.Series(np.where(valid, salaries, np.nan)).groupby(keys).transform('max').to_numpy()
+        keep |= valid & ((salaries == best) | (np.isnan(best) & np.isnan(salaries)))
+    return keep
+
+
+def deduplicate_chunks(chunks, workers=1):
+    """分块去重：结果（包括薪资并列时保留哪一条）与 deduplicate(整表) 完全相同
+
+    - 解析与名称规范化在 workers 个进程里并行，按块的顺序取回结果
+    - 不对整表排序：每读完一块，只保留每个分组里可能胜出的候选行
+    - 全部读完后，只对薪资这一列做与 deduplicate 相同的排序，确定候选行的先后，
+      再对候选行做原来的分组聚合
+
+    返回 (去重结果, 统计信息)。
+    """
+    pool = None
+    if workers > 1:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        pool = context.Pool(workers)
+        prepared = pool.imap(_prepare_chunk, chunks)
+    else:
+        prepared = map(_prepare_chunk, chunks)
+
+    salaries = []      # 每块的薪资列（最后确定薪资并列行的先后）
+    candidates = None  # 到目前为止的候选行，行号记在 _row 列
+    total = 0
+    try:
+        for chunk in prepared:
+            chunk = chunk.reset_index(drop=True)
+            chunk_salaries = chunk['平均薪资_千'].to_numpy(dtype=np.float64)
+            salaries.append(chunk_salaries)
+            chunk['_row'] = np.arange(total, total + len(chunk))
+            total += len(chunk)
+
+            merged = chunk if candidates is None else pd.concat([candidates, chunk], ignore_index=True)
+            keep = _candidates(merged.drop(columns='_row'), merged['平均薪资_千'].to_numpy(dtype=np.float64))
+            candidates = merged[keep].reset_index(drop=True)
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    if candidates is None:
+        raise ValueError("源文件没有数据")
+
+    # 与 deduplicate 完全相同的排序（薪资并列时的先后由排序算法决定），只排薪资一列
+    order = pd.DataFrame({'平均薪资_千': np.concatenate(salaries)}).sort_values(
+        '平均薪资_千', ascending=False).index.to_numpy()
+    rank = np.empty(total, dtype=np.int64)
+    rank[order] = np.arange(total)
+    candidates = candidates.iloc[np.argsort(rank[candidates['_row'].to_numpy()])].drop(columns='_row')
+
+    df_deduplicated = _aggregate(candidates)
+    stats = {
+        'before': total,
+        'unique_names': len(df_deduplicated),
+        'after': len(df_deduplicated),
+    }
+    return df_deduplicated, stats
+
+
+# ============= 常驻内存的岗位表 =============
+# 不同取值不超过行数这个比例的文本列存成分类列
+_CATEGORY_MAX_RATIO = 0.5
+
+
+def split_scores(df):
+    """霍兰德得分 dict 列换成六个 float64 得分列（SCORE_COLUMNS），放在原来的位置
+
+    得分保持 float64：匹配引擎精排按原公式计算，不能先降成 float32。
+    """
+    if '霍兰德得分' not in df.columns:
+        return df
+    scores = np.array(
+        [[job_scores[t] for t in HOLLAND_ORDER] for job_scores in df['霍兰德得分']],
+        dtype=np.float64
+    ).reshape(len(df), len(HOLLAND_ORDER))
+    at = df.columns.get_loc('霍兰德得分')
+    df = df.drop(columns='霍兰德得分')
+    for i, col in enumerate(SCORE_COLUMNS):
+        df.insert(at + i, col, scores[:, i])
+    return df
+
+
+def compact_frame(df):
+    """去重后的岗位表换成常驻内存用的紧凑形式：没有逐行的 Python 对象
+
+    - 霍兰德得分 拆成六个 float64 得分列（pandas 存成一整块数组）
+    - 行业列表 存成 IndustryListArray（行偏移 + 行业编号的 CSR 编码）；有单元格
+      不是列表（源文件的行业列表没能解析）时保持原样
+    - 薪资文本、主要类型、类型详情这类重复多的文本列存成分类列（每行一个整数编码）
+    """
+    df = split_scores(df)
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        if col == '行业列表':
+            if not isinstance(values.array, IndustryListArray) and values.map(type).eq(list).all():
+                values = pd.Series(IndustryListArray.from_cells(values.tolist()), index=df.index)
+        elif (pd.api.types.is_string_dtype(values) and not isinstance(values.dtype, pd.CategoricalDtype)
+              and values.map(type).eq(str).all()
+              and values.nunique() <= len(values) * _CATEGORY_MAX_RATIO):
+            values = values.astype('category')
+        columns[col] = values
+    # 已经是紧凑形式的列（如缓存的内存映射视图）原样沿用，不再复制；各列自带索引，
+    # 再传 index 会按索引重排一遍而复制
+    return pd.DataFrame(columns, copy=False)
+
+
+# ============= 二进制缓存 =============
+def file_digest(path):
+    """源文件的 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(path=DATA_FILE, cache_dir=CACHE_DIR, digest=None):
+    """源文件对应的缓存目录（文件内容或缓存格式变化都会换一个目录）"""
+    digest = digest or file_digest(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f"{stem}-v{CACHE_VERSION}-{digest[:16]}")
+
+
+def write_artifact(df, stats, target, digest=''):
+    """把紧凑形式（compact_frame）的去重数据表写成列式缓存目录
+
+    - scores.npy：(N, 6) 霍兰德得分矩阵（SCORE_COLUMNS 六列），列顺序 R/I/A/S/E/C
+    - industry_offsets.npy / industry_ids.npy：行业列表的 CSR 编码（即 IndustryListArray）
+    - num_<i>.npy：其余数值列
+    - cat_<i>.npy：分类列的编码（类别表在 meta.json 里）
+    - strings.json：文本列
+    - meta.json：列顺序、行业词表、分类列类别表、去重统计
+    """
+    meta = {
+        'version': CACHE_VERSION,
+        'source_sha256': digest,
+        'rows': len(df),
+        'columns': [],
+        'stats': stats,
+        'categories': {},
+    }
+    arrays = {}
+    strings = {}
+
+    for i, col in enumerate(df.columns):
+        values = df[col]
+        if col in SCORE_COLUMNS:
+            if 'scores' not in arrays:
+                arrays['scores'] = df[SCORE_COLUMNS].to_numpy(dtype=np.float64)
+            kind = 'scores'
+        elif col == '行业列表' and isinstance(values.array, IndustryListArray):
+            industries = values.array
+            arrays['industry_offsets'] = np.asarray(industries.offsets, dtype=np.int64)
+            arrays['industry_ids'] = np.asarray(industries.ids, dtype=np.int32)
+            meta['industry_vocab'] = list(industries.vocabulary)
+            kind = 'industries'
+        elif isinstance(values.dtype, pd.CategoricalDtype):
+            arrays[f'cat_{i}'] = values.cat.codes.to_numpy()
+            meta['categories'][col] = values.cat.categories.tolist()
+            kind = f'cat_{i}'
+        elif pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            arrays[f'num_{i}'] = values.to_numpy()
+            kind = f'num_{i}'
+        else:
+            strings[col] = values.tolist()
+            kind = 'string'
+        meta['columns'].append([col, kind])
+
+    # 先写到临时目录再整体改名，多个进程同时构建也不会读到半成品
+    parent = os.path.dirname(os.path.abspath(target))
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=parent, prefix='.building-')
+    try:
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp, f'{name}.npy'), array)
+        with open(os.path.join(tmp, 'strings.json'), 'w', encoding='utf-8') as f:
+            json.dump(strings, f, ensure_ascii=False, default=str)
+        with open(os.path.join(tmp, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, target)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not os.path.isdir(target):
+            raise
+
+
+def read_artifact(target):
+    """读取缓存目录，返回 (数据表, 统计信息)
+
+    得分列、数值列、分类列的编码和行业列表的 CSR 数组都直接用内存映射视图，不复制
+    进进程内存。映射方式是写时复制（mmap_mode='c'）：没写过的页与其他进程共用
+    页缓存，写某一列时只复制被写到的页，缓存文件不变。
+    """
+    with open(os.path.join(target, 'meta.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    with open(os.path.join(target, 'strings.json'), encoding='utf-8') as f:
+        strings = json.load(f)
+
+    def load(name):
+        return np.load(os.path.join(target, f'{name}.npy'), mmap_mode='c')
+
+    columns = {}
+    for col, kind in meta['columns']:
+        if kind == 'scores':
+            columns[col] = load('scores')[:, SCORE_COLUMNS.index(col)]
+        elif kind == 'industries':
+            columns[col] = IndustryListArray(load('industry_offsets'), load('industry_ids'),
+                                             meta['industry_vocab'])
+        elif kind == 'string':
+            columns[col] = strings[col]
+        elif kind.startswith('cat_'):
+            columns[col] = pd.Categorical.from_codes(load(kind), meta['categories'][col])
+        else:
+            columns[col] = load(kind)
+
+    return pd.DataFrame(columns, copy=False), meta['stats']
+
+
+def build_cache(path=DATA_FILE, cache_dir=CACHE_DIR, workers=1, chunk_rows=CHUNK_ROWS):
+    """编译源文件：分块解析、去重并写入缓存，返回缓存目录"""
+    digest = file_digest(path)
+    target = cache_path(path, cache_dir, digest)
+    df, stats = deduplicate_chunks(iter_table(path, chunk_rows), workers)
+    write_artifact(compact_frame(df), stats, target, digest)
+    return target
+
+
+def load_dataset(path=DATA_FILE, cache_dir=CACHE_DIR, workers=1, chunk_rows=CHUNK_ROWS):
+    """加载去重后的数据集：缓存命中时不再读 Excel，返回 (数据表, 统计信息)
+
+    统计信息除了去重计数（before / unique_names / after），还有本次加载是否
+    命中缓存（cache_hit）和各阶段用时（timings，单位秒）。只做数据处理、不涉及
+    界面，可以在服务启动时或后台线程里预先加载。缓存未命中时按 chunk_rows 行
+    一块读取源文件，用 workers 个进程并行解析去重。返回的是紧凑形式的岗位表
+    （见 compact_frame）。
+    """
+    timings = {}
+    start = last = time.perf_counter()
+
+    def lap(stage):
+        nonlocal last
+        now = time.perf_counter()
+        timings[stage] = now - last
+        last = now
+
+    digest = file_digest(path)
+    lap('digest')
+    target = cache_path(path, cache_dir, digest)
+    cache_hit = os.path.isfile(os.path.join(target, 'meta.json'))
+    if cache_hit:
+        df, stats = read_artifact(target)
+        # 较早写入的缓存里文本列是逐行存的，读出后同样换成紧凑形式
+        df = compact_frame(df)
+        lap('read_cache')
+    else:
+        # 分块读取与去重交替进行，两个阶段合并计时
+        df, stats = deduplicate_chunks(iter_table(path, chunk_rows), workers)
+        # 分类列在缓存里只存编码和类别表，下次读取时不用逐行解析文本
+        df = compact_frame(df)
+        lap('deduplicate')
+        try:
+            write_artifact(df, stats, target, digest)
+        except OSError:
+            # 只读文件系统等情况下不缓存，直接使用解析结果
+            pass
+        lap('write_cache')
+    timings['total'] = time.perf_counter() - start
+    return df, dict(stats, cache_hit=cache_hit, timings=timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="把职业数据 Excel 编译成二进制缓存")
+    parser.add_argument('source', nargs='?', default=DATA_FILE)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='并行解析的进程数')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help='每块读取的行数')
+    args = parser.parse_args()
+
+    target = build_cache(args.source, args.cache_dir, args.workers, args.chunk_rows)
+    print(f"缓存已写入: {target}")
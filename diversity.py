@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""推荐结果的多样性重排"""
+
+from itertools import islice
+
+
+# ============= 多样性重排 =============
+class DiversityReranker:
+    """多样性重排：同一核心名称最多 max_per_core 个，优先选择还没出现过的行业
+
+    输入是按匹配度降序排列的候选（任意可迭代对象，按需读取），每个候选是含有
+    '核心名称'、'行业'、'匹配度' 的 dict。核心名称计数和已选行业都放在哈希表里，
+    每个候选只看一次；选够 top_n 就不再读取后面的候选。
+
+    mmr_lambda 是 MMR 式的相关性/多样性权衡：
+    - 1.0（默认）：按匹配度顺序贪心选取，结果与原多样性筛选完全一致
+    - 小于 1.0：在前 top_n * pool_factor 个候选中，每次选
+      mmr_lambda * 匹配度 - (1 - mmr_lambda) * 冗余度 最大的一个，
+      冗余度为 1（核心名称已选过）、0.5（行业已选过）或 0
+    """
+
+    def __init__(self, max_per_core=2, mmr_lambda=1.0, pool_factor=5):
+        if not 0.0 <= mmr_lambda <= 1.0:
+            raise ValueError("mmr_lambda 必须在 0 到 1 之间")
+        self.max_per_core = max_per_core
+        self.mmr_lambda = mmr_lambda
+        self.pool_factor = pool_factor
+
+    def rerank(self, ranked, top_n):
+        """从排好序的候选中选出 top_n 个，结果按匹配度降序"""
+        if top_n <= 0:
+            return []
+        if self.mmr_lambda >= 1.0:
+            selected = self._greedy(ranked, top_n)
+        else:
+            selected = self._mmr(ranked, top_n)
+
+        # 按匹配度重新排序（稳定排序：同分时先选中的在前）
+        selected.sort(key=lambda job: job['匹配度'], reverse=True)
+        return selected[:top_n]
+
+    def _greedy(self, ranked, top_n):
+        """按匹配度顺序贪心选取"""
+        seen = []          # 已读取的候选（补充阶段需要回看）
+        picked = []        # 选中候选在 seen 中的位置
+        core_counts = {}   # 核心名称 → 已选数量
+        seen_industries = set()
+
+        # 第一轮：新的核心职业直接加入；核心职业相似但行业不同，未超上限也加入
+        exhausted = True
+        for job in ranked:
+            seen.append(job)
+            core_name = job['核心名称']
+            count = core_counts.get(core_name, 0)
+            if count == 0 or (job['行业'] not in seen_industries and count < self.max_per_core):
+                picked.append(len(seen) - 1)
+                core_counts[core_name] = count + 1
+                seen_industries.add(job['行业'])
+                if len(picked) >= top_n:
+                    exhausted = False
+                    break
+
+        # 候选全部看完仍不够：先补核心名称未超上限的，再按匹配度补齐
+        if exhausted and len(picked) < top_n:
+            chosen = set(picked)
+            for pos, job in enumerate(seen):
+                if len(picked) >= top_n:
+                    break
+                core_name = job['核心名称']
+                if pos not in chosen and core_counts.get(core_name, 0) < self.max_per_core:
+                    picked.append(pos)
+                    chosen.add(pos)
+                    core_counts[core_name] = core_counts.get(core_name, 0) + 1
+            for pos in range(len(seen)):
+                if len(picked) >= top_n:
+                    break
+                if pos not in chosen:
+                    picked.append(pos)
+                    chosen.add(pos)
+
+        return [seen[pos] for pos in picked]
+
+    def _mmr(self, ranked, top_n):
+        """在候选池内按 MMR 得分逐个选取"""
+        pool = list(islice(ranked, top_n * self.pool_factor))
+        remaining = list(range(len(pool)))
+        picked = []
+        core_counts = {}
+        seen_industries = set()
+
+        while remaining and len(picked) < top_n:
+            best_pos, best_value = None, None
+            for pos in remaining:
+                job = pool[pos]
+                count = core_counts.get(job['核心名称'], 0)
+                if count >= self.max_per_core:
+                    continue
+                if count:
+                    redundancy = 1.0
+                elif job['行业'] in seen_industries:
+                    redundancy = 0.5
+                else:
+                    redundancy = 0.0
+                value = self.mmr_lambda * job['匹配度'] - (1 - self.mmr_lambda) * redundancy
+                if best_value is None or value > best_value:
+                    best_pos, best_value = pos, value
+            if best_pos is None:
+                break
+            job = pool[best_pos]
+            picked.append(best_pos)
+            remaining.remove(best_pos)
+            core_counts[job['核心名称']] = core_counts.get(job['核心名称'], 0) + 1
+            seen_industries.add(job['行业'])
+
+        # 都被核心名称上限挡住时，按匹配度补齐
+        for pos in remaining:
+            if len(picked) >= top_n:
+                break
+            picked.append(pos)
+
+        return [pool[pos] for pos in picked]
@@ -0,0 +1,459 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""霍兰德职业匹配引擎：每个数据集构建一次，推荐时只做矩阵运算"""
+
+import copy
+import itertools
+
+import numpy as np
+
+from diversity import DiversityReranker
+from indexes import FuzzyIndex, IndustryIndex, SalaryIndex, TitleIndex, TypePartitionIndex
+from job_store import JobStore
+from metrics import count, timer
+from salary import salary_ranges
+
+# 霍兰德六种类型的固定顺序（得分矩阵的列顺序）
+HOLLAND_ORDER = ['R', 'I', 'A', 'S', 'E', 'C']
+HOLLAND_INDEX = {t: i for i, t in enumerate(HOLLAND_ORDER)}
+
+# 岗位表里的六个数值得分列（常驻内存的岗位表和转换后的源文件都用它们代替 霍兰德得分 dict 列）
+SCORE_COLUMNS = [f'得分_{t}' for t in HOLLAND_ORDER]
+
+# float32 粗排时单个相似度的误差上界，精排窗口取它的两倍
+_F32_TOL = 1e-5
+
+# 候选数不超过这个值时直接全部打分更快，不走分区搜索
+_BRUTE_FORCE_LIMIT = 20000
+
+# 按薪资加权排序时，月均薪资达到这个值（千/月，与界面薪资滑块上限一致）记满分
+SALARY_SCORE_CAP = 50.0
+
+# 引擎版本号：进程内每构建或增量更新一次引擎就换一个新编号
+_versions = itertools.count(1)
+
+
+# ============= 相似度计算 =============
+def vector_norm(values):
+    """向量长度（与原逐行算法的运算顺序一致，保证结果逐位相同）"""
+    return sum(v**2 for v in values) ** 0.5
+
+
+def exact_similarity(user_scores, user_norm, job_vector, job_norm):
+    """精确余弦相似度，job_vector 按 HOLLAND_ORDER 排列"""
+    dot_product = sum(user_scores[t] * job_vector[HOLLAND_INDEX[t]] for t in user_scores)
+    if user_norm > 0 and job_norm > 0:
+        return dot_product / (user_norm * job_norm)
+    return 0
+
+
+def _inverse(norms):
+    """向量长度的倒数（零向量为 0）"""
+    norms = np.asarray(norms, dtype=np.float64)
+    return np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+
+
+def _grown(array, size):
+    """把数组沿第一维扩展到 size 行的副本（新行先填 0）"""
+    grown = np.zeros((size,) + array.shape[1:], dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+def _salary_scores(monthly):
+    """按薪资加权排序用的薪资分：月均薪资 / SALARY_SCORE_CAP，截到 [0, 1]，未知为 0"""
+    return np.clip(np.nan_to_num(monthly / SALARY_SCORE_CAP, nan=0.0), 0.0, 1.0)
+
+
+def _user_vector(user_scores):
+    """用户得分 → (float64 向量, float32 向量, float32 长度倒数)，列顺序为 HOLLAND_ORDER"""
+    user_vector = np.array([user_scores.get(t, 0) for t in HOLLAND_ORDER], dtype=np.float64)
+    user_norm = np.sqrt(user_vector @ user_vector)
+    inv_user_norm = np.float32(1.0 / user_norm) if user_norm > 0 else np.float32(0)
+    return user_vector, user_vector.astype(np.float32), inv_user_norm
+
+
+def _score_vectors(df):
+    """岗位表的 (N, 6) float64 得分矩阵（六个得分列或 霍兰德得分 dict 列）"""
+    if all(col in df.columns for col in SCORE_COLUMNS):
+        return df[SCORE_COLUMNS].to_numpy(dtype=np.float64).reshape(len(df), len(HOLLAND_ORDER))
+    return np.array(
+        [[job_scores[t] for t in HOLLAND_ORDER] for job_scores in df['霍兰德得分']],
+        dtype=np.float64
+    ).reshape(len(df), len(HOLLAND_ORDER))
+
+
+# ============= 匹配引擎 =============
+class MatchingEngine:
+    """把去重后的岗位表编译成连续数组，推荐时只做向量化打分和筛选
+
+    - scores: (N, 6) float32 得分矩阵，列顺序为 R/I/A/S/E/C
+    - inv_norms: 每个岗位得分向量长度的倒数（零向量为 0）
+    - jobs: 展示用的逐行字段（JobStore，驻留字符串表）
+    - salary_low / salary_high: 按月计的薪资区间（千元），未知为 NaN，"X以上" 的上限为 inf
+    - salary_scores: 按薪资加权排序用的薪资分（0 到 1）
+    - version: 数据集版本号，结果缓存据此区分不同版本的岗位数据
+
+    float32 矩阵只用于粗排；排名边界附近的候选会按原公式用 float64 精排，
+    所以排序结果与原来逐行计算的 recommend_jobs 完全一致。
+    """
+
+    def __init__(self, df):
+        self.version = next(_versions)
+        vectors = _score_vectors(df)
+
+        # 唯一得分向量表：大量岗位共用同一个得分向量，精排只需按唯一向量计算
+        self.unique_vectors, vector_ids = np.unique(vectors, axis=0, return_inverse=True)
+        self.vector_ids = vector_ids.reshape(-1)
+        self.unique_norms = [vector_norm(v) for v in self.unique_vectors.tolist()]
+        self.vector_lookup = {tuple(v): i for i, v in enumerate(self.unique_vectors.tolist())}
+
+        inv_norms = _inverse(self.unique_norms)[self.vector_ids]
+        self.scores = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.inv_norms = inv_norms.astype(np.float32)
+        # 唯一得分向量的单位向量（float32），分区搜索按唯一向量打分
+        self.unit_vectors = (self.unique_vectors * _inverse(self.unique_norms)[:, None]).astype(np.float32)
+        self.partitions = TypePartitionIndex(vectors, inv_norms, self.vector_ids, HOLLAND_ORDER)
+
+        # 展示用字段与核心名称只在构建时计算一次
+        self.jobs = JobStore(df)
+
+        self.industry_index = IndustryIndex(df['行业列表'].tolist())
+        self.salary_index = SalaryIndex(df['平均薪资_千'].to_numpy(dtype=np.float64))
+        self.title_index = TitleIndex(df['职业'].tolist())
+        self._fuzzy_index = None
+        self.salary_values = df['平均薪资_千'].to_numpy(dtype=np.float64, copy=True)
+        self.salary_low, self.salary_high, monthly = salary_ranges(df)
+        self.salary_scores = _salary_scores(monthly)
+
+    def updated(self, df, rows):
+        """合并增量后的新引擎：df 是合并后的完整岗位表，rows 是被替换或新增的行号
+
+        只重新编译这些行：唯一向量表只追加，数组按新长度复制一次，索引增量更新。
+        原引擎不做任何修改，正在用它处理的请求不受影响。结果与用 df 重新构建的
+        引擎推荐结果完全相同。
+        """
+        new = copy.copy(self)
+        new.version = next(_versions)
+        rows = np.unique(np.asarray(rows, dtype=np.int64))
+        size = len(df)
+        changed = df.iloc[rows]
+        vectors = _score_vectors(changed)
+
+        # 唯一得分向量表只追加新出现的向量，已有向量的编号不变
+        new.vector_lookup = dict(self.vector_lookup)
+        added = []
+        vids = np.empty(len(rows), dtype=self.vector_ids.dtype)
+        for i, vector in enumerate(vectors.tolist()):
+            key = tuple(vector)
+            if key not in new.vector_lookup:
+                new.vector_lookup[key] = len(new.vector_lookup)
+                added.append(vector)
+            vids[i] = new.vector_lookup[key]
+        if added:
+            added = np.asarray(added, dtype=np.float64)
+            added_norms = [vector_norm(v) for v in added.tolist()]
+            new.unique_vectors = np.vstack([self.unique_vectors, added])
+            new.unique_norms = self.unique_norms + added_norms
+            new.unit_vectors = np.vstack([
+                self.unit_vectors, (added * _inverse(added_norms)[:, None]).astype(np.float32)
+            ])
+
+        inv_norms = _inverse(new.unique_norms)[vids]
+        new.vector_ids = _grown(self.vector_ids, size)
+        new.vector_ids[rows] = vids
+        new.scores = _grown(self.scores, size)
+        new.scores[rows] = vectors
+        new.inv_norms = _grown(self.inv_norms, size)
+        new.inv_norms[rows] = inv_norms
+        new.partitions = self.partitions.updated(rows, vectors, inv_norms, vids)
+
+        new.jobs = self.jobs.updated(size, rows, changed)
+        new.industry_index = self.industry_index.updated(size, rows, changed['行业列表'].tolist())
+        new.salary_index = self.salary_index.updated(
+            size, rows, changed['平均薪资_千'].to_numpy(dtype=np.float64)
+        )
+        new.title_index = self.title_index.updated(rows, changed['职业'].tolist())
+        if self._fuzzy_index is not None:
+            new._fuzzy_index = self._fuzzy_index.updated(
+                new.title_index, rows, [new.jobs.normalized_names[row] for row in rows.tolist()]
+            )
+        new.salary_values = _grown(self.salary_values, size)
+        new.salary_values[rows] = changed['平均薪资_千'].to_numpy(dtype=np.float64)
+        low, high, monthly = salary_ranges(changed)
+        for name, values in (('salary_low', low), ('salary_high', high),
+                             ('salary_scores', _salary_scores(monthly))):
+            array = _grown(getattr(self, name), size)
+            array[rows] = values
+            setattr(new, name, array)
+        return new
+
+    def __setstate__(self, state):
+        # 从快照恢复的引擎是这个进程里的一个新版本
+        self.__dict__.update(state)
+        self.version = next(_versions)
+
+    def __len__(self):
+        return len(self.jobs)
+
+    # ----- 筛选 -----
+    def industry_mask(self, industries):
+        """行业筛选：岗位行业与任一所选行业完全相同即保留"""
+        return self.industry_index.mask(industries)
+
+    def candidates(self, min_salary=0, industries=None, max_salary=None, salary_range=None):
+        """通过全部筛选条件的岗位行号（升序）
+
+        先用薪资索引截取区间，再在这一段里做行业筛选，打分前就裁掉候选。
+        salary_range=(下限, 上限)（千/月，任一端可为 None）只保留薪资区间与它有
+        交集的岗位，薪资未知的岗位不保留。
+        """
+        with timer('recommend.filter'):
+            rows = self.salary_index.rows(min_salary, max_salary)
+            if industries:
+                rows = rows[self.industry_mask(industries)[rows]]
+            if salary_range is not None:
+                rows = rows[self.salary_overlap(rows, *salary_range)]
+        count('recommend.rows_filtered', len(rows))
+        return rows
+
+    def salary_overlap(self, rows, low=None, high=None):
+        """rows 这些岗位的薪资区间是否与 [low, high] 有交集（布尔数组）"""
+        low = -np.inf if low is None else low
+        high = np.inf if high is None else high
+        # NaN 参与比较都是 False，薪资未知的岗位自然被排除
+        return (self.salary_low[rows] <= high) & (self.salary_high[rows] >= low)
+
+    # ----- 打分与排序 -----
+    def _coarse(self, rows, user_vector, inv_user_norm):
+        """float32 粗排分数：一次矩阵-向量乘法"""
+        return (self.scores[rows] @ user_vector) * self.inv_norms[rows] * inv_user_norm
+
+    def coarse_matrix(self, user_vectors, candidates):
+        """一批用户对候选岗位的 float32 粗排分数：(用户数 × 6)·(6 × 岗位数) 一次矩阵乘法
+
+        user_vectors 的列顺序为 HOLLAND_ORDER。
+        """
+        users = np.asarray(user_vectors, dtype=np.float64).reshape(-1, len(HOLLAND_ORDER))
+        inv_user_norms = _inverse(np.sqrt((users ** 2).sum(axis=1))).astype(np.float32)
+        coarse = users.astype(np.float32) @ self.scores[candidates].T
+        coarse *= self.inv_norms[candidates]
+        coarse *= inv_user_norms[:, None]
+        return coarse
+
+    def shortlist(self, user_scores, candidates, k, coarse=None):
+        """粗排短名单：粗排分数不低于第 k 大分数减误差窗口的全部候选
+
+        候选较多时按三字码分区搜索：分区按余弦上界从高到低访问，每个分区只给
+        其中的唯一得分向量打分；一旦剩余分区的上界都进不了误差窗口就停止，
+        结果与全部打分完全相同。coarse 是预先算好的候选粗排分数（批量推荐时
+        由一次矩阵乘法算出），给出时直接用它截取。
+        """
+        if k >= len(candidates):
+            return candidates
+        if coarse is not None:
+            count('recommend.rows_scanned', len(candidates))
+            kth = np.partition(coarse, len(coarse) - k)[len(coarse) - k]
+            return candidates[coarse >= kth - 2 * _F32_TOL]
+
+        user_vector, user_vector32, inv_user_norm = _user_vector(user_scores)
+
+        if len(candidates) <= _BRUTE_FORCE_LIMIT:
+            rows = candidates
+            count('recommend.rows_scanned', len(rows))
+            coarse = self._coarse(rows, user_vector32, inv_user_norm)
+            kth = np.partition(coarse, len(coarse) - k)[len(coarse) - k]
+            return rows[coarse >= kth - 2 * _F32_TOL]
+
+        member = None
+        if len(candidates) < len(self):
+            member = np.zeros(len(self), dtype=bool)
+            member[candidates] = True
+
+        bounds = self.partitions.upper_bounds(user_vector)
+        unique_scores = np.empty(len(self.unit_vectors), dtype=np.float32)
+        visited_rows, visited_scores = [], []
+        best = np.empty(0, dtype=np.float32)  # 目前为止最高的 k 个粗排分数
+        kth = -np.inf
+        for p in np.argsort(-bounds, kind='stable').tolist():
+            # 上界再加上粗排误差也进不了窗口，剩下的分区都不用看了
+            if len(best) >= k and bounds[p] < kth - 4 * _F32_TOL:
+                break
+            rows = self.partitions.rows[p]
+            if member is not None:
+                rows = rows[member[rows]]
+            if not len(rows):
+                continue
+            vids = self.partitions.vector_ids[p]
+            unique_scores[vids] = (self.unit_vectors[vids] @ user_vector32) * inv_user_norm
+            scores = unique_scores[self.vector_ids[rows]]
+            visited_rows.append(rows)
+            visited_scores.append(scores)
+
+            best = np.concatenate([best, scores])
+            if len(best) > k:
+                best = np.partition(best, len(best) - k)[len(best) - k:]
+            if len(best) >= k:
+                kth = best.min()
+
+        rows = np.concatenate(visited_rows)
+        coarse = np.concatenate(visited_scores)
+        count('recommend.rows_scanned', len(rows))
+        return rows[coarse >= kth - 2 * _F32_TOL]
+
+    def weighted_shortlist(self, user_scores, candidates, k, salary_weight, coarse=None):
+        """按薪资加权排序时的粗排短名单：对全部候选算一遍加权粗排分数再截取
+
+        加权分数 = (1 - salary_weight) × 匹配度 + salary_weight × 薪资分；薪资分
+        不是余弦相似度，分区上界不再成立，所以不走分区搜索。
+        """
+        if k >= len(candidates):
+            return candidates
+        if coarse is None:
+            _, user_vector32, inv_user_norm = _user_vector(user_scores)
+            coarse = self._coarse(candidates, user_vector32, inv_user_norm)
+        count('recommend.rows_scanned', len(candidates))
+        weighted = (1 - salary_weight) * coarse.astype(np.float64) + salary_weight * self.salary_scores[candidates]
+        kth = np.partition(weighted, len(weighted) - k)[len(weighted) - k]
+        return candidates[weighted >= kth - 2 * _F32_TOL]
+
+    def rank(self, user_scores, candidates, k, coarse=None, salary_weight=0.0):
+        """返回候选中排序分数最高的 k 个：(行号数组, 精确匹配度列表, 排序分数列表)
+
+        排序分数默认就是匹配度；salary_weight 大于 0 时是匹配度与薪资分的加权和。
+        排序规则与原逻辑相同：分数降序，分数相同时按原表行序。
+        """
+        user_norm = vector_norm(user_scores.values())
+        if len(candidates) == 0 or k <= 0:
+            return candidates[:0], [], []
+
+        with timer('recommend.score'):
+            return self._rank(user_scores, user_norm, candidates, k, coarse, salary_weight)
+
+    def _rank(self, user_scores, user_norm, candidates, k, coarse, salary_weight):
+        """rank 的粗排短名单 + 精排"""
+        if salary_weight:
+            shortlist = self.weighted_shortlist(user_scores, candidates, k, salary_weight, coarse)
+        else:
+            shortlist = self.shortlist(user_scores, candidates, k, coarse)
+        count('recommend.candidates_kept', len(shortlist))
+
+        # 精排：只对短名单里出现的唯一得分向量按原公式计算
+        vids = self.vector_ids[shortlist]
+        exact = {}
+        for vid in np.unique(vids).tolist():
+            exact[vid] = exact_similarity(
+                user_scores, user_norm, self.unique_vectors[vid].tolist(), self.unique_norms[vid]
+            )
+        exact_values = np.array([exact[v] for v in vids.tolist()], dtype=np.float64)
+        keys = exact_values
+        if salary_weight:
+            keys = (1 - salary_weight) * exact_values + salary_weight * self.salary_scores[shortlist]
+        order = np.lexsort((shortlist, -keys))[:k]
+        return shortlist[order], exact_values[order].tolist(), keys[order].tolist()
+
+    def _job(self, row, similarity, key):
+        """多样性重排用的候选岗位（匹配度 是排序分数，匹配度百分比 是展示的匹配度）
+
+        核心名称和行业只用来判断是否相同，直接用驻留字符串表里的编号，不解码文本。
+        """
+        return {
+            '行号': row,
+            '核心名称': int(self.jobs.core_names.codes[row]),
+            '行业': int(self.jobs.industry_texts.codes[row]),
+            '匹配度': key,
+            '匹配度百分比': round(similarity * 100, 1),
+        }
+
+    def ranked_stream(self, user_scores, candidates, first_k=32, coarse=None, salary_weight=0.0):
+        """按排序分数依次产出 (行号, 匹配度, 排序分数)；读完当前前缀时自动扩大前缀"""
+        start = 0
+        k = min(len(candidates), first_k)
+        while start < len(candidates):
+            rows, similarities, keys = self.rank(user_scores, candidates, k, coarse, salary_weight)
+            yield from zip(rows[start:].tolist(), similarities[start:], keys[start:])
+            start = k
+            k = min(len(candidates), k * 4)
+
+    def recommend_rows(self, user_scores, top_n=10, min_salary=0, industries=None, max_salary=None,
+                       mmr_lambda=1.0, candidates=None, coarse=None, salary_range=None, salary_weight=0.0):
+        """推荐结果的 (行号, 匹配度百分比) 列表，参数与 recommend 相同"""
+        if not 0.0 <= salary_weight <= 1.0:
+            raise ValueError("salary_weight 必须在 0 到 1 之间")
+        if candidates is None:
+            candidates = self.candidates(min_salary, industries, max_salary, salary_range)
+
+        # 多样性重排只按需读取排在前面的岗位
+        jobs = (self._job(row, sim, key) for row, sim, key in
+                self.ranked_stream(user_scores, candidates, max(top_n * 4, 32), coarse, salary_weight))
+        # 计时不含按需打分（recommend.score），只是重排本身
+        with timer('recommend.diversity'):
+            diverse = DiversityReranker(mmr_lambda=mmr_lambda).rerank(jobs, top_n)
+        return [(job['行号'], job['匹配度百分比']) for job in diverse]
+
+    def recommend(self, user_scores, top_n=10, min_salary=0, industries=None, max_salary=None,
+                  mmr_lambda=1.0, candidates=None, coarse=None, salary_range=None, salary_weight=0.0):
+        """根据用户得分推荐职业（保证多样性）
+
+        批量推荐时可以传入已经筛选好的 candidates 和这名用户的粗排分数 coarse。
+        salary_range=(下限, 上限) 只推荐薪资区间与它有交集的岗位；salary_weight
+        （0 到 1）大于 0 时按 (1 - salary_weight) × 匹配度 + salary_weight × 薪资分
+        排序，展示的匹配度不变。
+        """
+        return [self.recommendation(row, match) for row, match in self.recommend_rows(
+            user_scores, top_n, min_salary, industries, max_salary, mmr_lambda, candidates, coarse,
+            salary_range, salary_weight
+        )]
+
+    def recommendation(self, row, match):
+        """推荐结果展示用的岗位字段（match 是匹配度百分比）"""
+        return {
+            '职业': self.jobs.titles[row],
+            '薪资': self.jobs.salary_texts[row],
+            '行业': self.jobs.industry_texts[row],
+            '匹配度': match,
+            '主要类型': self.jobs.main_types[row],
+            '平均薪资_千': float(self.salary_values[row])
+        }
+
+    # ----- 搜索 -----
+    def search(self, term):
+        """职业名称包含关键词的岗位行号，按匹配程度、薪资从高到低、原表行序排序
+
+        走字二元组倒排索引；关键词去掉首尾空白后按字面匹配，不区分大小写。
+        """
+        with timer('search.exact'):
+            rows, quality = self.title_index.search(term.strip())
+            salaries = np.nan_to_num(self.salary_values[rows], nan=-np.inf)
+            rows = rows[np.lexsort((rows, -salaries, quality))]
+        count('search.matches', len(rows))
+        return rows
+
+    def listing(self, row):
+        """搜索结果展示用的岗位字段"""
+        return {
+            '职业': self.jobs.titles[row],
+            '薪资': self.jobs.salary_texts[row],
+            '行业': self.jobs.industry_texts[row],
+            '主要类型': self.jobs.main_types[row],
+            '平均薪资_千': float(self.salary_values[row])
+        }
+
+    @property
+    def fuzzy_index(self):
+        """容错搜索索引：第一次容错搜索时才构建（生成拼音较慢）"""
+        if self._fuzzy_index is None:
+            self._fuzzy_index = FuzzyIndex(self.title_index, self.jobs.normalized_names.tolist())
+        return self._fuzzy_index
+
+    def fuzzy_search(self, term, max_edits=None):
+        """容错搜索：错别字、拼音全拼和首字母都能匹配
+
+        按编辑距离、薪资从高到低、原表行序排序；编辑距离为 0 的就是精确包含。
+        """
+        with timer('search.fuzzy'):
+            rows, distances = self.fuzzy_index.search(term, max_edits)
+            salaries = np.nan_to_num(self.salary_values[rows], nan=-np.inf)
+            rows = rows[np.lexsort((rows, -salaries, distances))]
+        count('search.matches', len(rows))
+        return rows
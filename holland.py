@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""霍兰德类型说明、测评题目与用户得分计算（界面和 HTTP 接口共用）"""
+
+
+# ============= 霍兰德类型说明 =============
+HOLLAND_TYPES = {
+    'R': {
+        'name': '现实型',
+        'color': '#FF6B6B',
+        'icon': '🛠️',
+        'description': '喜欢动手操作、机械维修、户外工作，擅长使用工具和设备。',
+        'traits': ['实际', '稳重', '踏实', '动手能力强'],
+        'examples': ['机械工程师', '电工', '建筑师', '驾驶员']
+    },
+    'I': {
+        'name': '研究型',
+        'color': '#4ECDC4',
+        'icon': '🔬',
+        'description': '喜欢思考分析、科学研究、解决问题，擅长理论和抽象思维。',
+        'traits': ['好奇', '理性', '独立', '分析能力强'],
+        'examples': ['数据分析师', '研究员', '程序员', '科学家']
+    },
+    'A': {
+        'name': '艺术型',
+        'color': '#FFD93D',
+        'icon': '🎨',
+        'description': '喜欢创意表达、艺术创作、自由发挥，富有想象力和创造力。',
+        'traits': ['创意', '感性', '表达力强', '追求个性'],
+        'examples': ['设计师', '作家', '音乐人', '摄影师']
+    },
+    'S': {
+        'name': '社会型',
+        'color': '#6BCB77',
+        'icon': '🤝',
+        'description': '喜欢帮助他人、沟通协作、教育培训，擅长人际交往。',
+        'traits': ['友善', '乐于助人', '善于沟通', '有同理心'],
+        'examples': ['教师', '护士', '心理咨询师', '人力资源']
+    },
+    'E': {
+        'name': '企业型',
+        'color': '#FF9F1C',
+        'icon': '💼',
+        'description': '喜欢领导管理、说服他人、达成目标，擅长决策和冒险。',
+        'traits': ['自信', '有野心', '善于说服', '领导力强'],
+        'examples': ['销售经理', '创业者', '项目经理', '市场总监']
+    },
+    'C': {
+        'name': '常规型',
+        'color': '#A9A9A9',
+        'icon': '📊',
+        'description': '喜欢数据处理、规范流程、组织整理，擅长执行和细节。',
+        'traits': ['细心', '有条理', '执行力强', '稳重'],
+        'examples': ['会计', '行政助理', '档案管理员', '数据录入员']
+    }
+}
+
+# ============= 用户性格测评问题 =============
+QUESTIONS = [
+    {
+        'question': '你在团队中通常扮演什么角色？',
+        'options': [
+            ('执行者，负责具体操作', {'R': 2, 'C': 1}),
+            ('思考者，负责分析问题', {'I': 2, 'C': 1}),
+            ('创意者，提供新点子', {'A': 2, 'I': 1}),
+            ('协调者，维护团队和谐', {'S': 2, 'E': 1}),
+            ('领导者，带领团队前进', {'E': 2, 'S': 1}),
+            ('组织者，确保流程规范', {'C': 2, 'R': 1})
+        ]
+    },
+    {
+        'question': '你最喜欢的休闲活动是什么？',
+        'options': [
+            ('动手制作或修理东西', {'R': 2, 'A': 1}),
+            ('阅读、研究感兴趣的话题', {'I': 2, 'C': 1}),
+            ('绘画、音乐、写作等创作', {'A': 2, 'I': 1}),
+            ('和朋友聚会、社交活动', {'S': 2, 'E': 1}),
+            ('参加竞赛、追求成就', {'E': 2, 'S': 1}),
+            ('整理物品、规划日程', {'C': 2, 'R': 1})
+        ]
+    },
+    {
+        'question': '你在工作中最看重什么？',
+        'options': [
+            ('稳定的环境和清晰的指令', {'C': 2, 'R': 1}),
+            ('能够深入研究和解决问题', {'I': 2, 'R': 1}),
+            ('自由发挥创意的空间', {'A': 2, 'I': 1}),
+            ('帮助他人、服务社会', {'S': 2, 'A': 1}),
+            ('晋升机会和领导地位', {'E': 2, 'S': 1}),
+            ('工作成果能被量化评估', {'C': 2, 'E': 1})
+        ]
+    },
+    {
+        'question': '朋友通常怎么形容你？',
+        'options': [
+            ('踏实可靠、动手能力强', {'R': 2, 'C': 1}),
+            ('聪明理性、爱思考', {'I': 2, 'R': 1}),
+            ('有创意、与众不同', {'A': 2, 'I': 1}),
+            ('善解人意、好相处', {'S': 2, 'A': 1}),
+            ('有魄力、能带动气氛', {'E': 2, 'S': 1}),
+            ('细心周到、有条理', {'C': 2, 'R': 1})
+        ]
+    },
+    {
+        'question': '面对新任务，你的第一反应是？',
+        'options': [
+            ('先动手尝试，在实践中学习', {'R': 2, 'C': 1}),
+            ('先收集资料，分析清楚再做', {'I': 2, 'C': 1}),
+            ('思考如何用创意的方式完成', {'A': 2, 'I': 1}),
+            ('考虑如何与他人合作完成', {'S': 2, 'E': 1}),
+            ('思考如何快速高效地达成目标', {'E': 2, 'S': 1}),
+            ('制定详细的计划和步骤', {'C': 2, 'R': 1})
+        ]
+    },
+    {
+        'question': '你更喜欢哪种学习方式？',
+        'options': [
+            ('动手实践，边做边学', {'R': 2, 'A': 1}),
+            ('阅读书籍、查阅资料', {'I': 2, 'C': 1}),
+            ('通过创意项目学习', {'A': 2, 'I': 1}),
+            ('小组讨论、交流学习', {'S': 2, 'E': 1}),
+            ('参加培训、听讲座', {'E': 2, 'C': 1}),
+            ('按步骤、按计划学习', {'C': 2, 'R': 1})
+        ]
+    },
+    {
+        'question': '在消费时，你更看重什么？',
+        'options': [
+            ('产品的实用性和耐用性', {'R': 2, 'C': 1}),
+            ('产品的科技含量和创新', {'I': 2, 'R': 1}),
+            ('产品的设计和美感', {'A': 2, 'I': 1}),
+            ('能否和朋友一起分享', {'S': 2, 'A': 1}),
+            ('品牌价值和身份象征', {'E': 2, 'S': 1}),
+            ('性价比和实用性', {'C': 2, 'R': 1})
+        ]
+    },
+    {
+        'question': '你如何处理压力？',
+        'options': [
+            ('通过运动或手工活动释放', {'R': 2, 'A': 1}),
+            ('分析问题根源，寻找解决方案', {'I': 2, 'C': 1}),
+            ('通过艺术创作表达情绪', {'A': 2, 'I': 1}),
+            ('找朋友倾诉、寻求支持', {'S': 2, 'E': 1}),
+            ('制定计划，积极应对', {'E': 2, 'C': 1}),
+            ('按部就班，一步步解决', {'C': 2, 'R': 1})
+        ]
+    },
+    {
+        'question': '你更喜欢哪种工作环境？',
+        'options': [
+            ('户外、车间、现场', {'R': 2, 'C': 1}),
+            ('实验室、图书馆、安静的环境', {'I': 2, 'C': 1}),
+            ('工作室、创意空间', {'A': 2, 'I': 1}),
+            ('开放的办公室、团队氛围', {'S': 2, 'E': 1}),
+            ('会议室、谈判桌、商务场合', {'E': 2, 'S': 1}),
+            ('办公室、有规律的工位', {'C': 2, 'R': 1})
+        ]
+    },
+    {
+        'question': '你最喜欢的电影类型是？',
+        'options': [
+            ('动作片、冒险片', {'R': 2, 'E': 1}),
+            ('科幻片、悬疑片', {'I': 2, 'C': 1}),
+            ('文艺片、音乐片', {'A': 2, 'I': 1}),
+            ('剧情片、情感片', {'S': 2, 'A': 1}),
+            ('商战片、传记片', {'E': 2, 'S': 1}),
+            ('纪录片、历史片', {'C': 2, 'R': 1})
+        ]
+    },
+    {
+        'question': '你如何做决定？',
+        'options': [
+            ('凭直觉和实际操作', {'R': 2, 'A': 1}),
+            ('收集信息，理性分析', {'I': 2, 'C': 1}),
+            ('凭创意和灵感', {'A': 2, 'I': 1}),
+            ('考虑他人感受和意见', {'S': 2, 'E': 1}),
+            ('快速果断，追求结果', {'E': 2, 'S': 1}),
+            ('按规则和流程', {'C': 2, 'R': 1})
+        ]
+    },
+    {
+        'question': '你更喜欢哪种解决问题的方式？',
+        'options': [
+            ('动手操作，现场解决', {'R': 2, 'C': 1}),
+            ('分析研究，找到规律', {'I': 2, 'C': 1}),
+            ('换个角度，创新解决', {'A': 2, 'I': 1}),
+            ('寻求帮助，团队协作', {'S': 2, 'E': 1}),
+            ('谈判协商，达成共识', {'E': 2, 'S': 1}),
+            ('按标准流程处理', {'C': 2, 'R': 1})
+        ]
+    },
+    {
+        'question': '你对未来的职业期待是什么？',
+        'options': [
+            ('成为技术专家、工匠', {'R': 2, 'I': 1}),
+            ('成为研究员、科学家', {'I': 2, 'C': 1}),
+            ('成为艺术家、设计师', {'A': 2, 'I': 1}),
+            ('成为教师、咨询师', {'S': 2, 'A': 1}),
+            ('成为管理者、企业家', {'E': 2, 'S': 1}),
+            ('成为专业人士、骨干', {'C': 2, 'R': 1})
+        ]
+    },
+    {
+        'question': '你最喜欢的学科是？',
+        'options': [
+            ('体育、物理实验、手工', {'R': 2, 'A': 1}),
+            ('数学、物理、化学', {'I': 2, 'C': 1}),
+            ('美术、音乐、文学', {'A': 2, 'I': 1}),
+            ('语文、历史、政治', {'S': 2, 'A': 1}),
+            ('商业、经济、管理', {'E': 2, 'S': 1}),
+            ('会计、统计、计算机', {'C': 2, 'R': 1})
+        ]
+    },
+    {
+        'question': '你如何安排周末？',
+        'options': [
+            ('做手工、户外运动、修理东西', {'R': 2, 'A': 1}),
+            ('看书、研究感兴趣的话题', {'I': 2, 'C': 1}),
+            ('画画、写作、听音乐', {'A': 2, 'I': 1}),
+            ('和朋友聚会、参加社交活动', {'S': 2, 'E': 1}),
+            ('参加培训、拓展人脉', {'E': 2, 'S': 1}),
+            ('整理房间、规划下周', {'C': 2, 'R': 1})
+        ]
+    },
+    {
+        'question': '你更喜欢哪种沟通方式？',
+        'options': [
+            ('直接了当，说重点', {'R': 2, 'E': 1}),
+            ('逻辑清晰，有理有据', {'I': 2, 'C': 1}),
+            ('生动形象，有创意', {'A': 2, 'I': 1}),
+            ('温和体贴，顾及感受', {'S': 2, 'A': 1}),
+            ('有说服力，能带动人', {'E': 2, 'S': 1}),
+            ('条理分明，按顺序', {'C': 2, 'R': 1})
+        ]
+    },
+    {
+        'question': '你对科技产品的态度？',
+        'options': [
+            ('喜欢拆解、研究原理', {'R': 2, 'I': 1}),
+            ('关注最新科技发展', {'I': 2, 'C': 1}),
+            ('喜欢创意科技产品', {'A': 2, 'I': 1}),
+            ('喜欢能连接社交的产品', {'S': 2, 'E': 1}),
+            ('关注商业价值', {'E': 2, 'S': 1}),
+            ('够用就好，注重实用', {'C': 2, 'R': 1})
+        ]
+    },
+    {
+        'question': '你最喜欢的旅游方式是？',
+        'options': [
+            ('自驾游、户外探险', {'R': 2, 'A': 1}),
+            ('文化考察、博物馆之旅', {'I': 2, 'C': 1}),
+            ('艺术之旅、摄影采风', {'A': 2, 'I': 1}),
+            ('结伴而行、团队旅游', {'S': 2, 'E': 1}),
+            ('商务旅行、考察', {'E': 2, 'S': 1}),
+            ('跟团游、有计划的旅行', {'C': 2, 'R': 1})
+        ]
+    },
+    {
+        'question': '你如何处理日常杂事？',
+        'options': [
+            ('马上动手处理', {'R': 2, 'C': 1}),
+            ('想清楚再做', {'I': 2, 'C': 1}),
+            ('换个方式处理', {'A': 2, 'I': 1}),
+            ('找人帮忙一起做', {'S': 2, 'E': 1}),
+            ('快速搞定，不管细节', {'E': 2, 'S': 1}),
+            ('按顺序、有条理地做', {'C': 2, 'R': 1})
+        ]
+    },
+    {
+        'question': '你更喜欢哪种类型的书籍？',
+        'options': [
+            ('实用手册、工具书', {'R': 2, 'C': 1}),
+            ('科普读物、专业书籍', {'I': 2, 'C': 1}),
+            ('小说、诗歌、艺术类', {'A': 2, 'I': 1}),
+            ('心理学、人际关系', {'S': 2, 'A': 1}),
+            ('成功学、商业传记', {'E': 2, 'S': 1}),
+            ('管理类、励志类', {'C': 2, 'R': 1})
+        ]
+    }
+]
+
+# ============= 计算用户霍兰德得分 =============
+def calculate_user_scores(answers):
+    """根据用户答案计算霍兰德得分"""
+    scores = {'R': 0, 'I': 0, 'A': 0, 'S': 0, 'E': 0, 'C': 0}
+    
+    for answer in answers:
+        for h_type, value in answer.items():
+            scores[h_type] += value
+    
+    # 归一化到0-1范围
+    max_score = max(scores.values()) if max(scores.values()) > 0 else 1
+    for h_type in scores:
+        scores[h_type] = scores[h_type] / max_score
+    
+    return scores
+
+
+def answers_from_choices(choices):
+    """把每题所选选项的序号（从 0 开始）转换成 calculate_user_scores 需要的答案列表"""
+    if len(choices) != len(QUESTIONS):
+        raise ValueError(f"需要回答全部 {len(QUESTIONS)} 道题，收到 {len(choices)} 个答案")
+    answers = []
+    for i, choice in enumerate(choices):
+        options = QUESTIONS[i]['options']
+        if isinstance(choice, bool) or not isinstance(choice, int) or not 0 <= choice < len(options):
+            raise ValueError(f"第 {i + 1} 题的选项序号无效: {choice!r}")
+        answers.append(options[choice][1])
+    return answers
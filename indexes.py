@@ -0,0 +1,592 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""加载时构建的筛选索引
+
+每个索引都有 updated()：只处理被替换或新增的行，返回更新后的新索引，
+原索引保持不变，正在用它的查询不受影响。
+"""
+
+import bisect
+import copy
+import re
+
+import numpy as np
+
+from job_store import StringTable, parse_industries
+from text_match import substring_distance, to_pinyin
+
+
+def _set_bits(bitmap, rows, value):
+    """按 packbits 的位序（高位在前）设置或清除位图中的若干位"""
+    rows = np.asarray(rows, dtype=np.int64)
+    masks = (np.uint8(0x80) >> (rows & 7).astype(np.uint8)).astype(np.uint8)
+    if value:
+        np.bitwise_or.at(bitmap, rows >> 3, masks)
+    else:
+        np.bitwise_and.at(bitmap, rows >> 3, ~masks)
+
+
+# ============= 行业倒排索引 =============
+class IndustryIndex:
+    """行业倒排索引：行业 id → 有序岗位行号数组，以及对应的位图
+
+    多选行业时按位或合并位图，命中规则是行业名完全相等。
+    """
+
+    def __init__(self, cells):
+        rows_by_industry = {}
+        for row, cell in enumerate(cells):
+            for ind in parse_industries(cell):
+                rows_by_industry.setdefault(ind, []).append(row)
+
+        self.size = len(cells)
+        self.vocabulary = sorted(rows_by_industry)
+        self.ids = {ind: i for i, ind in enumerate(self.vocabulary)}
+        self.postings = [np.asarray(rows_by_industry[ind], dtype=np.int32) for ind in self.vocabulary]
+
+        self.bitmaps = np.zeros((len(self.vocabulary), (self.size + 7) // 8), dtype=np.uint8)
+        for i, rows in enumerate(self.postings):
+            member = np.zeros(self.size, dtype=bool)
+            member[rows] = True
+            self.bitmaps[i] = np.packbits(member)
+
+    def __len__(self):
+        return len(self.vocabulary)
+
+    def mask(self, industries):
+        """命中任一所选行业的岗位布尔掩码（未知行业忽略）"""
+        ids = [self.ids[ind] for ind in industries if ind in self.ids]
+        if not ids:
+            return np.zeros(self.size, dtype=bool)
+        bits = np.bitwise_or.reduce(self.bitmaps[ids], axis=0)
+        return np.unpackbits(bits, count=self.size).view(bool)
+
+    def rows(self, industries):
+        """命中任一所选行业的岗位行号（升序）"""
+        postings = [self.postings[self.ids[ind]] for ind in industries if ind in self.ids]
+        if not postings:
+            return np.zeros(0, dtype=np.int32)
+        if len(postings) == 1:
+            return postings[0]
+        return np.unique(np.concatenate(postings))
+
+    def updated(self, size, rows, cells):
+        """rows 这些行的行业改为 cells 后的新索引（size 为新的总行数）"""
+        new = copy.copy(self)
+        new.size = size
+        new.vocabulary = list(self.vocabulary)
+        new.ids = dict(self.ids)
+        new.postings = list(self.postings)
+        new.bitmaps = np.zeros((len(self.postings), (size + 7) // 8), dtype=np.uint8)
+        new.bitmaps[:, :self.bitmaps.shape[1]] = self.bitmaps
+
+        # 被替换的行先从原来的行业里去掉（新增的行本来就不在索引里）
+        rows = np.asarray(rows, dtype=np.int32)
+        old = np.sort(rows[rows < self.size])
+        if len(old):
+            for i, posting in enumerate(self.postings):
+                pos = np.searchsorted(posting, old).clip(max=max(len(posting) - 1, 0))
+                hit = pos[posting[pos] == old] if len(posting) else pos[:0]
+                if len(hit):
+                    _set_bits(new.bitmaps[i], posting[hit], False)
+                    new.postings[i] = np.delete(posting, hit)
+
+        added = {}
+        for row, cell in zip(rows.tolist(), cells):
+            for ind in parse_industries(cell):
+                if ind not in new.ids:
+                    new.ids[ind] = len(new.postings)
+                    new.postings.append(np.zeros(0, dtype=np.int32))
+                    bisect.insort(new.vocabulary, ind)
+                added.setdefault(new.ids[ind], []).append(row)
+        if len(new.postings) > len(new.bitmaps):
+            grown = np.zeros((len(new.postings), new.bitmaps.shape[1]), dtype=np.uint8)
+            grown[:len(new.bitmaps)] = new.bitmaps
+            new.bitmaps = grown
+        for i, add in added.items():
+            add = np.sort(np.asarray(add, dtype=np.int32))
+            posting = new.postings[i]
+            new.postings[i] = np.insert(posting, np.searchsorted(posting, add), add)
+            _set_bits(new.bitmaps[i], add, True)
+        return new
+
+
+# ============= 薪资排序索引 =============
+class SalaryIndex:
+    """薪资排序索引：岗位行号按 平均薪资_千 预先升序排列
+
+    薪资区间查询只需两次 searchsorted 截取一段，不用逐行比较。
+    缺失薪资的岗位不参与裁剪，总是保留（与原逐行判断一致）。
+    """
+
+    def __init__(self, salaries):
+        salaries = np.asarray(salaries, dtype=np.float64)
+        known = ~np.isnan(salaries)
+        rows = np.flatnonzero(known)
+        self.size = len(salaries)
+        self.order = rows[np.argsort(salaries[rows], kind='stable')].astype(np.int32)
+        self.sorted_salaries = salaries[self.order]
+        self.unknown = np.flatnonzero(~known).astype(np.int32)
+
+    def __len__(self):
+        return self.size
+
+    def bounds(self, min_salary=None, max_salary=None):
+        """区间 [min_salary, max_salary] 在 order 中对应的切片位置"""
+        lo = 0 if min_salary is None else int(np.searchsorted(self.sorted_salaries, min_salary, 'left'))
+        hi = len(self.order) if max_salary is None else int(np.searchsorted(self.sorted_salaries, max_salary, 'right'))
+        return lo, max(lo, hi)
+
+    def rows(self, min_salary=None, max_salary=None):
+        """薪资落在区间内的岗位行号（升序）"""
+        lo, hi = self.bounds(min_salary, max_salary)
+        if lo == 0 and hi == len(self.order):
+            return np.arange(self.size, dtype=np.int32)
+        return np.sort(np.concatenate([self.order[lo:hi], self.unknown]))
+
+    def updated(self, size, rows, salaries):
+        """rows 这些行的薪资改为 salaries 后的新索引（size 为新的总行数）"""
+        new = copy.copy(self)
+        new.size = size
+        rows = np.asarray(rows, dtype=np.int32)
+        salaries = np.asarray(salaries, dtype=np.float64)
+
+        order, sorted_salaries, unknown = self.order, self.sorted_salaries, self.unknown
+        old = rows[rows < self.size]
+        if len(old):
+            keep = ~np.isin(order, old)
+            order, sorted_salaries = order[keep], sorted_salaries[keep]
+            unknown = unknown[~np.isin(unknown, old)]
+
+        # 新值插到相同薪资的已有行之后，区间查询结果与重新构建一致
+        known = ~np.isnan(salaries)
+        add_rows, add_salaries = rows[known], salaries[known]
+        by_salary = np.argsort(add_salaries, kind='stable')
+        add_rows, add_salaries = add_rows[by_salary], add_salaries[by_salary]
+        pos = np.searchsorted(sorted_salaries, add_salaries, 'right')
+        new.order = np.insert(order, pos, add_rows).astype(np.int32)
+        new.sorted_salaries = np.insert(sorted_salaries, pos, add_salaries)
+        new.unknown = np.union1d(unknown, rows[~known]).astype(np.int32)
+        return new
+
+
+# ============= 类型分区索引 =============
+class TypePartitionIndex:
+    """按霍兰德三字码（得分最高的三个类型，如 IEC）给岗位分区，记录每个分区的包围范围
+
+    每个分区保存两种包围：单位得分向量的逐维上下界，以及以分区中心方向为轴、
+    包住全部岗位的最小圆锥角。用户向量与分区内任意岗位的余弦相似度都不会超过
+    upper_bounds 给出的值，Top-K 搜索据此按上界从高到低访问分区，并提前结束。
+    """
+
+    def __init__(self, vectors, inv_norms, vector_ids, type_names, code_length=3):
+        vectors = np.asarray(vectors, dtype=np.float64)
+        unit = vectors * np.asarray(inv_norms, dtype=np.float64)[:, None]
+        self.type_names = list(type_names)
+        self.code_length = code_length
+
+        keys = self._keys(vectors)
+        order = np.argsort(keys, kind='stable')
+        self.keys, starts = np.unique(keys[order], return_index=True)
+        self.positions = {key: p for p, key in enumerate(self.keys.tolist())}
+        self.rows = [rows.astype(np.int32) for rows in np.split(order, starts[1:])]
+        self.row_partition = np.empty(len(vectors), dtype=np.int32)
+        for p, rows in enumerate(self.rows):
+            self.row_partition[rows] = p
+        # 每个分区内出现的唯一得分向量：相同向量只打一次分
+        self.vector_ids = [np.unique(vector_ids[rows]) for rows in self.rows]
+        self.lower = np.minimum.reduceat(unit[order], starts, axis=0)
+        self.upper = np.maximum.reduceat(unit[order], starts, axis=0)
+
+        # 圆锥包围：中心方向 + 最大夹角（零向量分区没有方向，上界恒为 0）
+        self.centers = np.zeros_like(self.lower)
+        self.radii = np.zeros(len(self.rows))
+        for p, rows in enumerate(self.rows):
+            self._fit_cone(p, unit[rows])
+
+        self.codes = [self._code(key) for key in self.keys.tolist()]
+
+    def _keys(self, vectors):
+        """每个得分向量的分区键：三字码编码成整数，零向量单独一个键"""
+        width = len(self.type_names)
+        top = np.argsort(-vectors, axis=1, kind='stable')[:, :self.code_length]
+        keys = np.zeros(len(vectors), dtype=np.int64)
+        for j in range(self.code_length):
+            keys = keys * width + top[:, j]
+        keys[~vectors.any(axis=1)] = width ** self.code_length
+        return keys
+
+    def _code(self, key):
+        """分区键对应的三字码（零向量分区为 '0'）"""
+        width = len(self.type_names)
+        if key == width ** self.code_length:
+            return '0'
+        code = ''
+        for _ in range(self.code_length):
+            key, t = divmod(key, width)
+            code = self.type_names[t] + code
+        return code
+
+    def _fit_cone(self, p, members):
+        """以成员单位向量之和为中心方向，求包住全部成员的圆锥角"""
+        center = members.sum(axis=0)
+        length = np.sqrt(center @ center)
+        if length == 0:
+            return
+        self.centers[p] = center / length
+        # 留一点余量，抵消 arccos 的舍入误差
+        self.radii[p] = np.arccos(np.clip(members @ self.centers[p], -1.0, 1.0)).max() + 1e-7
+
+    def __len__(self):
+        return len(self.rows)
+
+    def upper_bounds(self, user_vector):
+        """用户向量与每个分区内岗位的余弦相似度上界"""
+        user_vector = np.asarray(user_vector, dtype=np.float64)
+        norm = np.sqrt(user_vector @ user_vector)
+        if norm == 0:
+            return np.zeros(len(self.rows))
+        unit = user_vector / norm
+        box = np.maximum(self.lower * unit, self.upper * unit).sum(axis=1)
+        angles = np.arccos(np.clip(self.centers @ unit, -1.0, 1.0))
+        cone = np.where(angles <= self.radii, 1.0, np.cos(np.minimum(angles - self.radii, np.pi)))
+        cone[~self.centers.any(axis=1)] = 0.0
+        return np.minimum(box, cone)
+
+    def updated(self, rows, vectors, inv_norms, vector_ids):
+        """rows 这些行改为新得分向量后的新索引（新增的行号接在原有行号之后）
+
+        被替换的行从原分区移除，原分区的包围范围保持不变（仍是合法的上界）；
+        加入分区时只放宽该分区的包围范围，不存在的三字码新建分区。
+        """
+        new = copy.copy(self)
+        rows = np.asarray(rows, dtype=np.int32)
+        vectors = np.asarray(vectors, dtype=np.float64)
+        vector_ids = np.asarray(vector_ids)
+        unit = vectors * np.asarray(inv_norms, dtype=np.float64)[:, None]
+        size = max(len(self.row_partition), int(rows.max()) + 1 if len(rows) else 0)
+
+        new.positions = dict(self.positions)
+        new.rows = list(self.rows)
+        new.vector_ids = list(self.vector_ids)
+        new.codes = list(self.codes)
+        new.row_partition = np.full(size, -1, dtype=np.int32)
+        new.row_partition[:len(self.row_partition)] = self.row_partition
+
+        old = rows[rows < len(self.row_partition)]
+        for p in np.unique(self.row_partition[old]).tolist():
+            new.rows[p] = np.setdiff1d(new.rows[p], old, assume_unique=True).astype(np.int32)
+
+        keys = self._keys(vectors)
+        fresh = [key for key in np.unique(keys).tolist() if key not in new.positions]
+        for key in fresh:
+            new.positions[key] = len(new.rows)
+            new.rows.append(np.zeros(0, dtype=np.int32))
+            new.vector_ids.append(np.zeros(0, dtype=vector_ids.dtype))
+            new.codes.append(self._code(key))
+        new.keys = np.append(self.keys, np.asarray(fresh, dtype=np.int64))
+        pad = np.zeros((len(fresh), self.lower.shape[1]))
+        new.lower = np.vstack([self.lower, pad])
+        new.upper = np.vstack([self.upper, pad])
+        new.centers = np.vstack([self.centers, pad])
+        new.radii = np.append(self.radii, np.zeros(len(fresh)))
+
+        partition = np.array([new.positions[key] for key in keys.tolist()], dtype=np.int32)
+        new.row_partition[rows] = partition
+        for p in np.unique(partition).tolist():
+            members = partition == p
+            new.rows[p] = np.union1d(new.rows[p], rows[members]).astype(np.int32)
+            new.vector_ids[p] = np.union1d(new.vector_ids[p], vector_ids[members])
+            if p >= len(self.rows):
+                new.lower[p] = unit[members].min(axis=0)
+                new.upper[p] = unit[members].max(axis=0)
+                new._fit_cone(p, unit[members])
+                continue
+            new.lower[p] = np.minimum(new.lower[p], unit[members].min(axis=0))
+            new.upper[p] = np.maximum(new.upper[p], unit[members].max(axis=0))
+            if new.centers[p].any():
+                angles = np.arccos(np.clip(unit[members] @ new.centers[p], -1.0, 1.0))
+                new.radii[p] = max(new.radii[p], angles.max() + 1e-7)
+        return new
+
+
+# ============= 职业名称字二元组索引 =============
+class GramIndex:
+    """字 n 元组倒排索引：n 元组 → 含有它的文本行号（升序数组）
+
+    sizes 是要索引的 n 元组长度，如 (1, 2) 表示单字和相邻两字。全部存成数组，
+    不为每个 n 元组或每行文本保留 Python 对象：
+
+    - texts: 各行文本（StringTable）
+    - vocabulary: 排好序的 n 元组（定长 unicode 数组），查找时二分
+    - offsets / rows: 倒排表的 CSR 编码，vocabulary[i] 的行号是 rows[offsets[i]:offsets[i + 1]]
+    """
+
+    def __init__(self, texts, sizes=(1, 2)):
+        self.sizes = tuple(sizes)
+        texts = list(texts)
+        self.texts = StringTable(texts)
+        rows_by_gram = {}
+        for row, text in enumerate(texts):
+            for gram in self.grams(text):
+                rows_by_gram.setdefault(gram, []).append(row)
+        grams = sorted(rows_by_gram)
+        self.vocabulary = np.array(grams, dtype=f'<U{max(self.sizes)}')
+        self.offsets = np.zeros(len(grams) + 1, dtype=np.int64)
+        np.cumsum([len(rows_by_gram[gram]) for gram in grams], out=self.offsets[1:])
+        self.rows = np.fromiter((row for gram in grams for row in rows_by_gram[gram]), dtype=np.int32,
+                                count=int(self.offsets[-1]))
+
+    def __len__(self):
+        return len(self.texts)
+
+    def grams(self, text):
+        """文本里出现的全部 n 元组（去重）"""
+        return {text[i:i + n] for n in self.sizes for i in range(len(text) - n + 1)}
+
+    def posting(self, gram):
+        """含有 gram 的行号（升序数组）；没有时为 None"""
+        i = int(np.searchsorted(self.vocabulary, gram))
+        if i >= len(self.vocabulary) or self.vocabulary[i] != gram:
+            return None
+        return self.rows[self.offsets[i]:self.offsets[i + 1]]
+
+    def rows_with_all(self, grams):
+        """含有全部 grams 的行号：从最短的倒排表开始求交集"""
+        postings = []
+        for gram in grams:
+            posting = self.posting(gram)
+            if posting is None:
+                return np.zeros(0, dtype=np.int32)
+            postings.append(posting)
+        postings.sort(key=len)
+        rows = postings[0]
+        for posting in postings[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, posting, assume_unique=True)
+        return rows
+
+    def rows_containing(self, piece):
+        """文本中连续出现 piece 的行号（piece 不短于最短的 n 元组）"""
+        grams = self.grams(piece)
+        if not grams:
+            return np.zeros(0, dtype=np.int32)
+        rows = self.rows_with_all(grams)
+        if len(piece) > max(self.sizes):
+            rows = self.texts.contains(rows, piece)
+        return rows
+
+    def updated(self, rows, texts):
+        """rows 这些行的文本改为 texts 后的新索引（新增的行号接在原有行号之后）
+
+        去掉这些行原来的倒排项、按新文本加入新的倒排项，其余倒排项整体平移，
+        不重新排序。
+        """
+        new = copy.copy(self)
+        rows = np.asarray(rows, dtype=np.int64)
+        texts = list(texts)
+        size = max(len(self), int(rows.max()) + 1 if len(rows) else 0)
+        new.texts = self.texts.updated(size, rows, texts)
+
+        # 新文本的倒排项：(n 元组, 行号)，按 n 元组、行号排序
+        added = sorted((gram, row) for row, text in zip(rows.tolist(), texts) for gram in self.grams(text))
+        added_grams = [gram for gram, _ in added]
+        added_rows = np.array([row for _, row in added], dtype=np.int32)
+
+        # 合并 n 元组表，原有编号映射到合并后的编号
+        candidates = np.unique(np.array(added_grams, dtype=self.vocabulary.dtype))
+        at = np.searchsorted(self.vocabulary, candidates)
+        present = np.zeros(len(candidates), dtype=bool)
+        if len(self.vocabulary):
+            present = self.vocabulary[np.minimum(at, len(self.vocabulary) - 1)] == candidates
+        fresh = candidates[~present]
+        grams = np.insert(self.vocabulary, np.searchsorted(self.vocabulary, fresh), fresh)
+        old_ids = np.searchsorted(grams, self.vocabulary)
+        counts = np.diff(self.offsets)
+        kept_ids = np.repeat(old_ids, counts)
+        kept = ~np.isin(self.rows, rows[rows < len(self)])
+        kept_ids, kept_rows = kept_ids[kept], self.rows[kept]
+        added_ids = np.searchsorted(grams, np.array(added_grams, dtype=grams.dtype)).astype(np.int64)
+
+        # 新倒排项按 (编号, 行号) 插入到保留的倒排项之间
+        at = np.searchsorted(kept_ids * size + kept_rows, added_ids * size + added_rows)
+        all_ids = np.insert(kept_ids, at, added_ids)
+        all_rows = np.insert(kept_rows, at, added_rows)
+        counts = np.bincount(all_ids, minlength=len(grams))
+        used = counts > 0
+        new.vocabulary = grams[used]
+        new.offsets = np.zeros(int(used.sum()) + 1, dtype=np.int64)
+        np.cumsum(counts[used], out=new.offsets[1:])
+        new.rows = all_rows.astype(np.int32)
+        return new
+
+
+def fold_title(title):
+    """搜索时统一大小写（缺失的名称当作空串）"""
+    return title.lower() if isinstance(title, str) else ''
+
+
+class _SortedTitles:
+    """按 (名称, 行号) 排序的只读序列，元素现取现解码，供 bisect 二分查找
+
+    名称比较用 UTF-8 字节（与按字符比较的顺序相同），查找的键也要先编码成字节。
+    """
+
+    def __init__(self, texts, order):
+        self.codes = texts.codes
+        self.offsets = texts.offsets
+        self.blob = memoryview(texts.blob)
+        self.order = order
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, i):
+        row = int(self.order[i])
+        code = self.codes[row]
+        return self.blob[self.offsets[code]:self.offsets[code + 1]].tobytes(), row
+
+
+class TitleIndex(GramIndex):
+    """职业名称的倒排索引：单字与相邻两字（二元组）→ 有序岗位行号数组
+
+    中文职业名称没有空格分词，按字二元组建索引：查询时取关键词全部二元组的
+    倒排表求交集，再对候选逐个确认关键词确实连续出现。关键词按字面匹配
+    （C++、( 等特殊字符没有正则含义），不区分大小写。
+    """
+
+    def __init__(self, titles):
+        titles = [fold_title(title) for title in titles]
+        super().__init__(titles, sizes=(1, 2))
+        # 按名称排序的行号：以关键词开头或与关键词相同的岗位是其中连续的一段
+        self.sorted_rows = np.array(sorted(range(len(titles)), key=lambda row: (titles[row], row)),
+                                    dtype=np.int32)
+
+    def _sorted_titles(self):
+        return _SortedTitles(self.texts, self.sorted_rows)
+
+    def search(self, term):
+        """名称包含关键词的岗位：(行号数组, 匹配程度数组)，行号升序
+
+        匹配程度：0 名称与关键词相同，1 名称以关键词开头，2 名称中间包含关键词。
+        """
+        term = fold_title(term)
+        if not term:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int8)
+        rows = self.rows_with_all({term} if len(term) == 1 else self.grams(term) - set(term))
+
+        # 单字和两个字的关键词，倒排表命中就是确实包含；更长的要确认连续出现
+        if len(term) > 2:
+            rows = self.texts.contains(rows, term)
+
+        quality = np.full(len(rows), 2, dtype=np.int8)
+        sorted_titles = self._sorted_titles()
+        key = term.encode('utf-8')
+        lo = bisect.bisect_left(sorted_titles, (key,))
+        exact_hi = bisect.bisect_right(sorted_titles, (key, np.inf), lo)
+        prefix_hi = bisect.bisect_left(sorted_titles, (key + b'\xff',), exact_hi)
+        if prefix_hi > lo:
+            prefix_rows = self.sorted_rows[lo:prefix_hi]
+            quality[np.searchsorted(rows, prefix_rows)] = 1
+            quality[np.searchsorted(rows, prefix_rows[:exact_hi - lo])] = 0
+        return rows, quality
+
+    def updated(self, rows, titles):
+        """rows 这些行的名称改为 titles 后的新索引（新增的行号接在原有行号之后）"""
+        titles = [fold_title(title) for title in titles]
+        new = super().updated(rows, titles)
+        rows = np.asarray(rows, dtype=np.int64)
+        # 排序表：去掉改动的行，再按新名称逐个二分出插入位置，一次插入
+        kept = self.sorted_rows[~np.isin(self.sorted_rows, rows)]
+        view = _SortedTitles(new.texts, kept)
+        changed = sorted((title.encode('utf-8'), row) for row, title in zip(rows.tolist(), titles))
+        at = [bisect.bisect_left(view, item) for item in changed]
+        new.sorted_rows = np.insert(kept, at, [row for _, row in changed]).astype(np.int32)
+        return new
+
+
+# ============= 容错搜索索引 =============
+_CJK = re.compile(r'[\u4e00-\u9fff]')
+
+
+def _edit_budget(term):
+    """关键词对应的默认容错次数：含汉字时每 3 个字 1 处，纯字母数字每 7 个字符 1 处，最多 2 处"""
+    return min(2, len(term) // (3 if _CJK.search(term) else 7))
+
+
+class FuzzyIndex:
+    """容错搜索：错别字按编辑距离匹配职业名称，纯字母的输入还按拼音全拼、首字母匹配
+
+    相差不超过 k 处编辑时，把关键词切成 k + 1 段，至少有一段原样出现在名称里
+    （抽屉原理）。先用倒排表找出含有某一段的候选，再用 substring_distance 逐个
+    验证，不需要和每个名称都算编辑距离。汉字直接用 TitleIndex 的倒排表；拼音
+    取自 职业_规范（已去掉薪资、福利、括号），没有安装 pypinyin 时只做汉字容错。
+    """
+
+    def __init__(self, title_index, names):
+        self.title_index = title_index
+        self.full = self.initials = None
+        pinyin = [to_pinyin(name) for name in names]
+        if pinyin and pinyin[0] is not None:
+            self.full = GramIndex([full for full, _ in pinyin], sizes=(2,))
+            self.initials = GramIndex([initials for _, initials in pinyin], sizes=(1, 2))
+
+    def search(self, term, max_edits=None):
+        """容错匹配的岗位：(行号数组, 编辑距离数组)，行号升序
+
+        max_edits 为空时按关键词长短决定（见 _edit_budget）；首字母不容错。
+        """
+        term = fold_title(term.strip())
+        best = {}
+        self._match(self.title_index, term, _edit_budget(term) if max_edits is None else max_edits, best)
+
+        letters = term.replace(' ', '')
+        if self.full is not None and len(letters) >= 2 and letters.isascii() and letters.isalpha():
+            self._match(self.full, letters, _edit_budget(letters) if max_edits is None else max_edits, best)
+            self._match(self.initials, letters, 0, best)
+
+        rows = sorted(best)
+        return np.asarray(rows, dtype=np.int32), np.asarray([best[row] for row in rows], dtype=np.int16)
+
+    @staticmethod
+    def _match(index, pattern, budget, best):
+        """在一个 GramIndex 里找与 pattern 相差不超过 budget 处编辑的文本，距离记入 best"""
+        # 每一段都不能短于索引里最短的 n 元组
+        budget = max(0, min(budget, len(pattern) // min(index.sizes) - 1))
+        if not pattern or len(pattern) < min(index.sizes):
+            return
+        bounds = np.linspace(0, len(pattern), budget + 2).round().astype(int).tolist()
+        pieces = [(pattern[lo:hi], lo) for lo, hi in zip(bounds, bounds[1:])]
+        candidates = np.unique(np.concatenate([index.rows_containing(piece) for piece, _ in pieces]))
+
+        texts = index.texts
+        size = len(pattern)
+        distances = {}   # 不同名称里相同的窗口（拼音尤其多）只算一次
+        for row in candidates.tolist():
+            text = texts[row]
+            if budget == 0 or pattern in text:
+                distance = 0
+            else:
+                # 最优匹配里总有一段原样出现，只需在每处出现位置附近的窗口里算编辑距离
+                distance = budget + 1
+                for piece, lo in pieces:
+                    at = text.find(piece)
+                    while at >= 0 and distance > 1:
+                        window = text[max(0, at - lo - budget):at - lo + size + budget]
+                        if window not in distances:
+                            distances[window] = substring_distance(pattern, window)
+                        distance = min(distance, distances[window])
+                        at = text.find(piece, at + 1)
+            if distance <= budget and distance < best.get(row, budget + 1):
+                best[row] = distance
+
+    def updated(self, title_index, rows, names):
+        """rows 这些行改名后的新索引；title_index 是已经更新过的名称索引"""
+        new = copy.copy(self)
+        new.title_index = title_index
+        if self.full is not None:
+            pinyin = [to_pinyin(name) for name in names]
+            new.full = self.full.updated(rows, [full for full, _ in pinyin])
+            new.initials = self.initials.updated(rows, [initials for _, initials in pinyin])
+        return new
@@ -0,0 +1,247 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""增量导入新岗位：只规范化新增的职业名称，合并进已有的去重分组
+
+用法：python ingest.py 增量文件 [增量文件 ...] [--source 源文件] [--cache-dir 目录]
+"""
+
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from dataset import (CACHE_DIR, DATA_FILE, compact_frame, file_digest, load_dataset, normalize_job_name,
+                     parse_columns, read_table, split_scores)
+from engine import MatchingEngine
+from job_store import IndustryListArray
+from salary import add_salary_columns
+from text_match import extract_core_name
+
+# 爬虫每天产出的增量文件放在这个目录，按文件名顺序合并
+UPDATES_DIR = "data_updates"
+DELTA_EXTENSIONS = ('.xlsx', '.xls', '.csv', '.jsonl', '.parquet')
+
+# 增量文件必须包含的列
+REQUIRED_COLUMNS = ['职业', '薪资', '行业列表', '主要类型', '平均薪资_千', '霍兰德得分']
+
+
+# ============= 读取增量文件 =============
+def read_delta(path):
+    """读取一个增量文件（xlsx / CSV / JSONL / Parquet），解析得分与行业列表
+
+    得分可以是 霍兰德得分 一列，也可以是转换后的六个数值列。
+    """
+    df = parse_columns(read_table(path))
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"增量文件 {path} 缺少列: {', '.join(missing)}")
+    return df
+
+
+def list_deltas(directory=UPDATES_DIR):
+    """目录下的增量文件（按文件名排序）；目录不存在时为空"""
+    if not os.path.isdir(directory):
+        return []
+    return [
+        os.path.join(directory, name) for name in sorted(os.listdir(directory))
+        if name.lower().endswith(DELTA_EXTENSIONS) and not name.startswith(('.', '~$'))
+    ]
+
+
+# ============= 合并进去重分组 =============
+def _is_better(salary, current):
+    """新记录的薪资是否高于分组当前保留的记录（缺失薪资最低，同薪资保留原记录）"""
+    if pd.isna(salary):
+        return False
+    return pd.isna(current) or salary > current
+
+
+def _merge_column(column, replaced, appended):
+    """一列的合并结果：replaced 是 {行号: 新值}，appended 是追加在末尾的新值"""
+    if isinstance(column.array, IndustryListArray):
+        cells = list(replaced.values()) + appended
+        if all(isinstance(cell, list) for cell in cells):
+            # 行业列表直接在 CSR 编码上合并，不还原成逐行的 list
+            rows = list(replaced) + list(range(len(column), len(column) + len(appended)))
+            return column.array.updated(len(column) + len(appended), rows, cells)
+        # 增量里有没能解析成列表的单元格：与全量加载一样保持原样
+        column = pd.Series(column.tolist(), dtype=object)
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        categories = column.cat.categories.tolist()
+        codes_by_value = {value: i for i, value in enumerate(categories)}
+
+        def code(value):
+            if value not in codes_by_value:
+                codes_by_value[value] = len(categories)
+                categories.append(value)
+            return codes_by_value[value]
+
+        codes = np.empty(len(column) + len(appended), dtype=np.int64)
+        codes[:len(column)] = column.cat.codes.to_numpy()
+        for row, value in replaced.items():
+            codes[row] = code(value)
+        for i, value in enumerate(appended, len(column)):
+            codes[i] = code(value)
+        return pd.Categorical.from_codes(codes, categories)
+
+    values = column.to_numpy()
+    new_values = list(replaced.values()) + appended
+    if values.dtype.kind in 'iub' and any(pd.isna(value) for value in new_values):
+        values = values.astype(np.float64)
+    merged = np.empty(len(values) + len(appended), dtype=values.dtype)
+    merged[:len(values)] = values
+    for row, value in replaced.items():
+        merged[row] = value
+    for i, value in enumerate(appended, len(values)):
+        merged[i] = value
+    try:
+        return pd.Series(merged, dtype=column.dtype)
+    except (TypeError, ValueError):
+        return pd.Series(merged)
+
+
+def merge_delta(df, delta, rows_by_key):
+    """把增量岗位合并进去重后的岗位表（不修改传入的表和字典）
+
+    与全量去重的规则相同：每个 职业_规范 分组只保留薪资最高的一条。已有分组
+    出现更高薪资时原地替换那一行，新分组追加在表尾（已有行号保持不变）。
+    只有新增的职业名称需要规范化，耗时与增量大小成正比。
+
+    返回 (合并后的表, 被替换或新增的行号, 新的 职业_规范→行号 字典, 统计信息)。
+    """
+    delta = split_scores(add_salary_columns(delta))
+    delta['职业_规范'] = delta['职业'].map(normalize_job_name)
+    delta['核心名称'] = delta['职业'].map(extract_core_name)
+    # 增量内部先去重：每组薪资最高的排在前面
+    best = delta.sort_values('平均薪资_千', ascending=False, kind='stable').drop_duplicates('职业_规范')
+
+    rows_by_key = dict(rows_by_key)
+    salaries = df['平均薪资_千']
+    replaced = {}
+    appended = []
+    for record in best.to_dict('records'):
+        row = rows_by_key.get(record['职业_规范'])
+        if row is None:
+            rows_by_key[record['职业_规范']] = len(df) + len(appended)
+            appended.append(record)
+        elif _is_better(record['平均薪资_千'], salaries.iat[row]):
+            replaced[row] = record
+
+    # 增量里没有的列（如 类型详情）填缺失值，多出来的列忽略
+    merged = pd.DataFrame({
+        col: _merge_column(
+            df[col],
+            {row: record.get(col, np.nan) for row, record in replaced.items()},
+            [record.get(col, np.nan) for record in appended]
+        )
+        for col in df.columns
+    })
+    rows = sorted(replaced) + list(range(len(df), len(merged)))
+    stats = {
+        'rows': len(delta),
+        'groups': len(best),
+        'replaced': len(replaced),
+        'appended': len(appended),
+    }
+    return merged, rows, rows_by_key, stats
+
+
+# ============= 常驻进程的数据集 =============
+class LiveDataset:
+    """常驻进程里的岗位表、去重统计和匹配引擎，增量文件到达时只合并增量
+
+    snapshot 是 (岗位表, 统计信息, 匹配引擎) 三元组：合并在新对象上完成后整体
+    替换，读者一次取出整个快照，正在处理的请求继续使用旧快照。
+    """
+
+    def __init__(self, df, stats=None, engine=None):
+        if '霍兰德得分' in df.columns:
+            # 常驻的岗位表一律用紧凑形式（load_dataset 的结果已经是）
+            df = compact_frame(df)
+        if '职业_规范' not in df.columns:
+            df = df.assign(职业_规范=df['职业'].map(normalize_job_name))
+        stats = dict(stats or {'before': len(df), 'unique_names': len(df), 'after': len(df)})
+        self.snapshot = (df, stats, engine if engine is not None else MatchingEngine(df))
+        # 还没合并增量时的引擎版本：按源文件预计算的结果（如答案路径表）只对它有效
+        self.base_version = self.engine.version
+        self._rows_by_key = {key: row for row, key in enumerate(df['职业_规范'])}
+        self._applied = set()   # 已合并文件的内容哈希
+        self._seen = {}         # 路径 → (修改时间, 大小)，没变的文件不再计算哈希
+        self._lock = threading.Lock()
+
+    @property
+    def df(self):
+        return self.snapshot[0]
+
+    @property
+    def stats(self):
+        return self.snapshot[1]
+
+    @property
+    def engine(self):
+        return self.snapshot[2]
+
+    def apply(self, path):
+        """合并一个增量文件，返回本次的合并统计；同样内容的文件只合并一次（返回 None）"""
+        with self._lock:
+            digest = file_digest(path)
+            if digest in self._applied:
+                return None
+
+            start = time.perf_counter()
+            df, stats, engine = self.snapshot
+            merged, rows, rows_by_key, delta_stats = merge_delta(df, read_delta(path), self._rows_by_key)
+            engine = engine.updated(merged, rows)
+            stats = dict(stats, before=stats['before'] + delta_stats['rows'],
+                         unique_names=len(merged), after=len(merged))
+
+            self._rows_by_key = rows_by_key
+            self._applied.add(digest)
+            self.snapshot = (merged, stats, engine)
+            delta_stats['seconds'] = time.perf_counter() - start
+            return delta_stats
+
+    def refresh(self, paths=None):
+        """合并还没合并过的增量文件（默认扫描 UPDATES_DIR），返回 {路径: 合并统计}
+
+        某个文件合并失败时不影响后面的文件：该路径的结果是 {'error': 错误信息}，
+        文件没有变化就不再重试（修改后重新合并）。
+        """
+        results = {}
+        for path in list_deltas() if paths is None else paths:
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            signature = (info.st_mtime_ns, info.st_size)
+            if self._seen.get(path) == signature:
+                continue
+            try:
+                result = self.apply(path)
+            except Exception as e:
+                result = {'error': str(e)}
+            self._seen[path] = signature
+            if result is not None:
+                results[path] = result
+        return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="把增量岗位文件合并进去重后的数据集并报告结果")
+    parser.add_argument('deltas', nargs='+')
+    parser.add_argument('--source', default=DATA_FILE)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    args = parser.parse_args()
+
+    live = LiveDataset(*load_dataset(args.source, args.cache_dir))
+    for path, result in live.refresh(args.deltas).items():
+        if 'error' in result:
+            print(f"{path}: 合并失败: {result['error']}")
+            continue
+        print(f"{path}: {result['rows']} 条新岗位，{result['groups']} 个分组，"
+              f"替换 {result['replaced']} 行，新增 {result['appended']} 行，"
+              f"用时 {result['seconds'] * 1000:.1f} ms")
+    print(f"合并后岗位数量: {live.stats['after']}")
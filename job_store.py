@@ -0,0 +1,431 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""紧凑的岗位存储：逐行展示字段存成 numpy 数组，不再为每行保留 Python 对象
+
+- StringTable：驻留字符串表，每个不同的字符串只存一份 UTF-8 字节，每行只存
+  一个最窄的无符号整数编号（7 种主要类型只要 uint8）
+- IndustryListArray：岗位表 行业列表 列的 CSR 编码（行偏移 + 行业编号，行业名
+  驻留在词表里），是 pandas 扩展数组，岗位表里不再有逐行的 list
+- JobStore：匹配引擎展示推荐、搜索结果和多样性重排用到的逐行字段
+
+JobStore 的数据都是数值数组，引擎快照把它们和得分矩阵一起写进 arrays.bin，各进程
+内存映射后共享同一份物理内存（见 warmup.py）。
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import ExtensionArray, ExtensionDtype, register_extension_dtype
+from pandas.api.indexers import check_array_indexer
+
+from text_match import extract_core_name
+
+
+def _code_dtype(count):
+    """能表示 count 个编号外加一个缺失值标记的最窄无符号整数类型"""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if count < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+# 各编号类型的缺失值标记（该类型的最大值）；逐行读取时查表，不必每次调用 np.iinfo
+_MISSING = {np.dtype(dtype): np.iinfo(dtype).max for dtype in (np.uint8, np.uint16, np.uint32, np.uint64)}
+
+
+# ============= 驻留字符串表 =============
+class StringTable:
+    """一列字符串：不同的字符串首尾相接存成 UTF-8 字节，每行存它的编号
+
+    - blob: uint8 全部不同字符串的 UTF-8 字节
+    - offsets: (U + 1,) int64，第 i 个字符串是 blob[offsets[i]:offsets[i + 1]]
+    - codes: 每行的字符串编号，缺失值（非字符串）记为该类型的最大值，读出为 NaN
+      （与原岗位表里的缺失值相同）
+    """
+
+    def __init__(self, values):
+        if isinstance(getattr(values, 'dtype', None), pd.CategoricalDtype):
+            # 分类列直接用它的类别表和编码，不必逐行查重
+            strings = [value if isinstance(value, str) else None for value in values.cat.categories]
+            codes = values.cat.codes.to_numpy()
+            ids = np.array([i for i, value in enumerate(strings) if value is not None], dtype=np.int64)
+            remap = np.full(len(strings) + 1, -1, dtype=np.int64)
+            remap[ids] = np.arange(len(ids))
+            self._build([strings[i] for i in ids.tolist()], remap[codes])
+            return
+
+        lookup = {}
+        codes = np.array([
+            lookup.setdefault(value, len(lookup)) if isinstance(value, str) else -1 for value in values
+        ], dtype=np.int64)
+        self._build(list(lookup), codes)
+
+    def _build(self, strings, codes):
+        """strings 是不同的字符串，codes 是每行的编号（-1 表示缺失）"""
+        encoded = [s.encode('utf-8') for s in strings]
+        self.offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        self.offsets[1:] = np.cumsum([len(data) for data in encoded], dtype=np.int64)
+        self.blob = np.frombuffer(b''.join(encoded), dtype=np.uint8).copy()
+        dtype = _code_dtype(len(encoded))
+        self.codes = np.where(codes < 0, np.iinfo(dtype).max, codes).astype(dtype)
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def missing(self):
+        return _MISSING[self.codes.dtype]
+
+    def string(self, code):
+        """第 code 个不同的字符串"""
+        return self.blob[self.offsets[code]:self.offsets[code + 1]].tobytes().decode('utf-8')
+
+    def __getitem__(self, row):
+        code = int(self.codes[row])
+        return np.nan if code == self.missing else self.string(code)
+
+    def contains(self, rows, piece):
+        """rows 这些行里字符串包含 piece 的行号（缺失值不包含）
+
+        把候选字符串的 UTF-8 字节首尾相接取出，在 piece 首字节出现的位置上整段比较，
+        再换算回行号。UTF-8 的子串与字符子串一一对应，所以直接在字节上查找，不逐行
+        解码。
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        needle = np.frombuffer(piece.encode('utf-8'), dtype=np.uint8)
+        codes = self.codes[rows].astype(np.int64)
+        starts = self.offsets[np.minimum(codes, len(self.offsets) - 2)]
+        lengths = np.where(codes == self.missing, 0, self.offsets[np.minimum(codes + 1, len(self.offsets) - 1)] - starts)
+        if not len(needle):
+            return rows[codes != self.missing]
+        ends = np.cumsum(lengths)
+        if not len(rows) or not ends[-1]:
+            return rows[:0]
+
+        # 拼接结果里第 i 个字符串从 placed[i] 开始；相邻字符串在 blob 里的跳跃用 cumsum 还原下标
+        placed = ends - lengths
+        step = np.ones(int(ends[-1]) + 1, dtype=np.int64)
+        np.add.at(step, placed, starts - np.concatenate([[0], starts[:-1] + lengths[:-1]]))
+        joined = self.blob[np.cumsum(step)[:-1] - 1]
+
+        at = np.flatnonzero(joined == needle[0])
+        owner = np.searchsorted(placed, at, 'right') - 1
+        fits = at + len(needle) <= ends[owner]
+        at, owner = at[fits], owner[fits]
+        same = (joined[at[:, None] + np.arange(len(needle))] == needle).all(axis=1)
+        hit = np.zeros(len(rows), dtype=bool)
+        hit[owner[same]] = True
+        return rows[hit]
+
+    def strings(self):
+        """全部不同的字符串（按编号顺序）"""
+        data = self.blob.tobytes()
+        bounds = self.offsets.tolist()
+        return [data[bounds[i]:bounds[i + 1]].decode('utf-8') for i in range(len(bounds) - 1)]
+
+    def tolist(self):
+        strings = self.strings() + [np.nan]
+        missing = self.missing
+        return [strings[-1] if code == missing else strings[code] for code in self.codes.tolist()]
+
+    def updated(self, size, rows, values):
+        """扩展到 size 行并把 rows 行换成 values 的新表（新字符串追加在字符串表末尾）"""
+        strings = self.strings()
+        lookup = {s: i for i, s in enumerate(strings)}
+        codes = np.full(size, -1, dtype=np.int64)
+        old = self.codes.astype(np.int64)
+        codes[:len(old)] = np.where(old == self.missing, -1, old)
+        for row, value in zip(np.asarray(rows).tolist(), values):
+            if isinstance(value, str):
+                if value not in lookup:
+                    lookup[value] = len(strings)
+                    strings.append(value)
+                codes[row] = lookup[value]
+            else:
+                codes[row] = -1
+        new = StringTable.__new__(StringTable)
+        new._build(strings, codes)
+        return new
+
+
+# ============= 行业列表列 =============
+def parse_industries(cell):
+    """把一个行业列表单元格解析成去掉首尾空白的行业名列表"""
+    if isinstance(cell, list):
+        parts = cell
+    elif isinstance(cell, str):
+        # 字符串形式的列表，如 "['互联网/电子商务', '计算机软件']"
+        parts = [part.strip().strip('[]\'"') for part in cell.split(',')]
+    else:
+        return []
+
+    industries = []
+    for ind in parts:
+        if isinstance(ind, str) and ind.strip() and ind.strip() not in industries:
+            industries.append(ind.strip())
+    return industries
+
+
+@register_extension_dtype
+class IndustryListDtype(ExtensionDtype):
+    """IndustryListArray 的 pandas 类型"""
+
+    name = 'industry_list'
+    type = list
+    kind = 'O'
+
+    @classmethod
+    def construct_array_type(cls):
+        return IndustryListArray
+
+    def __from_arrow__(self, array):
+        """从 Arrow 的 list<string> 列还原（pd.read_parquet 读回 to_parquet 写出的岗位表）"""
+        chunks = getattr(array, 'chunks', [array])
+        return IndustryListArray.from_cells([cell for chunk in chunks for cell in chunk.to_pylist()])
+
+
+class IndustryListArray(ExtensionArray):
+    """行业列表列的 CSR 编码：第 i 行的行业是 vocabulary[ids[offsets[i]:offsets[i + 1]]]
+
+    - offsets: (N + 1,) int64 行偏移
+    - ids: int32 行业编号
+    - vocabulary: 行业名列表，只追加不修改，取行、合并增量得到的新数组共用或扩展它
+
+    列表单元格原样保存（顺序、重复和首尾空白都不变，展示文本与原来相同），其他
+    单元格经过 parse_industries 解析；没有行业的行是空列表，不算缺失值。按行读出
+    时才临时生成 list。
+
+    写入（df.loc[i, '行业列表'] = [...]）时重新编码生成新的 offsets/ids 再替换，
+    不在原数组上修改（它们可能是只读的内存映射）；to_parquet 写成 Arrow 的
+    list<string> 列，pd.read_parquet 读回仍是 IndustryListArray。
+    """
+
+    def __init__(self, offsets, ids, vocabulary):
+        self.offsets = offsets
+        self.ids = ids
+        self.vocabulary = vocabulary
+
+    @classmethod
+    def from_cells(cls, cells, vocabulary=()):
+        """由行业列表单元格构建；vocabulary 是沿用的词表（新行业追加在后面）"""
+        lookup = {name: i for i, name in enumerate(vocabulary)}
+        offsets = [0]
+        ids = []
+        for cell in cells:
+            names = cell if isinstance(cell, list) else parse_industries(cell)
+            ids.extend(lookup.setdefault(name, len(lookup)) for name in names if isinstance(name, str))
+            offsets.append(len(ids))
+        return cls(np.asarray(offsets, dtype=np.int64), np.asarray(ids, dtype=np.int32), list(lookup))
+
+    # ----- pandas 扩展数组接口 -----
+    @classmethod
+    def _from_sequence(cls, scalars, *, dtype=None, copy=False):
+        if isinstance(scalars, cls):
+            return scalars.copy() if copy else scalars
+        return cls.from_cells(scalars)
+
+    @classmethod
+    def _from_factorized(cls, values, original):
+        return cls.from_cells(values, original.vocabulary)
+
+    @classmethod
+    def _concat_same_type(cls, to_concat):
+        lookup = {}
+        offsets, ids, end = [np.zeros(1, dtype=np.int64)], [], 0
+        for array in to_concat:
+            remap = np.array([lookup.setdefault(name, len(lookup)) for name in array.vocabulary], dtype=np.int32)
+            ids.append(remap[array.ids])
+            offsets.append(array.offsets[1:] - array.offsets[0] + end)
+            end = offsets[-1][-1] if len(offsets[-1]) else end
+        return cls(np.concatenate(offsets), np.concatenate(ids) if ids else np.zeros(0, dtype=np.int32),
+                   list(lookup))
+
+    @property
+    def dtype(self):
+        return IndustryListDtype()
+
+    @property
+    def nbytes(self):
+        return self.offsets.nbytes + self.ids.nbytes
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        vocabulary = self.vocabulary
+        ids = self.ids.tolist()
+        bounds = self.offsets.tolist()
+        for i in range(len(bounds) - 1):
+            yield [vocabulary[j] for j in ids[bounds[i]:bounds[i + 1]]]
+
+    def __getitem__(self, item):
+        if pd.api.types.is_integer(item):
+            row = int(item) + len(self) if item < 0 else int(item)
+            if not 0 <= row < len(self):
+                raise IndexError(f"行号 {item} 超出范围")
+            return [self.vocabulary[j] for j in self.ids[self.offsets[row]:self.offsets[row + 1]].tolist()]
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step == 1 and (start, stop) == (0, len(self)):
+                # 整列切片（pandas 浅复制时的 view）共用原数组，内存映射的编码不被复制
+                return IndustryListArray(self.offsets, self.ids, self.vocabulary)
+            return self._take_rows(np.arange(len(self))[item])
+        item = check_array_indexer(self, item)
+        return self._take_rows(np.flatnonzero(item) if item.dtype == bool else item)
+
+    def __setitem__(self, key, value):
+        """按行写入：单个行号时 value 是一个单元格（list 或字符串），否则是与选中行数
+        相同的单元格序列，或写到所有选中行的单个字符串"""
+        if isinstance(key, tuple) and len(key) == 1:
+            key = key[0]
+        if pd.api.types.is_integer(key):
+            rows, cells = np.arange(len(self))[[key]], [value]
+        else:
+            rows = np.arange(len(self))[check_array_indexer(self, key)]
+            if pd.api.types.is_list_like(value):
+                cells = [cell.tolist() if isinstance(cell, np.ndarray) else cell for cell in value]
+            else:
+                cells = [value] * len(rows)
+        if len(cells) != len(rows):
+            raise ValueError(f"要写入 {len(rows)} 行，收到 {len(cells)} 个行业列表")
+        new = self.updated(len(self), rows, cells)
+        self.offsets, self.ids, self.vocabulary = new.offsets, new.ids, new.vocabulary
+
+    def __eq__(self, other):
+        if isinstance(other, (pd.Series, pd.Index, pd.DataFrame)):
+            return NotImplemented
+        if not isinstance(other, IndustryListArray):
+            other = list(other)
+        if len(other) != len(self):
+            raise ValueError("长度不同的行业列表列不能比较")
+        return np.array([a == b for a, b in zip(self, other)], dtype=bool)
+
+    def __array__(self, dtype=None, copy=None):
+        cells = np.empty(len(self), dtype=object)
+        for i, cell in enumerate(self):
+            cells[i] = cell
+        return cells
+
+    def __arrow_array__(self, type=None):
+        """Arrow 的 list<string> 数组（DataFrame.to_parquet 时调用）；需要可选依赖 pyarrow"""
+        import pyarrow as pa
+
+        start, end = int(self.offsets[0]), int(self.offsets[-1])
+        names = pa.array(self.vocabulary, type=pa.string()).take(pa.array(self.ids[start:end]))
+        array = pa.ListArray.from_arrays(pa.array(self.offsets - start, type=pa.int32()), names)
+        return array if type is None else array.cast(type)
+
+    def astype(self, dtype, copy=True):
+        dtype = pd.api.types.pandas_dtype(dtype)
+        if isinstance(dtype, IndustryListDtype):
+            return self.copy() if copy else self
+        if dtype == object:
+            return np.asarray(self)
+        return super().astype(dtype, copy=copy)
+
+    def isna(self):
+        return np.zeros(len(self), dtype=bool)
+
+    def copy(self):
+        return IndustryListArray(self.offsets.copy(), self.ids.copy(), self.vocabulary)
+
+    def take(self, indices, *, allow_fill=False, fill_value=None):
+        """按行号取行；allow_fill 时 -1 取空列表"""
+        rows = np.asarray(indices, dtype=np.int64)
+        empty = None
+        if allow_fill:
+            if (rows < -1).any():
+                raise ValueError("allow_fill 时行号只能是 -1 或非负整数")
+            empty = rows == -1
+            rows = np.where(empty, 0, rows)
+            checked = rows[~empty]
+        else:
+            rows = np.where(rows < 0, rows + len(self), rows)
+            checked = rows
+        if len(checked) and (checked.min() < 0 or checked.max() >= len(self)):
+            raise IndexError("行号超出范围")
+        return self._take_rows(rows, empty)
+
+    # ----- 编码操作 -----
+    def _take_rows(self, rows, empty=None):
+        """rows 这些行组成的新数组（empty 为真的行取空列表），与原数组共用词表"""
+        rows = np.asarray(rows, dtype=np.int64)
+        starts = self.offsets[rows] if len(self) else np.zeros(len(rows), dtype=np.int64)
+        lengths = (self.offsets[rows + 1] - starts) if len(self) else np.zeros(len(rows), dtype=np.int64)
+        if empty is not None:
+            lengths[empty] = 0
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        gather = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return IndustryListArray(offsets, self.ids[gather], self.vocabulary)
+
+    def pairs(self):
+        """展开成 (行号数组, 行业编号数组, 行业名列表)：一个岗位的每个行业各一对
+
+        与逐行 parse_industries 的结果相同：行业名去掉首尾空白，空名称不算，
+        同一行重复的行业只保留第一次出现。
+        """
+        names = {}
+        remap = np.array([names.setdefault(name.strip(), len(names)) if name.strip() else -1
+                          for name in self.vocabulary] + [-1], dtype=np.int64)
+        rows = np.repeat(np.arange(len(self), dtype=np.int64), np.diff(self.offsets))
+        ids = remap[self.ids]
+        rows, ids = rows[ids >= 0], ids[ids >= 0]
+        first = np.sort(np.unique(rows * max(len(names), 1) + ids, return_index=True)[1])
+        return rows[first], ids[first], list(names)
+
+    def updated(self, size, rows, cells):
+        """扩展到 size 行并把 rows 行换成 cells 的新数组（新行业追加在词表末尾）
+
+        size 以内、原数组以外的行都必须在 rows 里。
+        """
+        changed = IndustryListArray.from_cells(cells, self.vocabulary)
+        offsets = np.concatenate([self.offsets, self.offsets[-1] + changed.offsets[1:]])
+        ids = np.concatenate([self.ids, changed.ids])
+        source = np.arange(size, dtype=np.int64)
+        source[np.asarray(rows, dtype=np.int64)] = len(self) + np.arange(len(changed))
+        return IndustryListArray(offsets, ids, changed.vocabulary)._take_rows(source)
+
+
+# ============= 岗位存储 =============
+def _industry_text(cell):
+    """行业列表单元格的展示文本"""
+    return ', '.join(cell) if isinstance(cell, list) else str(cell)
+
+
+class JobStore:
+    """推荐与搜索结果展示用的逐行字段（职业名称、薪资文本、主要类型、行业文本、
+    核心名称、规范化名称），每个字段是一个 StringTable"""
+
+    FIELDS = ('titles', 'salary_texts', 'main_types', 'industry_texts', 'core_names', 'normalized_names')
+
+    def __init__(self, df):
+        for name, values in self._columns(df).items():
+            setattr(self, name, StringTable(values))
+
+    @staticmethod
+    def _columns(df):
+        """岗位表 → 各字段的取值（分类列原样传给 StringTable）"""
+        titles = df['职业']
+        if '核心名称' in df.columns:
+            core_names = df['核心名称']
+        else:
+            core_names = [extract_core_name(title) for title in titles.tolist()]
+        return {
+            'titles': titles,
+            'salary_texts': df['薪资'],
+            'main_types': df['主要类型'],
+            'industry_texts': [_industry_text(cell) for cell in df['行业列表']],
+            'core_names': core_names,
+            'normalized_names': df['职业_规范'] if '职业_规范' in df.columns else titles,
+        }
+
+    def __len__(self):
+        return len(self.titles)
+
+    def updated(self, size, rows, changed):
+        """合并增量后的新存储：changed 是新岗位表里 rows 这些行"""
+        new = JobStore.__new__(JobStore)
+        for name, values in self._columns(changed).items():
+            values = values.tolist() if hasattr(values, 'tolist') else values
+            setattr(new, name, getattr(self, name).updated(size, rows, values))
+        return new
@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""分阶段计时与计数：每次重跑（或每个 API 请求）各阶段的耗时、扫描行数等
+
+- timer(阶段名)：计时上下文，可以嵌套；每个阶段只记自身耗时（不含嵌套在里面的
+  其他阶段），推荐时「多样性重排」与按需进行的「打分」就能分开
+- count(计数名, 值)：计数，如扫描的岗位行数、保留的候选数
+- trace(名称)：一次重跑或一次请求，结束时把各阶段耗时记进直方图
+
+直方图和计数在进程内全局累计（Streamlit 的所有会话共享），可以导出成
+Prometheus 文本格式（写文件或由 api.py 的 /metrics 提供）。每次 trace 还可以
+按 JSON 行追加到结构化日志里。
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+
+# 阶段耗时直方图的桶上界（秒）
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 调试面板保留的最近几次 trace
+RECENT_TRACES = 50
+
+_local = threading.local()
+
+
+# ============= 直方图与全局累计 =============
+class Histogram:
+    """固定桶的耗时直方图（各桶计数不累计，导出时再累加）"""
+
+    def __init__(self, buckets=STAGE_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)   # 最后一个是 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        i = 0
+        while i < len(self.buckets) and seconds > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, q):
+        """按桶估计分位数（桶内线性插值），没有数据时为 None"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for upper, n in zip(self.buckets + (None,), self.counts):
+            if n and seen + n >= rank:
+                if upper is None:
+                    return lower
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+            lower = upper if upper is not None else lower
+        return lower
+
+
+class Registry:
+    """进程内全部阶段的耗时直方图、计数和最近的 trace（线程安全）"""
+
+    def __init__(self, buckets=STAGE_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.histograms = {}   # 阶段 → Histogram
+        self.counters = {}     # 计数名 → 累计值
+        self.recent = deque(maxlen=RECENT_TRACES)
+        self.trace_log = None  # 结构化日志文件（JSON 行），None 表示不写
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            self._observe(stage, seconds)
+
+    def _observe(self, stage, seconds):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def add(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record(self, trace):
+        """一次 trace 结束：各阶段耗时记进直方图，计数累加"""
+        with self._lock:
+            self._observe(f'{trace.name}.total', trace.seconds)
+            for stage, seconds in trace.stages.items():
+                self._observe(stage, seconds)
+            for name, value in trace.counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            self.recent.append(trace)
+        if self.trace_log:
+            try:
+                with open(self.trace_log, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(trace.to_dict(), ensure_ascii=False) + '\n')
+            except OSError:
+                pass
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.recent.clear()
+
+    def summary(self):
+        """各阶段的调用次数、平均与估计的 p50/p95（秒），按累计耗时降序"""
+        with self._lock:
+            rows = [{
+                'stage': stage,
+                'count': h.count,
+                'total': h.sum,
+                'mean': h.sum / h.count if h.count else None,
+                'p50': h.quantile(0.5),
+                'p95': h.quantile(0.95),
+            } for stage, h in self.histograms.items()]
+        return sorted(rows, key=lambda row: -row['total'])
+
+    def to_prometheus(self, prefix='holland'):
+        """Prometheus 文本格式（0.0.4）"""
+        with self._lock:
+            lines = [f'# HELP {prefix}_stage_seconds 各阶段自身耗时（不含嵌套阶段）',
+                     f'# TYPE {prefix}_stage_seconds histogram']
+            for stage in sorted(self.histograms):
+                h = self.histograms[stage]
+                label = _label(stage)
+                cumulative = 0
+                for upper, n in zip(h.buckets, h.counts):
+                    cumulative += n
+                    lines.append(f'{prefix}_stage_seconds_bucket{{stage="{label}",le="{upper:g}"}} {cumulative}')
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{label}",le="+Inf"}} {h.count}')
+                lines.append(f'{prefix}_stage_seconds_sum{{stage="{label}"}} {h.sum!r}')
+                lines.append(f'{prefix}_stage_seconds_count{{stage="{label}"}} {h.count}')
+            lines.append(f'# HELP {prefix}_events_total 各类计数（扫描行数、保留候选数等）')
+            lines.append(f'# TYPE {prefix}_events_total counter')
+            for name in sorted(self.counters):
+                lines.append(f'{prefix}_events_total{{name="{_label(name)}"}} {self.counters[name]}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path, prefix='holland'):
+        """写成 Prometheus 文本文件（先写临时文件再改名，采集方不会读到半个文件）"""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.metrics-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus(prefix))
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+
+def _label(value):
+    """Prometheus 标签值转义"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+REGISTRY = Registry()
+
+
+# ============= 计时与计数 =============
+class Trace:
+    """一次重跑或一次请求：各阶段自身耗时之和、调用次数与计数"""
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.time()
+        self.seconds = 0.0
+        self.stages = {}    # 阶段 → 秒
+        self.calls = {}     # 阶段 → 次数
+        self.counters = {}  # 计数名 → 值
+
+    def to_dict(self):
+        return {
+            'trace': self.name,
+            'started': self.started,
+            'seconds': self.seconds,
+            'stages': self.stages,
+            'calls': self.calls,
+            'counters': self.counters,
+        }
+
+
+class timer:
+    """阶段计时：with timer('recommend.score'): ...
+
+    在 trace 里时累加到这次 trace，否则直接记进全局直方图。
+    """
+
+    __slots__ = ('name', 'start', 'nested')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self.nested = 0.0
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        stack = _local.stack
+        stack.pop()
+        if stack:
+            stack[-1].nested += elapsed
+        own = elapsed - self.nested
+        current = getattr(_local, 'trace', None)
+        if current is None:
+            REGISTRY.observe(self.name, own)
+        else:
+            current.stages[self.name] = current.stages.get(self.name, 0.0) + own
+            current.calls[self.name] = current.calls.get(self.name, 0) + 1
+        return False
+
+
+def count(name, value=1):
+    """计数：在 trace 里时累加到这次 trace，否则直接累加到全局"""
+    current = getattr(_local, 'trace', None)
+    if current is None:
+        REGISTRY.add(name, value)
+    else:
+        current.counters[name] = current.counters.get(name, 0) + value
+
+
+class trace:
+    """一次重跑或一次请求：with trace('rerun') as t: ...，结束时记进 registry"""
+
+    def __init__(self, name, registry=None):
+        self.trace = Trace(name)
+        self.registry = registry or REGISTRY
+
+    def __enter__(self):
+        self.previous = getattr(_local, 'trace', None)
+        _local.trace = self.trace
+        self.start = time.perf_counter()
+        return self.trace
+
+    def __exit__(self, *exc):
+        self.trace.seconds = time.perf_counter() - self.start
+        _local.trace = self.previous
+        self.registry.record(self.trace)
+        return False
+
+
+def current_trace():
+    """当前线程正在进行的 trace（没有时为 None）"""
+    return getattr(_local, 'trace', None)
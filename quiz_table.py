@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""快速测评的答案路径表：预先算出测评能得到的每一种得分及其默认推荐
+
+用法：python quiz_table.py [--source 源文件] [--cache-dir 目录] [--workers N]
+
+每道题的选项只给几个类型加 1 或 2 分，整套测评的原始得分（六个类型各自的
+累计分）是有限的。这里按题目逐题展开全部可达的原始得分，为每一种算出不加
+筛选条件时的前 QUIZ_TOP_N 个推荐，按数据集版本写入缓存目录。用户做完测评
+且没有设置筛选条件时，按答案的原始得分二分查找即可得到推荐结果。
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from batch import recommend_batch
+from dataset import CACHE_DIR, DATA_FILE, cache_path, file_digest, load_dataset
+from engine import HOLLAND_ORDER
+from holland import QUESTIONS
+from warmup import load_engine
+
+QUIZ_TOP_N = 10
+
+# 原始得分按类型各占 6 位编码成一个整数（每个类型的累计分必须小于 64）
+_BITS = 6
+_SHIFTS = {t: _BITS * i for i, t in enumerate(HOLLAND_ORDER)}
+
+
+# ============= 原始得分编码 =============
+def answer_key(answers):
+    """答案列表（每题所选选项的 {类型: 分值}）→ 原始得分编码"""
+    return sum(value << _SHIFTS[t] for answer in answers for t, value in answer.items())
+
+
+def decode_keys(keys):
+    """原始得分编码数组 → (个数, 6) 原始得分矩阵"""
+    keys = np.asarray(keys, dtype=np.int64)
+    return np.stack([(keys >> _SHIFTS[t]) & ((1 << _BITS) - 1) for t in HOLLAND_ORDER], axis=1)
+
+
+def reachable_keys(questions=QUESTIONS):
+    """测评能得到的全部原始得分编码（升序）"""
+    limit = sum(max(max(weights.values(), default=0) for _, weights in q['options']) for q in questions)
+    if limit >= 1 << _BITS:
+        raise ValueError(f"题目分值累计可达 {limit}，超出编码范围")
+    keys = np.zeros(1, dtype=np.int64)
+    for q in questions:
+        steps = np.unique([answer_key([weights]) for _, weights in q['options']])
+        keys = np.unique((keys[:, None] + steps[None, :]).ravel())
+    return keys
+
+
+def score_vectors(keys):
+    """原始得分 → 用户得分向量，与 calculate_user_scores 的归一化完全相同"""
+    raw = decode_keys(keys).astype(np.float64)
+    peak = raw.max(axis=1, keepdims=True)
+    return raw / np.where(peak > 0, peak, 1)
+
+
+def questions_fingerprint(questions=QUESTIONS):
+    """题目分值的指纹：改了题目或分值，旧表自动失效"""
+    weights = [[sorted(w.items()) for _, w in q['options']] for q in questions]
+    return hashlib.sha256(json.dumps(weights).encode('utf-8')).hexdigest()[:12]
+
+
+def table_path(source=DATA_FILE, cache_dir=CACHE_DIR, digest=None, top_n=QUIZ_TOP_N):
+    """数据集版本、题目指纹和推荐个数对应的答案路径表目录"""
+    return f"{cache_path(source, cache_dir, digest)}-quiz-{questions_fingerprint()}-top{top_n}"
+
+
+# ============= 答案路径表 =============
+class QuizTable:
+    """答案路径表：原始得分编码（升序）→ 默认推荐的行号与匹配度
+
+    - keys: (K,) int64 原始得分编码
+    - rows: (K, top_n) int32 推荐岗位行号，不足 top_n 个时以 -1 补齐
+    - matches: (K, top_n) int16 匹配度百分比 × 10
+
+    表里的行号只对构建它的数据集有效：version 是绑定的引擎版本，引擎合并过
+    增量（版本号变化）后 lookup 返回 None，调用方改用实时计算。
+    """
+
+    def __init__(self, keys, rows, matches, version=None):
+        self.keys = keys
+        self.rows = rows
+        self.matches = matches
+        self.version = version
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def top_n(self):
+        return self.rows.shape[1]
+
+    def lookup(self, engine, answers):
+        """answers 对应的默认推荐（与 engine.recommend 不加筛选的结果相同）；查不到时返回 None"""
+        if engine.version != self.version:
+            return None
+        key = answer_key(answers)
+        i = int(np.searchsorted(self.keys, key))
+        if i >= len(self.keys) or self.keys[i] != key:
+            return None
+        return [engine.recommendation(row, match / 10)
+                for row, match in zip(self.rows[i].tolist(), self.matches[i].tolist()) if row >= 0]
+
+    def save(self, target):
+        """写成缓存目录（先写临时目录再整体改名）"""
+        parent = os.path.dirname(os.path.abspath(target))
+        os.makedirs(parent, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=parent, prefix='.building-')
+        try:
+            for name in ('keys', 'rows', 'matches'):
+                np.save(os.path.join(tmp, f'{name}.npy'), getattr(self, name))
+            os.replace(tmp, target)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.isdir(target):
+                raise
+
+    @classmethod
+    def load(cls, target, version=None):
+        """读取缓存目录（内存映射，不会把整张表读进内存）"""
+        arrays = [np.load(os.path.join(target, f'{name}.npy'), mmap_mode='r')
+                  for name in ('keys', 'rows', 'matches')]
+        return cls(*arrays, version=version)
+
+
+def build_table(engine, top_n=QUIZ_TOP_N, workers=1, progress=None, questions=QUESTIONS):
+    """展开全部可达得分并批量计算默认推荐，返回绑定到 engine 的 QuizTable"""
+    keys = reachable_keys(questions)
+    rows = np.full((len(keys), top_n), -1, dtype=np.int32)
+    matches = np.zeros((len(keys), top_n), dtype=np.int16)
+    results = recommend_batch(engine, score_vectors(keys), top_n=top_n, workers=workers,
+                              progress=progress, rows_only=True)
+    for i, ranked in enumerate(results):
+        for j, (row, match) in enumerate(ranked):
+            rows[i, j] = row
+            matches[i, j] = round(match * 10)
+    return QuizTable(keys, rows, matches, version=engine.version)
+
+
+def load_table(version, source=DATA_FILE, cache_dir=CACHE_DIR, top_n=QUIZ_TOP_N):
+    """读取与源文件当前内容对应的答案路径表；还没有预计算时返回 None
+
+    version 是直接由这个源文件构建（还没有合并增量）的引擎的版本号。
+    """
+    try:
+        target = table_path(source, cache_dir, file_digest(source), top_n)
+    except OSError:
+        return None
+    if not os.path.isfile(os.path.join(target, 'keys.npy')):
+        return None
+    return QuizTable.load(target, version=version)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="预计算快速测评全部可能得分的默认推荐")
+    parser.add_argument('--source', default=DATA_FILE)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--top-n', type=int, default=QUIZ_TOP_N)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='并行进程数')
+    args = parser.parse_args()
+
+    digest = file_digest(args.source)
+    target = table_path(args.source, args.cache_dir, digest, args.top_n)
+    if os.path.isdir(target):
+        print(f"答案路径表已存在: {target}")
+        sys.exit(0)
+
+    df, _ = load_dataset(args.source, args.cache_dir)
+    engine = load_engine(df, args.source, args.cache_dir)
+    start = time.perf_counter()
+
+    def report(done, total):
+        elapsed = time.perf_counter() - start
+        print(f"\r已完成 {done}/{total} 种得分（{done / max(elapsed, 1e-9):.0f} 种/秒）",
+              end='', file=sys.stderr, flush=True)
+
+    table = build_table(engine, args.top_n, args.workers, report)
+    table.save(target)
+    print(f"\n{len(table)} 种得分的推荐已写入: {target}", file=sys.stderr)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""推荐结果缓存：相同的得分与筛选条件直接返回上次的推荐结果
+
+测评的答案组合有限，手动模式的滑块按 0.1 步进，很多用户提交的查询完全相同。
+缓存键由数据集版本、规范化后的得分向量和筛选条件指纹组成，岗位数据更新后
+旧结果自然不再命中。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from engine import HOLLAND_ORDER
+
+
+def _number(value):
+    """数值统一成 float（1 与 1.0、-0.0 与 0.0 视为相同）"""
+    return float(value) + 0.0
+
+
+def score_key(user_scores):
+    """得分向量的规范形式：按 R/I/A/S/E/C 顺序的 float 元组，缺失的类型记 0"""
+    return tuple(_number(user_scores.get(t, 0)) for t in HOLLAND_ORDER)
+
+
+def filter_key(top_n=10, min_salary=0, industries=None, max_salary=None, mmr_lambda=1.0,
+               salary_range=None, salary_weight=0.0):
+    """筛选条件的指纹：行业与选择顺序无关，空列表等同于不限行业"""
+    return (
+        int(top_n),
+        _number(min_salary),
+        None if max_salary is None else _number(max_salary),
+        tuple(sorted(set(industries))) if industries else None,
+        _number(mmr_lambda),
+        None if salary_range is None else tuple(None if v is None else _number(v) for v in salary_range),
+        _number(salary_weight),
+    )
+
+
+class ResultCache:
+    """线程安全的 LRU 缓存，条目超过 ttl 秒后失效
+
+    Streamlit 的各个会话在同一进程的不同线程里运行，用 st.cache_resource 得到
+    同一个实例即可在会话之间共享。
+    """
+
+    def __init__(self, maxsize=1024, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()   # 键 → (写入时间, 结果)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """命中时返回结果并移到最近使用的一端，否则返回 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """命中统计与容量"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+def cached_recommend(cache, engine, user_scores, top_n=10, min_salary=0, industries=None,
+                     max_salary=None, mmr_lambda=1.0, salary_range=None, salary_weight=0.0):
+    """先查缓存再调用 engine.recommend；返回的列表与字典都是副本，调用方可以随意修改"""
+    key = (engine.version, score_key(user_scores),
+           filter_key(top_n, min_salary, industries, max_salary, mmr_lambda, salary_range, salary_weight))
+    jobs = cache.get(key)
+    if jobs is None:
+        jobs = engine.recommend(user_scores, top_n=top_n, min_salary=min_salary,
+                                industries=industries or None, max_salary=max_salary,
+                                mmr_lambda=mmr_lambda, salary_range=salary_range,
+                                salary_weight=salary_weight)
+        cache.put(key, jobs)
+    return [dict(job) for job in jobs]
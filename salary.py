@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""薪资文本解析：把 薪资 列（如 "15.0-25.0千/月"、"10-15万/年"、"150元/天"）
+换算成按月计、以千元为单位的数值区间
+
+加载数据时每个不同的薪资文本只解析一次，结果存成 薪资_下限_千 / 薪资_上限_千 /
+薪资_月均_千 三个数值列；匹配引擎据此做区间重叠筛选和按薪资加权排序，请求时
+不再处理字符串。
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+SALARY_COLUMNS = ['薪资_下限_千', '薪资_上限_千', '薪资_月均_千']
+
+# 日薪、时薪按每月 21.75 个工作日、每天 8 小时折算
+WORK_DAYS_PER_MONTH = 21.75
+WORK_HOURS_PER_DAY = 8
+
+# 金额单位 → 千元
+_UNITS = {'千': 1.0, 'k': 1.0, 'K': 1.0, '万': 10.0, 'w': 10.0, 'W': 10.0, '元': 0.001}
+
+# 计薪周期 → 折算成月薪的倍数
+_PERIODS = {
+    '月': 1.0,
+    '年': 1 / 12,
+    '周': 52 / 12,
+    '天': WORK_DAYS_PER_MONTH,
+    '日': WORK_DAYS_PER_MONTH,
+    '小时': WORK_DAYS_PER_MONTH * WORK_HOURS_PER_DAY,
+    '时': WORK_DAYS_PER_MONTH * WORK_HOURS_PER_DAY,
+}
+
+_NUMBER = r'\d+(?:\.\d+)?'
+_UNIT = r'[千万元kKwW]'
+_SALARY_PATTERN = re.compile(
+    rf'^(?P<annual>年薪)?\s*'
+    rf'(?P<low>{_NUMBER})\s*(?P<low_unit>{_UNIT})?\s*'
+    rf'(?:[-~～—－至到]\s*(?P<high>{_NUMBER})\s*(?P<high_unit>{_UNIT})?)?\s*'
+    rf'(?P<bound>以上|以下)?\s*'
+    rf'(?:[/每]\s*(?P<period>小时|时|天|日|周|月|年))?\s*'
+    rf'(?:[·*×xX]\s*(?P<months>\d+)\s*薪)?$'
+)
+
+
+# ============= 解析 =============
+def parse_salary(text):
+    """薪资文本 → (下限, 上限, 月均)，单位千元/月；无法解析（如"未知"、"面议"）时都为 NaN
+
+    "X以上" 的上限为 inf，"X以下" 的下限为 0，这两种的月均取给出的那个数。
+    没有金额单位时，数值不小于 1000 按元计，否则按千元计。"·13薪" 这类按年
+    发放月数折算成平均月薪。
+    """
+    nan = float('nan')
+    if not isinstance(text, str):
+        return nan, nan, nan
+    match = _SALARY_PATTERN.match(text.strip())
+    if match is None:
+        return nan, nan, nan
+
+    low = float(match['low'])
+    high = float(match['high']) if match['high'] else None
+    low_unit = match['low_unit'] or match['high_unit']
+    high_unit = match['high_unit'] or match['low_unit']
+
+    def scale(value, unit):
+        if unit is None:
+            unit = '元' if value >= 1000 else '千'
+        return value * _UNITS[unit]
+
+    period = match['period'] or ('年' if match['annual'] else '月')
+    factor = _PERIODS[period]
+    if match['months'] and period == '月':
+        factor *= int(match['months']) / 12
+
+    low = scale(low, low_unit) * factor
+    if high is not None:
+        high = scale(high, high_unit) * factor
+        low, high = min(low, high), max(low, high)
+        return low, high, (low + high) / 2
+    if match['bound'] == '以上':
+        return low, float('inf'), low
+    if match['bound'] == '以下':
+        return 0.0, low, low
+    return low, low, low
+
+
+def parse_salaries(values):
+    """薪资列 → {列名: float64 数组}（SALARY_COLUMNS），每个不同的文本只解析一次"""
+    if isinstance(getattr(values, 'dtype', None), pd.CategoricalDtype):
+        texts = values.cat.categories.tolist()
+        codes = values.cat.codes.to_numpy()
+    else:
+        codes, texts = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+        texts = list(texts)
+    # 多留一行 NaN 给缺失值（编码 -1）
+    parsed = np.array([parse_salary(text) for text in texts] + [(np.nan,) * 3],
+                      dtype=np.float64).reshape(-1, 3)
+    return {col: parsed[codes, i] for i, col in enumerate(SALARY_COLUMNS)}
+
+
+def add_salary_columns(df):
+    """加上（或重算）薪资数值列的新表"""
+    return df.assign(**parse_salaries(df['薪资']))
+
+
+def salary_ranges(df):
+    """岗位表的 (下限, 上限, 月均) 数组；表里还没有薪资数值列时现场解析"""
+    if all(col in df.columns for col in SALARY_COLUMNS):
+        columns = {col: df[col].to_numpy(dtype=np.float64) for col in SALARY_COLUMNS}
+    else:
+        columns = parse_salaries(df['薪资'])
+    return tuple(np.array(columns[col], dtype=np.float64) for col in SALARY_COLUMNS)
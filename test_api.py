@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""推荐服务：参数校验、请求体长度处理与错误响应（在本机随机端口上起一个服务）"""
+
+import http.client
+import json
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from api import MAX_BODY_BYTES, ApiHandler, RecommendationService
+from engine import HOLLAND_ORDER
+from ingest import LiveDataset
+from result_cache import ResultCache
+
+SCORES = {t: 0.1 * (i + 1) for i, t in enumerate(HOLLAND_ORDER)}
+
+
+@pytest.fixture(scope='module')
+def service(compact, engine):
+    return RecommendationService(LiveDataset(compact, engine=engine), ResultCache(maxsize=64))
+
+
+@pytest.fixture(scope='module')
+def server(service):
+    handler = type('Handler', (ApiHandler,), {'service': service})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _request(server, method, path, body=None, headers=None):
+    """发送一个请求，返回 (状态码, 解析后的 JSON)；body 是 bytes 时原样发送"""
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=10)
+    try:
+        if body is not None and not isinstance(body, bytes):
+            body = json.dumps(body).encode('utf-8')
+        connection.putrequest(method, path)
+        headers = dict(headers or {})
+        if body is not None:
+            headers.setdefault('Content-Length', str(len(body)))
+        for key, value in headers.items():
+            connection.putheader(key, value)
+        connection.endheaders(body)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+# ============= 参数校验 =============
+@pytest.mark.parametrize('body, message', [
+    ({}, 'scores 或 answers'),
+    ({'scores': [1, 2]}, 'scores 必须是'),
+    ({'scores': {'X': 1}}, '未知的霍兰德类型'),
+    ({'scores': {'R': 'abc'}}, 'scores.R'),
+    ({'scores': {'R': float('nan')}}, '有限数字'),
+    ({'scores': SCORES, 'top_n': 0}, 'top_n'),
+    ({'scores': SCORES, 'top_n': True}, 'top_n'),
+    ({'scores': SCORES, 'industries': '计算机软件'}, 'industries'),
+    ({'scores': SCORES, 'mmr_lambda': 2}, 'mmr_lambda'),
+    ({'scores': SCORES, 'salary_range': [30, 10]}, 'salary_range'),
+    ({'scores': SCORES, 'salary_weight': -0.5}, 'salary_weight'),
+    ({'answers': 'abc'}, 'answers'),
+])
+def test_recommend_rejects_invalid_parameters(server, body, message):
+    status, payload = _request(server, 'POST', '/recommend', body)
+    assert status == 400
+    assert message in payload['error']
+
+
+def test_recommend_matches_engine(server, engine):
+    status, payload = _request(server, 'POST', '/recommend', {'scores': SCORES, 'top_n': 5, 'min_salary': 10})
+    assert status == 200
+    assert payload['jobs'] == json.loads(json.dumps(engine.recommend(SCORES, top_n=5, min_salary=10)))
+
+
+def test_search_validates_query(server):
+    assert _request(server, 'GET', '/search?q=')[0] == 400
+    assert _request(server, 'GET', '/search?q=%E6%95%B0%E6%8D%AE&limit=0')[0] == 400
+    assert _request(server, 'GET', '/search?q=%E6%95%B0%E6%8D%AE&fuzzy=maybe')[0] == 400
+    status, payload = _request(server, 'GET', '/search?q=%E6%95%B0%E6%8D%AE&limit=3')
+    assert status == 200 and len(payload['jobs']) <= 3
+
+
+# ============= 请求体 =============
+@pytest.mark.parametrize('length', ['abc', '-1', '1.5'])
+def test_invalid_content_length_is_rejected(server, length):
+    status, payload = _request(server, 'POST', '/recommend', b'{}', {'Content-Length': length})
+    assert status == 400
+    assert 'Content-Length' in payload['error']
+
+
+def test_oversized_body_is_rejected_without_reading(server):
+    # 只声明长度，不发送请求体：服务端不等待读取，直接回应 413
+    status, _ = _request(server, 'POST', '/recommend', None, {'Content-Length': str(MAX_BODY_BYTES + 1)})
+    assert status == 413
+
+
+@pytest.mark.parametrize('body, message', [(b'{not json', '合法的 JSON'), (b'[1, 2]', 'JSON 对象')])
+def test_malformed_body_is_rejected(server, body, message):
+    status, payload = _request(server, 'POST', '/score', body)
+    assert status == 400
+    assert message in payload['error']
+
+
+# ============= 错误响应 =============
+def test_unknown_route_is_404(server):
+    assert _request(server, 'GET', '/nothing')[0] == 404
+
+
+def test_internal_error_does_not_leak_details(server, service, monkeypatch):
+    def broken():
+        raise RuntimeError('内部细节 /root/secret')
+
+    monkeypatch.setattr(service, 'industries', broken)
+    status, payload = _request(server, 'GET', '/industries')
+    assert status == 500
+    assert payload == {'error': '服务内部错误'}
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""数据集加载：列式缓存的读写与去重"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset import SCORE_COLUMNS, deduplicate, deduplicate_chunks, load_dataset, parse_columns
+
+
+def _mapped(array):
+    """array 是否是（某个）内存映射数组的视图"""
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, 'base', None)
+    return False
+
+
+# ============= 列式缓存 =============
+def test_cache_round_trip_keeps_memory_mapped_columns(raw, tmp_path):
+    source = tmp_path / 'jobs.csv'
+    raw.to_csv(source, index=False)
+    built, built_stats = load_dataset(str(source), str(tmp_path / 'cache'))
+    cached, cached_stats = load_dataset(str(source), str(tmp_path / 'cache'))
+    assert not built_stats['cache_hit'] and cached_stats['cache_hit']
+    pd.testing.assert_frame_equal(cached, built)
+
+    # 读缓存不复制数组：得分、数值、分类编码和行业列表都还是内存映射视图
+    for col in SCORE_COLUMNS + ['平均薪资_千', '薪资_月均_千']:
+        assert _mapped(cached[col].to_numpy()), col
+    for col in ['薪资', '主要类型']:
+        assert isinstance(cached[col].dtype, pd.CategoricalDtype)
+        assert _mapped(cached[col].array.codes), col
+    assert _mapped(cached['行业列表'].array.ids)
+
+    # 写列时按写时复制另存，缓存文件不受影响
+    salary = cached.loc[0, '平均薪资_千']
+    industries = cached.loc[0, '行业列表']
+    cached.loc[0, '平均薪资_千'] = salary + 1
+    cached.at[0, '行业列表'] = ['新行业']
+    assert cached.loc[0, '行业列表'] == ['新行业']
+    again, _ = load_dataset(str(source), str(tmp_path / 'cache'))
+    assert again.loc[0, '平均薪资_千'] == salary
+    assert again.loc[0, '行业列表'] == industries
+
+
+# ============= 分块去重与整表去重相同 =============
+@pytest.mark.parametrize('chunk_rows', [997, 5000, 100000])
+def test_deduplicate_chunks_matches_deduplicate(raw, chunk_rows):
+    # 薪资并列、缺失薪资时保留哪一条也要相同
+    source = raw.copy()
+    source.loc[::7, '平均薪资_千'] = 20.0
+    source.loc[::11, '平均薪资_千'] = np.nan
+    expected, expected_stats = deduplicate(parse_columns(source.copy()))
+    chunks = [source.iloc[i:i + chunk_rows] for i in range(0, len(source), chunk_rows)]
+    result, stats = deduplicate_chunks(iter(chunks))
+    pd.testing.assert_frame_equal(result, expected)
+    assert stats == expected_stats
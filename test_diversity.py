@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""多样性重排：mmr_lambda=1.0 时与原来逐个回看已选列表的多样性筛选逐位相同"""
+
+import random
+
+import pytest
+
+from diversity import DiversityReranker
+
+
+# ============= 原多样性筛选（对照） =============
+def baseline_diversify(recommendations, top_n):
+    """原 app.recommend_jobs 的多样性筛选：recommendations 已按匹配度降序"""
+    diverse = []
+    seen_core_names = set()
+    seen_industries = set()
+    for job in recommendations:
+        if job['核心名称'] not in seen_core_names:
+            diverse.append(job)
+            seen_core_names.add(job['核心名称'])
+            seen_industries.add(job['行业'])
+        elif job['行业'] not in seen_industries:
+            if sum(1 for r in diverse if r['核心名称'] == job['核心名称']) < 2:
+                diverse.append(job)
+                seen_industries.add(job['行业'])
+
+    if len(diverse) < top_n:
+        for job in recommendations:
+            if job not in diverse:
+                if sum(1 for r in diverse if r['核心名称'] == job['核心名称']) < 2:
+                    diverse.append(job)
+                if len(diverse) >= top_n:
+                    break
+    if len(diverse) < top_n:
+        for job in recommendations:
+            if job not in diverse:
+                diverse.append(job)
+                if len(diverse) >= top_n:
+                    break
+
+    diverse.sort(key=lambda x: x['匹配度'], reverse=True)
+    return diverse[:top_n]
+
+
+def _candidates(rng):
+    """随机候选：核心名称、行业取值很少（大量重复），匹配度有并列"""
+    cores = [f'核心{i}' for i in range(rng.randint(1, 8))]
+    industries = [f'行业{i}' for i in range(rng.randint(1, 6))]
+    jobs = [{
+        '职业': f'岗位{i}',
+        '核心名称': rng.choice(cores),
+        '行业': rng.choice(industries),
+        '匹配度': rng.choice([0.2, 0.5, 0.7, 0.9, 1.0]),
+    } for i in range(rng.randint(0, 40))]
+    jobs.sort(key=lambda job: job['匹配度'], reverse=True)
+    return jobs
+
+
+# ============= 与原算法逐位相同 =============
+def test_greedy_rerank_matches_baseline():
+    rng = random.Random(6)
+    reranker = DiversityReranker()
+    for _ in range(5000):
+        jobs = _candidates(rng)
+        top_n = rng.randint(1, 15)
+        # 按需读取：传入迭代器与传入列表结果相同
+        assert reranker.rerank(iter(jobs), top_n) == baseline_diversify(jobs, top_n)
+
+
+def test_mmr_picks_from_pool_in_relevance_order():
+    rng = random.Random(8)
+    reranker = DiversityReranker(mmr_lambda=0.5, pool_factor=2)
+    for _ in range(500):
+        jobs = _candidates(rng)
+        top_n = rng.randint(1, 15)
+        pool = jobs[:top_n * 2]
+        result = reranker.rerank(iter(jobs), top_n)
+        assert len(result) == min(top_n, len(pool))
+        assert all(any(job is candidate for candidate in pool) for job in result)
+        assert len({job['职业'] for job in result}) == len(result)
+        assert [job['匹配度'] for job in result] == sorted((job['匹配度'] for job in result), reverse=True)
+
+
+def test_rejects_out_of_range_lambda():
+    with pytest.raises(ValueError):
+        DiversityReranker(mmr_lambda=1.5)
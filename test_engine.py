@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""匹配引擎：推荐结果与原来逐行计算的 recommend_jobs 逐位相同，各条加速路径与全部打分相同"""
+
+import random
+
+import numpy as np
+
+import engine as engine_module
+from engine import HOLLAND_ORDER, SALARY_SCORE_CAP
+from salary import parse_salary
+from text_match import extract_core_name
+
+
+# ============= 原逐行算法（对照） =============
+def baseline_recommend_jobs(user_scores, df, top_n=10, min_salary=0, industries=None):
+    """原 app.recommend_jobs：逐行计算余弦相似度，再做核心名称与行业的多样性筛选"""
+    recommendations = []
+    for _, row in df.iterrows():
+        job_scores = row['霍兰德得分']
+        dot_product = sum(user_scores[t] * job_scores[t] for t in user_scores)
+        user_norm = sum(v**2 for v in user_scores.values()) ** 0.5
+        job_norm = sum(v**2 for v in job_scores.values()) ** 0.5
+        similarity = dot_product / (user_norm * job_norm) if user_norm > 0 and job_norm > 0 else 0
+
+        if row['平均薪资_千'] < min_salary:
+            continue
+        if industries:
+            job_industries = row['行业列表']
+            if isinstance(job_industries, (list, str)) and not any(ind in job_industries for ind in industries):
+                continue
+
+        recommendations.append({
+            '职业': row['职业'],
+            '核心名称': extract_core_name(row['职业']),
+            '薪资': row['薪资'],
+            '行业': ', '.join(row['行业列表']) if isinstance(row['行业列表'], list) else str(row['行业列表']),
+            '匹配度': similarity,
+            '匹配度百分比': round(similarity * 100, 1),
+            '主要类型': row['主要类型'],
+            '平均薪资_千': row['平均薪资_千']
+        })
+    recommendations.sort(key=lambda x: x['匹配度'], reverse=True)
+    return baseline_diversify(recommendations, top_n)
+
+
+def baseline_diversify(recommendations, top_n):
+    """原 recommend_jobs 的多样性筛选与输出格式：recommendations 已按 匹配度 降序"""
+    diverse = []
+    seen_core_names = set()
+    seen_industries = set()
+    for job in recommendations:
+        if job['核心名称'] not in seen_core_names:
+            diverse.append(job)
+            seen_core_names.add(job['核心名称'])
+            seen_industries.add(job['行业'])
+        elif job['行业'] not in seen_industries:
+            if sum(1 for r in diverse if r['核心名称'] == job['核心名称']) < 2:
+                diverse.append(job)
+                seen_industries.add(job['行业'])
+
+    if len(diverse) < top_n:
+        for job in recommendations:
+            if job not in diverse:
+                if sum(1 for r in diverse if r['核心名称'] == job['核心名称']) < 2:
+                    diverse.append(job)
+                if len(diverse) >= top_n:
+                    break
+    if len(diverse) < top_n:
+        for job in recommendations:
+            if job not in diverse:
+                diverse.append(job)
+                if len(diverse) >= top_n:
+                    break
+
+    diverse.sort(key=lambda x: x['匹配度'], reverse=True)
+    return [{
+        '职业': job['职业'],
+        '薪资': job['薪资'],
+        '行业': job['行业'],
+        '匹配度': job['匹配度百分比'],
+        '主要类型': job['主要类型'],
+        '平均薪资_千': job['平均薪资_千']
+    } for job in diverse[:top_n]]
+
+
+def baseline_salary_weighted(user_scores, records, top_n, salary_weight, salary_range=None):
+    """按薪资加权排序的暴力版本：逐条算加权分数，整体排序后做原多样性筛选
+
+    records 是岗位表的逐行 dict；加权分数 = (1 - salary_weight) × 匹配度 +
+    salary_weight × 薪资分，展示的仍是匹配度。
+    """
+    user_norm = sum(v**2 for v in user_scores.values()) ** 0.5
+    recommendations = []
+    for row in records:
+        low, high, monthly = parse_salary(row['薪资'])
+        if salary_range is not None and not (low <= salary_range[1] and high >= salary_range[0]):
+            continue
+        job_scores = row['霍兰德得分']
+        dot_product = sum(user_scores[t] * job_scores[t] for t in user_scores)
+        job_norm = sum(v**2 for v in job_scores.values()) ** 0.5
+        similarity = dot_product / (user_norm * job_norm) if user_norm > 0 and job_norm > 0 else 0
+        salary_score = 0.0 if monthly != monthly else min(max(monthly / SALARY_SCORE_CAP, 0.0), 1.0)
+        recommendations.append({
+            '职业': row['职业'],
+            '核心名称': extract_core_name(row['职业']),
+            '薪资': row['薪资'],
+            '行业': ', '.join(row['行业列表']) if isinstance(row['行业列表'], list) else str(row['行业列表']),
+            '匹配度': (1 - salary_weight) * similarity + salary_weight * salary_score,
+            '匹配度百分比': round(similarity * 100, 1),
+            '主要类型': row['主要类型'],
+            '平均薪资_千': row['平均薪资_千']
+        })
+    recommendations.sort(key=lambda x: x['匹配度'], reverse=True)
+    return baseline_diversify(recommendations, top_n)
+
+
+# ============= 与原算法逐位相同 =============
+def test_recommend_matches_baseline(jobs, engine, queries):
+    for user_scores, kwargs in queries:
+        assert engine.recommend(user_scores, top_n=10, **kwargs) == \
+            baseline_recommend_jobs(user_scores, jobs, top_n=10, **kwargs)
+
+
+# ============= 按薪资加权排序 =============
+def test_salary_weighted_ranking_matches_brute_force(jobs, engine):
+    records = jobs.to_dict('records')
+    rng = random.Random(23)
+    for i in range(200):
+        user_scores = {t: rng.choice([0, 0.05, 0.1, 0.2, 0.35, 0.5]) for t in HOLLAND_ORDER}
+        salary_weight = rng.choice([0.1, 0.3, 0.5, 0.8, 1.0])
+        salary_range = (rng.choice([0, 8, 15]), rng.choice([20, 40, np.inf])) if i % 3 == 0 else None
+        expected = baseline_salary_weighted(user_scores, records, 10, salary_weight, salary_range)
+        result = engine.recommend(user_scores, top_n=10, salary_weight=salary_weight, salary_range=salary_range)
+        assert result == expected
+
+
+# ============= 分区搜索 =============
+def test_partitioned_shortlist_matches_brute_force(engine, queries, monkeypatch):
+    everything = np.arange(len(engine))
+    # 提高上限时全部打分，降到 0 时一律走分区搜索
+    monkeypatch.setattr(engine_module, '_BRUTE_FORCE_LIMIT', len(engine) + 1)
+    brute = [(engine.shortlist(s, everything, 10), engine.recommend(s, top_n=10, **kw)) for s, kw in queries]
+    monkeypatch.setattr(engine_module, '_BRUTE_FORCE_LIMIT', 0)
+    for (user_scores, kwargs), (rows, recommendations) in zip(queries, brute):
+        np.testing.assert_array_equal(np.sort(engine.shortlist(user_scores, everything, 10)), np.sort(rows))
+        assert engine.recommend(user_scores, top_n=10, **kwargs) == recommendations
+
+
+def test_partition_upper_bounds_cover_every_member(engine):
+    rng = np.random.default_rng(2)
+    partitions = engine.partitions
+    unit = engine.unique_vectors / np.maximum(np.asarray(engine.unique_norms), 1e-300)[:, None]
+    for user_vector in rng.integers(0, 6, size=(50, 6)) * 0.1:
+        norm = np.sqrt(user_vector @ user_vector)
+        bounds = partitions.upper_bounds(user_vector)
+        for p, rows in enumerate(partitions.rows):
+            cosines = unit[engine.vector_ids[rows]] @ (user_vector / norm if norm else user_vector)
+            assert cosines.max() <= bounds[p] + 1e-12
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""名称搜索索引：TitleIndex、FuzzyIndex 与逐个名称暴力比较的结果相同"""
+
+import random
+
+import numpy as np
+
+from indexes import _edit_budget, fold_title
+from text_match import substring_distance, to_pinyin
+
+
+# ============= 暴力对照 =============
+def baseline_substring_distance(pattern, text):
+    """pattern 与 text 任意子串的最小编辑距离（逐格动态规划）"""
+    previous = list(range(len(pattern) + 1))
+    best = previous[-1]
+    for char in text:
+        current = [0]
+        for i, p in enumerate(pattern, 1):
+            current.append(min(previous[i] + 1, current[i - 1] + 1, previous[i - 1] + (p != char)))
+        previous = current
+        best = min(best, current[-1])
+    return best
+
+
+def baseline_fuzzy_search(titles, pinyin, term):
+    """FuzzyIndex.search 的暴力版本：和每个名称（及其拼音）都算一次编辑距离"""
+    term = fold_title(term.strip())
+    best = {}
+
+    def match(texts, pattern, budget, shortest):
+        budget = max(0, min(budget, len(pattern) // shortest - 1))
+        if not pattern or len(pattern) < shortest:
+            return
+        for row, text in enumerate(texts):
+            distance = baseline_substring_distance(pattern, text)
+            if distance <= budget:
+                best[row] = min(best.get(row, distance), distance)
+
+    match(titles, term, _edit_budget(term), 1)
+    letters = term.replace(' ', '')
+    if len(letters) >= 2 and letters.isascii() and letters.isalpha():
+        match([full for full, _ in pinyin], letters, _edit_budget(letters), 2)
+        match([initials for _, initials in pinyin], letters, 0, 1)
+    rows = sorted(best)
+    return rows, [best[row] for row in rows]
+
+
+def _mutate(rng, text, alphabet, edits):
+    """对 text 做 edits 次随机的替换、删除或插入"""
+    text = list(text)
+    for _ in range(edits):
+        at = rng.randrange(len(text) + 1)
+        action = rng.choice('sdi') if at < len(text) else 'i'
+        if action == 's':
+            text[at] = rng.choice(alphabet)
+        elif action == 'd':
+            del text[at]
+        else:
+            text.insert(at, rng.choice(alphabet))
+    return ''.join(text)
+
+
+# ============= 编辑距离 =============
+def test_substring_distance_matches_dynamic_programming():
+    rng = random.Random(13)
+    for _ in range(3000):
+        pattern = ''.join(rng.choice('abcd') for _ in range(rng.randint(0, 12)))
+        text = ''.join(rng.choice('abcd') for _ in range(rng.randint(0, 20)))
+        assert substring_distance(pattern, text) == baseline_substring_distance(pattern, text)
+
+
+# ============= 名称搜索 =============
+def test_title_search_matches_substring_scan(engine):
+    index = engine.title_index
+    titles = [index.texts[row] for row in range(len(index))]
+    rng = random.Random(3)
+    terms = ['数据', '工程师', 'java', 'C++', '(', '不存在的岗位']
+    terms += [title[:rng.randint(1, len(title))] for title in rng.sample(titles, 40) if title]
+    for term in terms:
+        key = fold_title(term)
+        expected = [row for row, title in enumerate(titles) if key in title]
+        quality = [0 if titles[row] == key else 1 if titles[row].startswith(key) else 2 for row in expected]
+        rows, result_quality = index.search(term)
+        np.testing.assert_array_equal(rows, expected)
+        np.testing.assert_array_equal(result_quality, quality)
+
+
+def test_fuzzy_search_matches_brute_force(engine):
+    fuzzy = engine.fuzzy_index
+    titles = [fuzzy.title_index.texts[row] for row in range(len(fuzzy.title_index))]
+    names = engine.jobs.normalized_names.tolist()
+    pinyin = [to_pinyin(name) for name in names]
+    rng = random.Random(17)
+    characters = sorted(set(''.join(titles)))
+    terms = []
+    for title in rng.sample(titles, 60):
+        piece = title[rng.randrange(len(title)):][:rng.randint(2, 9)]
+        terms.append(_mutate(rng, piece, characters, rng.randint(0, 2)))
+    if pinyin[0] is not None:
+        for full, initials in rng.sample(pinyin, 30):
+            terms.append(_mutate(rng, full[:rng.randint(4, 16)], 'abcdefghijklmnopqrstuvwxyz', rng.randint(0, 2)))
+            terms.append(initials[:rng.randint(2, 4)])
+    for term in terms:
+        rows, distances = fuzzy.search(term)
+        expected_rows, expected_distances = baseline_fuzzy_search(titles, pinyin if pinyin[0] else [], term)
+        assert rows.tolist() == expected_rows, term
+        assert distances.tolist() == expected_distances, term
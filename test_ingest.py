@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""增量导入：合并增量后与用合并后的表重新构建相同，单个坏文件不影响其他文件"""
+
+import numpy as np
+import pandas as pd
+
+from analytics import MarketCube
+from dataset import parse_columns
+from engine import HOLLAND_ORDER, MatchingEngine
+from ingest import LiveDataset, list_deltas, merge_delta
+
+
+# ============= 增量合并与重新构建相同 =============
+def test_incremental_update_matches_rebuild(raw, compact, queries):
+    rng = np.random.default_rng(5)
+    delta = raw.sample(300, random_state=7).reset_index(drop=True)
+    # 一部分已有岗位涨薪（替换原行），一部分是新名称（追加在表尾），还有新行业
+    delta['平均薪资_千'] = delta['平均薪资_千'] * rng.choice([0.5, 1.5], size=len(delta))
+    delta.loc[:59, '职业'] = [f'新增岗位{chr(0x4e00 + i)}数据工程' for i in range(60)]
+    delta.loc[:9, '行业列表'] = repr([' 新行业 ', '新行业', '计算机软件'])
+    delta = parse_columns(delta)
+
+    engine = MatchingEngine(compact)
+    rows_by_key = {key: row for row, key in enumerate(compact['职业_规范'])}
+    merged, rows, _, stats = merge_delta(compact, delta, rows_by_key)
+    assert stats['replaced'] and stats['appended']
+
+    updated = engine.updated(merged, rows)
+    rebuilt = MatchingEngine(merged)
+    new_industry = ({t: 0.2 for t in HOLLAND_ORDER}, {'industries': ['新行业']})
+    for user_scores, kwargs in queries + [new_industry]:
+        assert updated.recommend(user_scores, top_n=10, **kwargs) == rebuilt.recommend(user_scores, top_n=10, **kwargs)
+    for term in ['数据', '新增岗位', '工程师', '新增岗位一数据工程', 'xinzeng']:
+        np.testing.assert_array_equal(updated.search(term), rebuilt.search(term))
+        np.testing.assert_array_equal(updated.fuzzy_search(term), rebuilt.fuzzy_search(term))
+    assert updated.industry_index.vocabulary == rebuilt.industry_index.vocabulary
+    np.testing.assert_array_equal(updated.industry_index.rows(['新行业']), rebuilt.industry_index.rows(['新行业']))
+
+    # 行业列表在 CSR 编码上合并，与逐行 list 列的合并结果相同；市场汇总也相同
+    plain = compact.assign(行业列表=pd.Series(compact['行业列表'].tolist(), index=compact.index, dtype=object))
+    plain_merged = merge_delta(plain, delta, rows_by_key)[0]
+    assert merged['行业列表'].tolist() == plain_merged['行业列表'].tolist()
+    cube, plain_cube = MarketCube(merged), MarketCube(plain_merged)
+    assert cube.top_industries(n=100) == plain_cube.top_industries(n=100)
+    for main_type in [None] + cube.types:
+        for industry in [None, '新行业', '计算机软件']:
+            assert cube.stats(main_type, industry) == plain_cube.stats(main_type, industry)
+
+
+# ============= 常驻数据集刷新 =============
+def test_live_dataset_keeps_the_given_engine(compact, engine):
+    assert LiveDataset(compact, engine=engine).engine is engine
+    # 空的岗位表对应的引擎 len 为 0，也不能被当作没有传入而重新构建
+    empty = compact.iloc[:0].reset_index(drop=True)
+    empty_engine = MatchingEngine(empty)
+    assert LiveDataset(empty, engine=empty_engine).engine is empty_engine
+
+
+def test_refresh_skips_bad_delta_and_merges_the_rest(raw, compact, tmp_path):
+    bad = tmp_path / '01_bad.csv'
+    good = tmp_path / '02_good.csv'
+    raw.head(50).drop(columns=['薪资']).to_csv(bad, index=False)
+    delta = raw.head(50).copy()
+    delta['职业'] = [f'增量岗位{chr(0x4e00 + i)}' for i in range(len(delta))]
+    delta.to_csv(good, index=False)
+
+    live = LiveDataset(compact)
+    results = live.refresh(list_deltas(str(tmp_path)))
+    assert list(results) == [str(bad), str(good)]
+    assert '缺少列' in results[str(bad)]['error'] and '薪资' in results[str(bad)]['error']
+    assert results[str(good)]['appended'] == len(delta)
+    assert len(live.df) == len(compact) + len(delta)
+    assert live.engine.search('增量岗位').size == len(delta)
+
+    # 没有变化的坏文件不再重试；修好之后重新合并
+    assert live.refresh(list_deltas(str(tmp_path))) == {}
+    raw.head(50).to_csv(bad, index=False)
+    results = live.refresh(list_deltas(str(tmp_path)))
+    assert list(results) == [str(bad)] and 'error' not in results[str(bad)]
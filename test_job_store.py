@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""紧凑岗位存储：StringTable 与 IndustryListArray 的读写和原来的逐行对象列一致"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from job_store import IndustryListArray, StringTable
+
+
+# ============= 驻留字符串表 =============
+def test_string_table_reads_missing_values_as_nan():
+    values = ['数据分析', np.nan, '前端', None, '数据分析']
+    for column in (values, pd.Series(values, dtype='category')):
+        table = StringTable(column)
+        assert table[0] == table[4] == '数据分析' and table[2] == '前端'
+        assert table[1] is np.nan and table[3] is np.nan
+        assert [value if isinstance(value, str) else 'missing' for value in table.tolist()] == \
+            ['数据分析', 'missing', '前端', 'missing', '数据分析']
+    updated = StringTable(values).updated(6, [1, 5], ['运营', np.nan])
+    assert updated[1] == '运营' and updated[5] is np.nan
+
+
+# ============= 行业列表列 =============
+def test_industry_column_assignment_matches_object_column(compact):
+    before = compact['行业列表'].tolist()[:20]
+    frame = compact.head(20).copy()
+    plain = frame.assign(行业列表=pd.Series(frame['行业列表'].tolist(), index=frame.index, dtype=object))
+
+    for target in (frame, plain):
+        target.at[3, '行业列表'] = [' 新行业 ', '计算机软件']
+        target.loc[4, '行业列表'] = ['单个行业']
+        target.loc[target.index >= 15, '行业列表'] = pd.Series(
+            [['金融'], ['教育', '金融'], [], ['医疗'], ['金融']], index=range(15, 20))
+    assert isinstance(frame['行业列表'].array, IndustryListArray)
+    assert frame['行业列表'].tolist() == plain['行业列表'].tolist()
+    # 原来的紧凑表不受影响
+    assert compact['行业列表'].tolist()[:20] == before
+
+
+def test_assignment_does_not_write_shared_arrays():
+    array = IndustryListArray.from_cells([['a'], ['b', 'c'], []])
+    offsets, ids = array.offsets, array.ids
+    offsets.flags.writeable = ids.flags.writeable = False   # 与内存映射的缓存一样只读
+    view = array[:]
+    array[1] = ['d']
+    array[np.array([True, False, True])] = '金融'
+    assert list(array) == [['金融'], ['d'], ['金融']]
+    assert list(view) == [['a'], ['b', 'c'], []]
+    with pytest.raises(ValueError):
+        array[[0, 1]] = [['x']]
+
+
+def test_to_parquet_round_trip(compact, tmp_path):
+    pytest.importorskip('pyarrow')
+    path = tmp_path / 'jobs.parquet'
+    compact.to_parquet(path)
+    loaded = pd.read_parquet(path)
+    assert isinstance(loaded['行业列表'].array, IndustryListArray)
+    pd.testing.assert_frame_equal(loaded, compact)
+
+    # 取行后的子表（偏移不从 0 开始的切片）也能写出
+    part = compact.iloc[100:140]
+    part.to_parquet(path)
+    assert pd.read_parquet(path)['行业列表'].tolist() == part['行业列表'].tolist()
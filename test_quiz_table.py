@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""答案路径表：原始得分编码可逆，查表结果与 engine.recommend 实时计算相同"""
+
+import itertools
+import random
+
+import numpy as np
+
+from engine import HOLLAND_ORDER
+from holland import QUESTIONS, calculate_user_scores
+from quiz_table import QuizTable, answer_key, build_table, decode_keys, reachable_keys, score_vectors
+
+# 全套题目的可达得分有约 200 万种，构建整表的测试只用前几题
+QUIZ = QUESTIONS[:5]
+
+
+def _random_answers(rng, questions=QUESTIONS):
+    return [rng.choice(q['options'])[1] for q in questions]
+
+
+# ============= 原始得分编码 =============
+def test_answer_key_round_trips_raw_scores():
+    rng = random.Random(15)
+    for _ in range(2000):
+        answers = _random_answers(rng)
+        raw = {t: 0 for t in HOLLAND_ORDER}
+        for answer in answers:
+            for t, value in answer.items():
+                raw[t] += value
+        key = answer_key(answers)
+        assert decode_keys([key])[0].tolist() == [raw[t] for t in HOLLAND_ORDER]
+        # 归一化与 calculate_user_scores 逐位相同
+        user_scores = calculate_user_scores(answers)
+        assert score_vectors([key])[0].tolist() == [user_scores[t] for t in HOLLAND_ORDER]
+
+
+def test_reachable_keys_match_enumeration():
+    expected = {answer_key([option[1] for option in choice])
+                for choice in itertools.product(*(q['options'] for q in QUIZ))}
+    keys = reachable_keys(QUIZ)
+    assert keys.tolist() == sorted(expected)
+
+
+# ============= 查表 =============
+def test_lookup_matches_recommend(engine, tmp_path):
+    table = build_table(engine, questions=QUIZ)
+    assert len(table) == len(reachable_keys(QUIZ)) and table.top_n == 10
+
+    # 写入缓存目录再读回（内存映射）的结果相同
+    table.save(str(tmp_path / 'quiz'))
+    loaded = QuizTable.load(str(tmp_path / 'quiz'), version=engine.version)
+    for name in ('keys', 'rows', 'matches'):
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(table, name))
+
+    rng = random.Random(5)
+    for _ in range(300):
+        answers = _random_answers(rng, QUIZ)
+        expected = engine.recommend(calculate_user_scores(answers), top_n=10)
+        assert table.lookup(engine, answers) == expected
+        assert loaded.lookup(engine, answers) == expected
+
+
+def test_lookup_misses_for_other_versions_and_unknown_scores(engine):
+    table = build_table(engine, questions=QUIZ[:2])
+    answers = _random_answers(random.Random(1), QUIZ[:2])
+    assert table.lookup(engine, answers) is not None
+    assert QuizTable(table.keys, table.rows, table.matches, version=engine.version + 1).lookup(engine, answers) is None
+    # 表里没有的原始得分（题目更多）：返回 None，调用方改用实时计算
+    assert table.lookup(engine, _random_answers(random.Random(2))) is None
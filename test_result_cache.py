@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""推荐结果缓存：LRU 淘汰、过期失效，以及缓存键随数据集版本和查询变化"""
+
+import result_cache
+from engine import HOLLAND_ORDER
+from result_cache import ResultCache, cached_recommend
+
+SCORES = {t: 0.1 * (i + 1) for i, t in enumerate(HOLLAND_ORDER)}
+
+
+class CountingEngine:
+    """只记录 recommend 调用次数的引擎替身"""
+
+    def __init__(self, version):
+        self.version = version
+        self.calls = 0
+
+    def recommend(self, user_scores, **kwargs):
+        self.calls += 1
+        return [{'职业': f'v{self.version}', '匹配度': 90.0}]
+
+
+# ============= LRU 与过期 =============
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1          # a 变成最近使用
+    cache.put('c', 3)                   # 淘汰 b
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert len(cache) == 2
+    assert cache.stats()['evictions'] == 1
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, 'monotonic', lambda: now[0])
+    cache = ResultCache(maxsize=10, ttl=60)
+    cache.put('a', 1)
+    now[0] += 60
+    assert cache.get('a') == 1
+    now[0] += 1
+    assert cache.get('a') is None
+    assert len(cache) == 0
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['expirations']) == (1, 1, 1)
+
+
+def test_no_ttl_keeps_entries(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(result_cache.time, 'monotonic', lambda: now[0])
+    cache = ResultCache(ttl=None)
+    cache.put('a', 1)
+    now[0] += 10 ** 9
+    assert cache.get('a') == 1
+
+
+# ============= 缓存键 =============
+def test_equivalent_queries_share_an_entry():
+    cache = ResultCache()
+    engine = CountingEngine(version=1)
+    cached_recommend(cache, engine, SCORES, industries=['计算机软件', '互联网'], min_salary=10)
+    # 行业顺序、1 与 1.0、缺失类型与 0、空行业列表与不限行业都视为相同
+    cached_recommend(cache, engine, dict(SCORES), industries=['互联网', '计算机软件'], min_salary=10.0)
+    zeros = {t: 0 for t in HOLLAND_ORDER}
+    cached_recommend(cache, engine, {}, industries=[])
+    cached_recommend(cache, engine, zeros, industries=None)
+    assert engine.calls == 2
+    cached_recommend(cache, engine, SCORES, top_n=5)
+    cached_recommend(cache, engine, SCORES, salary_weight=0.5)
+    assert engine.calls == 4
+
+
+def test_new_engine_version_misses():
+    cache = ResultCache()
+    old, new = CountingEngine(version=1), CountingEngine(version=2)
+    assert cached_recommend(cache, old, SCORES)[0]['职业'] == 'v1'
+    assert cached_recommend(cache, new, SCORES)[0]['职业'] == 'v2'
+    assert cached_recommend(cache, old, SCORES)[0]['职业'] == 'v1'
+    assert (old.calls, new.calls) == (1, 1)
+
+
+def test_updated_engine_gets_a_new_version(engine, compact):
+    updated = engine.updated(compact, [])
+    assert updated.version != engine.version
+    cache = ResultCache()
+    cached_recommend(cache, engine, SCORES)
+    cached_recommend(cache, updated, SCORES)
+    assert cache.stats()['misses'] == 2
+
+
+def test_results_are_copies():
+    cache = ResultCache()
+    engine = CountingEngine(version=1)
+    cached_recommend(cache, engine, SCORES)[0]['职业'] = '改过'
+    assert cached_recommend(cache, engine, SCORES)[0]['职业'] == 'v1'
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""薪资文本解析：各种单位和计薪周期都折算成 千元/月 的 (下限, 上限, 月均)"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from salary import SALARY_COLUMNS, WORK_DAYS_PER_MONTH, WORK_HOURS_PER_DAY, parse_salaries, parse_salary
+
+HOURS_PER_MONTH = WORK_DAYS_PER_MONTH * WORK_HOURS_PER_DAY
+
+
+@pytest.mark.parametrize('text, expected', [
+    # 千/月（源数据的主要形式）
+    ('15.0-25.0千/月', (15, 25, 20)),
+    ('15-25K', (15, 25, 20)),
+    ('8k-1.2万', (8, 12, 10)),
+    # 万/年、年薪
+    ('10-15万/年', (100 / 12, 150 / 12, 125 / 12)),
+    ('20万/年', (200 / 12, 200 / 12, 200 / 12)),
+    ('年薪20-30万', (200 / 12, 300 / 12, 250 / 12)),
+    # 元/天、元/日
+    ('150元/天', (0.15 * WORK_DAYS_PER_MONTH,) * 3),
+    ('200-300元/天', (0.2 * WORK_DAYS_PER_MONTH, 0.3 * WORK_DAYS_PER_MONTH, 0.25 * WORK_DAYS_PER_MONTH)),
+    ('150元/日', (0.15 * WORK_DAYS_PER_MONTH,) * 3),
+    # 元/小时、元/时
+    ('50元/小时', (0.05 * HOURS_PER_MONTH,) * 3),
+    ('20-30元/小时', (0.02 * HOURS_PER_MONTH, 0.03 * HOURS_PER_MONTH, 0.025 * HOURS_PER_MONTH)),
+    ('25元/时', (0.025 * HOURS_PER_MONTH,) * 3),
+    # 没有单位：不小于 1000 按元计
+    ('8000-12000', (8, 12, 10)),
+    ('8-12', (8, 12, 10)),
+    # 年终多发的月数
+    ('15-25K·13薪', (15 * 13 / 12, 25 * 13 / 12, 20 * 13 / 12)),
+    # 单边区间、上下限写反
+    ('8千以上', (8, math.inf, 8)),
+    ('5千以下', (0, 5, 5)),
+    ('25-15千/月', (15, 25, 20)),
+])
+def test_parse_salary(text, expected):
+    assert parse_salary(text) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('text', ['面议', '未知', '', None, np.nan, '15-25千/季度'])
+def test_unparseable_salary_is_nan(text):
+    assert all(math.isnan(value) for value in parse_salary(text))
+
+
+def test_parse_salaries_matches_per_text_parsing():
+    texts = ['15-25千/月', '面议', None, '150元/天', '15-25千/月', '10-15万/年', np.nan, '50元/小时']
+    for values in (texts, pd.Series(texts, dtype='category')):
+        columns = parse_salaries(values)
+        assert list(columns) == SALARY_COLUMNS
+        expected = np.array([parse_salary(text) for text in texts], dtype=np.float64)
+        for i, col in enumerate(SALARY_COLUMNS):
+            np.testing.assert_array_equal(columns[col], expected[:, i])
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""职业名称匹配：编译后的关键词匹配与原来逐个 in / replace 的结果相同"""
+
+import random
+
+from text_match import JOB_KEYWORDS, WELFARE_WORDS, KeywordMatcher, extract_core_name, strip_welfare_words
+
+
+# ============= 原逐个匹配（对照） =============
+def baseline_strip_welfare_words(job_name):
+    """原 normalize_job_name 的第 2 步：按顺序逐个 replace"""
+    for word in WELFARE_WORDS:
+        job_name = job_name.replace(word, '')
+    return job_name
+
+
+def baseline_extract_core_name(job_name):
+    """原 extract_core_name：按优先级逐个 in 判断，没有关键词时取前 4 个字符"""
+    job_name = str(job_name)
+    for keyword in JOB_KEYWORDS:
+        if keyword in job_name:
+            return keyword
+    return job_name[:4]
+
+
+def _fragments(words):
+    """完整的词、词的前后半截和单个字：拼接后容易在边界上凑出新词"""
+    pieces = set(words)
+    for word in words:
+        pieces.update(word[:i] for i in range(1, len(word)))
+        pieces.update(word[i:] for i in range(1, len(word)))
+    return sorted(pieces) + ['高级', '工程师', '(', ')', '15-25K', ' ', '/']
+
+
+def _random_names(rng, words, count):
+    fragments = _fragments(words)
+    return [''.join(rng.choice(fragments) for _ in range(rng.randint(0, 8))) for _ in range(count)]
+
+
+# ============= 与原算法相同 =============
+def test_strip_welfare_words_matches_sequential_replace():
+    rng = random.Random(7)
+    names = _random_names(rng, WELFARE_WORDS, 20000)
+    names += ['周末双双休休', '大小周末双休', '补补助助', '五险一金双休数据分析', '数据分析师']
+    for name in names:
+        assert strip_welfare_words(name) == baseline_strip_welfare_words(name), name
+
+
+def test_extract_core_name_matches_keyword_loop():
+    rng = random.Random(9)
+    names = _random_names(rng, JOB_KEYWORDS, 20000) + ['', 'AIUI', '用户运营数据分析', '测试']
+    for name in names:
+        assert extract_core_name(name) == baseline_extract_core_name(name), name
+
+
+def test_keyword_matcher_lists_overlapping_occurrences():
+    rng = random.Random(4)
+    keywords = ['ab', 'b', 'abc', 'ca']
+    matcher = KeywordMatcher(keywords)
+    for _ in range(2000):
+        text = ''.join(rng.choice('abcx') for _ in range(rng.randint(0, 12)))
+        # 每个位置取从这里开始、列表里最靠前的关键词
+        expected = []
+        for start in range(len(text)):
+            for keyword in keywords:
+                if text.startswith(keyword, start):
+                    expected.append((start, keyword))
+                    break
+        assert matcher.occurrences(text) == expected
+        assert matcher.occurrences(text, limit=1) == expected[:1]
+        assert matcher.contains(text) == bool(expected)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""引擎快照：写入再映射读回的引擎，推荐与搜索结果与原引擎逐位相同"""
+
+import mmap
+
+import numpy as np
+
+from dataset import load_dataset
+from warmup import load_engine, read_engine, write_engine
+
+TERMS = ['数据', '工程师', '数据分析', 'java', 'shuju', 'sjfx', '数剧分析']
+
+
+def _mapped(array):
+    """array 是否是快照 arrays.bin 的内存映射视图"""
+    while array is not None:
+        if isinstance(array, mmap.mmap):
+            return True
+        array = array.obj if isinstance(array, memoryview) else getattr(array, 'base', None)
+    return False
+
+
+def _assert_same_results(loaded, engine, queries):
+    assert len(loaded) == len(engine)
+    for user_scores, kwargs in queries:
+        for extra in [{}, {'mmr_lambda': 0.6}, {'salary_weight': 0.3}, {'salary_range': [10, 30]}]:
+            assert loaded.recommend(user_scores, top_n=10, **kwargs, **extra) == \
+                engine.recommend(user_scores, top_n=10, **kwargs, **extra)
+    for term in TERMS:
+        np.testing.assert_array_equal(loaded.search(term), engine.search(term))
+        np.testing.assert_array_equal(loaded.fuzzy_search(term), engine.fuzzy_search(term))
+    assert loaded.industry_index.vocabulary == engine.industry_index.vocabulary
+
+
+# ============= 快照读写 =============
+def test_snapshot_round_trip_gives_identical_results(engine, queries, tmp_path):
+    engine.fuzzy_index   # 与 load_engine 一样连容错索引一起写入
+    write_engine(engine, str(tmp_path / 'engine'))
+    loaded = read_engine(str(tmp_path / 'engine'))
+    _assert_same_results(loaded, engine, queries)
+    # 大数组直接映射快照文件，不在进程里另存一份
+    assert _mapped(loaded.title_index.sorted_rows)
+
+
+def test_snapshot_engine_accepts_incremental_updates(engine, compact, tmp_path):
+    write_engine(engine, str(tmp_path / 'engine'))
+    loaded = read_engine(str(tmp_path / 'engine'))
+    # 映射的数组是只读的：合并增量要生成新数组而不是原地修改
+    rows = [0, 5, 17]
+    updated = loaded.updated(compact, rows)
+    expected = engine.updated(compact, rows)
+    assert updated.recommend({'R': 1, 'I': 0.5}, top_n=10) == expected.recommend({'R': 1, 'I': 0.5}, top_n=10)
+
+
+def test_load_engine_reuses_snapshot(raw, queries, tmp_path):
+    source = tmp_path / 'jobs.csv'
+    raw.to_csv(source, index=False)
+    df, _ = load_dataset(str(source), str(tmp_path / 'cache'))
+    built = load_engine(df, str(source), str(tmp_path / 'cache'))
+    loaded = load_engine(df, str(source), str(tmp_path / 'cache'))
+    assert loaded is not built and _mapped(loaded.title_index.sorted_rows)
+    _assert_same_results(loaded, built, queries[:6])
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""职业名称的关键词匹配：核心职业名称提取、福利词删除、拼音与容错匹配"""
+
+import re
+
+try:
+    from pypinyin import lazy_pinyin
+except ImportError:  # 见 requirements.txt；缺少时拼音搜索不可用，界面会给出提示
+    lazy_pinyin = None
+
+
+# ============= 多关键词匹配器 =============
+class KeywordMatcher:
+    """把一组有先后顺序的关键词编译成一个交替正则，导入时编译一次
+
+    - contains：一次扫描判断是否出现任一关键词
+    - occurrences：列出关键词的出现位置（允许重叠）
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        alternation = '|'.join(re.escape(keyword) for keyword in self.keywords)
+        # 零宽前瞻让匹配可以重叠：每个位置取从这里开始、列表里最靠前的关键词
+        self._scan = re.compile(f'(?=({alternation}))')
+        self._pattern = re.compile(alternation)
+
+    def occurrences(self, text, limit=None):
+        """关键词出现的 (位置, 关键词) 列表，最多返回 limit 个"""
+        found = []
+        for match in self._scan.finditer(text):
+            found.append((match.start(), match.group(1)))
+            if limit is not None and len(found) >= limit:
+                break
+        return found
+
+    def contains(self, text):
+        """文本中是否出现任一关键词"""
+        return self._pattern.search(text) is not None
+
+
+# ============= 核心职业名称 =============
+# 常见的职业关键词（按优先级排列）
+JOB_KEYWORDS = (
+    '数据分析', '数据挖掘', '数据开发', '数据仓库', '数据工程',
+    '算法', '机器学习', '深度学习', '人工智能', 'AI',
+    '产品经理', '产品运营', '产品助理',
+    '运营', '用户运营', '内容运营', '活动运营',
+    '市场', '营销', '推广', '投放', '广告',
+    '销售', '商务', '渠道', '客户经理',
+    '前端', '后端', '全栈', '移动开发', '测试',
+    'UI', 'UX', '交互设计', '视觉设计', '平面设计',
+    '人力资源', 'HR', '招聘', '培训', '行政',
+    '财务', '会计', '出纳', '审计',
+    '客服', '售后', '技术支持',
+    '采购', '供应链', '物流',
+    '法务', '律师', '合规',
+    '咨询', '顾问', '分析师'
+)
+
+
+def extract_core_name(job_name):
+    """从完整职业名称中提取核心部分（用于去重）
+
+    按优先级逐个 in 判断：职业名称都很短，这比单个交替正则加优先级比较更快。
+    核心名称在加载数据时就算好并存成分类列，推荐时不再调用。
+    """
+    job_name = str(job_name)
+
+    # 尝试匹配关键词
+    for keyword in JOB_KEYWORDS:
+        if keyword in job_name:
+            return keyword
+
+    # 如果没有匹配到关键词，返回前4个字符
+    return job_name[:4]
+
+
+# ============= 福利词 =============
+# 福利信息关键词（规范化职业名称时按此顺序逐个删除）
+WELFARE_WORDS = ['双休', '周末双休', '单休', '大小周', '五险一金', '社保', '公积金',
+                 '包吃', '包住', '餐补', '房补', '交通补助', '话补', '加班补助',
+                 '弹性工作', '年终奖', '绩效奖金', '全勤奖', '股票期权', '提成',
+                 '奖金', '补贴', '补助', '福利', '待遇优厚', '薪资面议']
+
+# 包含更靠前福利词的词（如「周末双休」）轮到它时已经不可能出现，不放进正则
+WELFARE_MATCHER = KeywordMatcher([
+    word for i, word in enumerate(WELFARE_WORDS)
+    if not any(earlier in word for earlier in WELFARE_WORDS[:i])
+])
+
+
+def strip_welfare_words(job_name):
+    """删除职业名称中的福利词，结果与按 WELFARE_WORDS 顺序逐个 replace 相同"""
+    # 绝大多数名称不含福利词，一次扫描就能返回
+    if not WELFARE_MATCHER.contains(job_name):
+        return job_name
+    hits = WELFARE_MATCHER.occurrences(job_name, limit=2)
+    if len(hits) == 1:
+        start, word = hits[0]
+        stripped = job_name[:start] + job_name[start + len(word):]
+        if not WELFARE_MATCHER.contains(stripped):
+            return stripped
+
+    # 多个福利词（删除顺序会互相影响）或删除后两边又拼出了新词：按原来的顺序逐个替换
+    for word in WELFARE_WORDS:
+        job_name = job_name.replace(word, '')
+    return job_name
+
+
+# ============= 拼音 =============
+_NON_ALNUM = re.compile(r'[^a-z0-9]')
+
+
+def to_pinyin(text):
+    """(全拼, 首字母)，如 数据分析 → ('shujufenxi', 'sjfx')
+
+    汉字之外的字母数字原样保留（转小写），其余符号去掉。没有安装 pypinyin 时返回 None。
+    """
+    if lazy_pinyin is None:
+        return None
+    syllables = [_NON_ALNUM.sub('', part.lower()) for part in lazy_pinyin(str(text))]
+    syllables = [part for part in syllables if part]
+    return ''.join(syllables), ''.join(part[0] for part in syllables)
+
+
+# ============= 容错匹配 =============
+def substring_distance(pattern, text):
+    """pattern 与 text 中任意子串的最小编辑距离（Myers 位并行算法，每个文本字符 O(1) 次位运算）"""
+    m = len(pattern)
+    if m == 0:
+        return 0
+    peq = {}
+    for i, char in enumerate(pattern):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score, best = mask, 0, m, m
+    for char in text:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        # 子串可以从文本任意位置开始，所以左移时不补 1
+        ph = (ph << 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+        if score < best:
+            best = score
+            if best == 0:
+                break
+    return best
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""服务启动前的预热：编译数据集缓存和匹配引擎快照，多个进程共享只读内存映射
+
+用法：python warmup.py [--source 源文件] [--cache-dir 目录] && streamlit run app.py
+
+匹配引擎的全部数值数组（得分矩阵、薪资、行业位图、倒排表等）写进同一个
+arrays.bin，其余对象用 pickle 保存。各进程以只读方式内存映射 arrays.bin，
+同一台机器上的所有 Streamlit / API 进程共用操作系统页缓存里的同一份物理
+内存，进程数增加时这部分内存不再成倍增长；第一个访问者也不用等引擎构建。
+职业名称等逐行文本字段存在驻留字符串表里（见 job_store.py），也一起映射。
+"""
+
+import argparse
+import json
+import mmap
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from dataset import CACHE_DIR, DATA_FILE, cache_path, file_digest, load_dataset
+from engine import MatchingEngine
+from ingest import LiveDataset
+
+# 引擎快照格式版本：MatchingEngine 或索引的内部结构变化时加一，旧快照自动失效
+ENGINE_CACHE_VERSION = 5
+
+# 数值数组都放进共享的 arrays.bin（倒排表里大量小数组也一样，留在 pickle 里
+# 反而每个都要多一份 bytes 拷贝）；大数组按缓存行对齐，小数组按 8 字节对齐
+_LARGE_ARRAY_BYTES = 4096
+
+
+# ============= 引擎快照 =============
+def engine_path(source=DATA_FILE, cache_dir=CACHE_DIR, digest=None):
+    """源文件对应的引擎快照目录"""
+    return f"{cache_path(source, cache_dir, digest)}-engine-v{ENGINE_CACHE_VERSION}"
+
+
+class _ArrayPickler(pickle.Pickler):
+    """大数组只记录在 arrays.bin 里的位置，数据按对齐顺序追加写出"""
+
+    def __init__(self, file, segment):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.segment = segment
+        self.offset = 0
+
+    def persistent_id(self, obj):
+        if type(obj) is not np.ndarray or obj.dtype.hasobject:
+            return None
+        padding = -self.offset % (64 if obj.nbytes >= _LARGE_ARRAY_BYTES else 8)
+        self.segment.write(b'\0' * padding)
+        self.offset += padding
+        data = np.ascontiguousarray(obj)
+        self.segment.write(data.tobytes())
+        ref = ('array', self.offset, data.dtype.str, data.shape)
+        self.offset += data.nbytes
+        return ref
+
+
+class _ArrayUnpickler(pickle.Unpickler):
+    """数组还原成 arrays.bin 内存映射上的只读视图（不复制数据）"""
+
+    def __init__(self, file, buffer):
+        super().__init__(file)
+        # 所有数组都以同一个 uint8 数组为基，不必每个数组各持有一个 memoryview
+        self.segment = np.frombuffer(buffer, dtype=np.uint8)
+
+    def persistent_load(self, ref):
+        _, offset, dtype, shape = ref
+        return np.ndarray(shape, dtype=np.dtype(dtype), buffer=self.segment, offset=offset)
+
+
+def write_engine(engine, target):
+    """把引擎写成快照目录（先写临时目录再整体改名）"""
+    parent = os.path.dirname(os.path.abspath(target))
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=parent, prefix='.building-')
+    try:
+        with open(os.path.join(tmp, 'arrays.bin'), 'wb') as segment, \
+                open(os.path.join(tmp, 'engine.pkl'), 'wb') as f:
+            pickler = _ArrayPickler(f, segment)
+            pickler.dump(engine)
+            shared_bytes = pickler.offset
+        with open(os.path.join(tmp, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'version': ENGINE_CACHE_VERSION, 'rows': len(engine),
+                       'shared_bytes': shared_bytes}, f)
+        os.replace(tmp, target)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not os.path.isdir(target):
+            raise
+
+
+def read_engine(target):
+    """读取引擎快照：arrays.bin 以只读方式内存映射，各进程共享同一份物理页"""
+    with open(os.path.join(target, 'arrays.bin'), 'rb') as segment:
+        size = os.fstat(segment.fileno()).st_size
+        # 空文件不能映射（没有大数组时）
+        buffer = mmap.mmap(segment.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+    with open(os.path.join(target, 'engine.pkl'), 'rb') as f:
+        return _ArrayUnpickler(f, buffer).load()
+
+
+def load_engine(df, source=DATA_FILE, cache_dir=CACHE_DIR):
+    """df 是 load_dataset(source) 的结果：有快照时直接映射，没有时构建引擎并写快照"""
+    target = engine_path(source, cache_dir, file_digest(source))
+    if os.path.isfile(os.path.join(target, 'meta.json')):
+        try:
+            with open(os.path.join(target, 'meta.json'), encoding='utf-8') as f:
+                rows = json.load(f)['rows']
+            if rows == len(df):
+                return read_engine(target)
+        except (OSError, ValueError, pickle.UnpicklingError, AttributeError, EOFError):
+            # 快照损坏或与当前代码不兼容：重新构建
+            pass
+
+    engine = MatchingEngine(df)
+    # 容错搜索索引构建较慢，一并放进快照
+    engine.fuzzy_index
+    try:
+        write_engine(engine, target)
+    except OSError:
+        pass
+    return engine
+
+
+# ============= 预热 =============
+def load_live_dataset(source=DATA_FILE, cache_dir=CACHE_DIR):
+    """加载（必要时编译）数据集和引擎快照，返回常驻进程用的 LiveDataset"""
+    df, stats = load_dataset(source, cache_dir)
+    start = time.perf_counter()
+    engine = load_engine(df, source, cache_dir)
+    stats['timings']['engine'] = time.perf_counter() - start
+    return LiveDataset(df, stats, engine)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="编译数据集缓存与引擎快照，供服务进程直接映射")
+    parser.add_argument('--source', default=DATA_FILE)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    args = parser.parse_args()
+
+    try:
+        live = load_live_dataset(args.source, args.cache_dir)
+    except Exception as e:
+        print(f"预热失败: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    target = engine_path(args.source, args.cache_dir)
+    with open(os.path.join(target, 'meta.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    timings = live.stats['timings']
+    print(f"岗位数量: {len(live.engine)}")
+    print(f"数据集: {timings['total'] * 1000:.0f} ms（{'读取缓存' if live.stats['cache_hit'] else '编译缓存'}）")
+    print(f"匹配引擎: {timings['engine'] * 1000:.0f} ms，共享数组 {meta['shared_bytes'] / 2**20:.1f} MB")
+    print(f"引擎快照: {target}")